@@ -1,27 +1,318 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from typing import Optional
+from collections import namedtuple
+from contextlib import asynccontextmanager
 import datetime
-from city_utils import load_cities, find_city, get_timezone_offset
-from panchang_calculator import PanchangCalculator
+from city_utils import load_cities
+from location_resolver import CityNotFoundError, ResolvedLocation, location_resolver
+from panchang_calculator import ELEMENTS, PanchangCalculator, resolve_fields
 from choghadiya_calculator import ChoghadiyaCalculator
 from marathi_panchang_calculator import MarathiPanchangCalculator
 from gujarati_panchang_calculator import GujaratiPanchangCalculator
 from telugu_panchang_calculator import TeluguPanchangCalculator
+from sun_cache import SUN_CACHE
+from result_store import ResultKey, result_store
+from tiered_cache import tiered_cache
+from single_flight import SingleFlight
+from warmup import warmup_scheduler
+from startup import STARTUP
+import panchang_calculator
+import ephemeris
+import precision
+from http_cache import ALGORITHM_RELEASED, cache_control, compute_etag, is_not_modified, last_modified
+from fast_json import FastJSONResponse, dumps
+import request_profile
+import metrics
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load cities and warm tables in the background; /ready reports when done
+    STARTUP.start()
+    yield
+    if WARMUP is not None:
+        WARMUP.stop()
+    RESULTS.flush()
 
 app = FastAPI(
     title="Panchang & Choghadiya API", 
     description="API to calculate Hindu Panchang variables, Choghadiya muhurta, Marathi Panchang, and Malayalam Panchang", 
-    version="1.4"
+    version="1.4",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
-# Load calculators once on startup
-CITIES_DB = load_cities()
+# Stage timings and ephemeris counters for requests with debug=timing
+app.add_middleware(request_profile.ServerTimingMiddleware)
+# Request counts, latency and ephemeris calls for /metrics (outermost)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Load calculators once on startup; cities.json is loaded by a startup task
+CITIES_DB = []
+LOCATIONS = location_resolver(CITIES_DB)
 CALC = PanchangCalculator()
 CHOG_CALC = ChoghadiyaCalculator()
 MARATHI_CALC = MarathiPanchangCalculator()
 GUJARATI_CALC = GujaratiPanchangCalculator()
 TELUGU_CALC = TeluguPanchangCalculator()
 
+# Calculator results: per-worker LRU in front of the store shared by the host
+RESULTS = tiered_cache(result_store())
+
+# Identical concurrent cache misses share one calculation
+FLIGHTS = SingleFlight()
+
+# Created once the cities are loaded (start_warmup)
+WARMUP = None
+
+def load_city_index():
+    CITIES_DB.extend(load_cities())
+
+def warm_ephemeris():
+    # Check the .se1 files, read them ahead and record the backend in use
+    summary = ephemeris.check()
+    metrics.EPHEMERIS_BACKEND.set(1, backend=summary["backend"], path=summary["path"])
+    if summary["backend"] == "moshier" and ephemeris.required():
+        raise RuntimeError(f"Ephemeris files missing from {summary['path']}")
+    # First calculation opens the ephemeris files and fills lazy tables
+    today = datetime.date.today()
+    CALC.calculate(today.year, today.month, today.day, 12, 0, 0, 28.6139, 77.2090, 5.5)
+
+def start_warmup():
+    # Precompute each top city's next day shortly before its local midnight
+    global WARMUP
+    WARMUP = warmup_scheduler(CITIES_DB, RESULTS, FLIGHTS, {
+        "panchang": CALC,
+        "choghadiya": CHOG_CALC,
+        "marathi": MARATHI_CALC,
+        "gujarati": GUJARATI_CALC,
+        "telugu": TELUGU_CALC,
+    })
+    if WARMUP is not None:
+        WARMUP.start()
+
+STARTUP.add("cities", load_city_index)
+STARTUP.add("kshaya_adhika_table", panchang_calculator._get_kshaya_adhika_years)
+STARTUP.add("ephemeris", warm_ephemeris)
+STARTUP.add("cache_warmup", start_warmup)
+
+metrics.register_cache("sun_times", SUN_CACHE.stats)
+metrics.register_cache("locations", LOCATIONS.stats)
+for tier in RESULTS.tiers:
+    metrics.register_cache("results_" + tier.name, tier.stats)
+
+# Longest range served by /choghadiya/range
+MAX_CHOGHADIYA_RANGE_DAYS = 366
+
+# Requested local date and time, defaulted to now
+RequestTime = namedtuple('RequestTime', ['year', 'month', 'day', 'hour', 'minute', 'second'])
+
+def request_date(
+    year: Optional[int] = Query(None, description="Year"),
+    month: Optional[int] = Query(None, description="Month"),
+    day: Optional[int] = Query(None, description="Day")
+) -> RequestTime:
+    """Date-only endpoints; the time is noon, which picks the day's timezone offset."""
+    # Default to current date if not provided
+    now = datetime.datetime.now()
+    if year is None: year = now.year
+    if month is None: month = now.month
+    if day is None: day = now.day
+    return RequestTime(year, month, day, 12, 0, 0)
+
+def request_datetime(
+    year: Optional[int] = Query(None, description="Year"),
+    month: Optional[int] = Query(None, description="Month"),
+    day: Optional[int] = Query(None, description="Day"),
+    hour: Optional[int] = Query(None, description="Hour"),
+    minute: Optional[int] = Query(None, description="Minute"),
+    second: Optional[int] = Query(0, description="Second")
+) -> RequestTime:
+    # Default to current time if date/time not provided
+    now = datetime.datetime.now()
+    if year is None: year = now.year
+    if month is None: month = now.month
+    if day is None: day = now.day
+    if hour is None: hour = now.hour
+    if minute is None: minute = now.minute
+    return RequestTime(year, month, day, hour, minute, second)
+
+def location_dependency(default_lat, default_lon, when=request_datetime):
+    """
+    FastAPI dependency resolving the location query parameters.
+
+    default_lat/default_lon is the endpoint's regional default city and
+    when is the date dependency whose time picks the timezone offset.
+    """
+    def resolve_location(
+        city: Optional[str] = Query(None, description="City name"),
+        state: Optional[str] = Query(None, description="State/Province name"),
+        country: Optional[str] = Query(None, description="Country name or country code"),
+        lat: Optional[float] = Query(None, description="Latitude"),
+        lon: Optional[float] = Query(None, description="Longitude"),
+        tz: Optional[float] = Query(None, description="Timezone Offset"),
+        moment: RequestTime = Depends(when)
+    ) -> ResolvedLocation:
+        # City Lookup with state and country filtering (with GeoNames API fallback)
+        if city:
+            STARTUP.ensure("cities")
+        try:
+            with request_profile.stage("location"):
+                return LOCATIONS.resolve(city, state, country, lat, lon, tz,
+                                         moment.year, moment.month, moment.day, moment.hour, moment.minute,
+                                         default_lat, default_lon)
+        except CityNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+    return resolve_location
+
+# Fallback default (New Delhi)
+PANCHANG_LOCATION = location_dependency(28.6139, 77.2090)
+CHOGHADIYA_LOCATION = location_dependency(28.6139, 77.2090, when=request_date)
+# Fallback default (Mumbai, Maharashtra)
+MARATHI_LOCATION = location_dependency(19.0760, 72.8777)
+# Fallback default (Ahmedabad, Gujarat)
+GUJARATI_LOCATION = location_dependency(23.0225, 72.5714)
+# Fallback default (Hyderabad, Telangana)
+TELUGU_LOCATION = location_dependency(17.3850, 78.4867)
+
+# Query parameters that default to the current date/time when omitted
+DATE_FIELDS = ("year", "month", "day")
+DATETIME_FIELDS = DATE_FIELDS + ("hour", "minute")
+
+def conditional_get(request, response, endpoint, location, moment, clock_fields, views=(), tier=precision.DEFAULT,
+                    **options):
+    """
+    Set ETag, Last-Modified and Cache-Control on response for the resolved
+    inputs. Returns a 304 response when the client's copy is current, so
+    the endpoint can return it before running any calculator.
+
+    Responses with debug views carry timings and are never cached. A
+    non-default precision tier is part of the ETag; standard keeps the
+    ETags it always had. Responses for a date taken from the clock have no
+    Last-Modified, so only their ETag can produce a 304.
+    """
+    if views:
+        response.headers["Cache-Control"] = "no-store"
+        return None
+
+    try:
+        date = datetime.date(moment.year, moment.month, moment.day)
+    except ValueError:
+        return None  # invalid date: let the calculator report it
+
+    if tier != precision.DEFAULT:
+        options["precision"] = tier
+    etag = compute_etag(endpoint, location=location.meta(), moment=list(moment), **options)
+    defaulted = any(name not in request.query_params for name in clock_fields)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control(date, location.timezone_offset, defaulted)
+    }
+    # The release date says nothing about a date that moves with the clock
+    if not defaulted:
+        headers["Last-Modified"] = last_modified()
+    if is_not_modified(request.headers, etag, None if defaulted else ALGORITHM_RELEASED):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+# Views accepted by the debug query parameter
+DEBUG_VIEWS = ("timing", "graph")
+
+def debug_views(
+    debug: Optional[str] = Query(None, description="Comma-separated debug views to include: timing, graph (/panchang only)")
+) -> set:
+    """Set of requested debug views; 400 for unknown ones."""
+    views = {view.strip().lower() for view in debug.split(",") if view.strip()} if debug else set()
+    unknown = views - set(DEBUG_VIEWS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown debug view(s): {', '.join(sorted(unknown))}. Valid views: {', '.join(DEBUG_VIEWS)}")
+    return views
+
+def precision_tier(
+    tier: str = Query(precision.DEFAULT, alias="precision",
+                      description="Precision tier: standard (Swiss Ephemeris files) or fast (Moshier, minute-level)")
+) -> str:
+    """Requested precision tier name; 400 for unknown tiers."""
+    try:
+        return precision.tier(tier).name
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def precision_meta(tier):
+    """Meta entry naming a non-default precision tier (empty for standard)."""
+    return {"precision": tier} if tier != precision.DEFAULT else {}
+
+def attach_debug(body, views, graph=None):
+    """Add the requested debug views to a response body."""
+    if not views:
+        return body
+    debug = body.setdefault("debug", {})
+    profile = request_profile.current()
+    if "timing" in views and profile is not None:
+        debug["timing"] = profile.as_dict()
+    if "graph" in views and graph is not None:
+        debug["graph"] = graph.debug_view()
+    return body
+
+def stored_result(variant, location, moment, compute, projection=None, tier=precision.DEFAULT):
+    """
+    Result of variant from the result cache, else compute() - written back
+    to the cache tiers unless it is a partial projection. Concurrent
+    requests for the same result wait on one lookup and calculation.
+    compute() runs with the given precision tier, whose results are
+    cached apart from the other tiers'.
+    """
+    def calculate():
+        with request_profile.stage("calculate"), precision.use(tier):
+            return compute()
+
+    key = ResultKey(precision.variant_key(variant, tier), moment.year, moment.month, moment.day,
+                    location.latitude, location.longitude, location.timezone_offset)
+    result, shared = FLIGHTS.do((key, projection),
+                                lambda: RESULTS.get_or_compute(key, calculate, store=projection is None))
+    if shared:
+        metrics.COALESCED_REQUESTS.inc(variant=variant)
+        request_profile.count("coalesced")
+    return result
+
+def json_response(body, response):
+    """Serialize a pre-shaped body directly, keeping the headers set on response."""
+    with request_profile.stage("serialize"):
+        return FastJSONResponse(body, headers=dict(response.headers))
+
+def format_choghadiya(results):
+    """Choghadiya section of the response from ChoghadiyaCalculator results."""
+    # Build day choghadiya times list (8 periods)
+    day_choghadiya_times = []
+    for chog in results["day_choghadiya"]:
+        day_choghadiya_times.append({
+            f"{chog['name']}-{chog['quality']}": f"{chog['start_time']} to {chog['end_time']}"
+        })
+
+    # Build night choghadiya times list (8 periods)
+    night_choghadiya_times = []
+    for chog in results["night_choghadiya"]:
+        night_choghadiya_times.append({
+            f"{chog['name']}-{chog['quality']}": f"{chog['start_time']} to {chog['end_time']}"
+        })
+
+    return {
+        "day_choghadiya_start": results["sunrise"],
+        "day_choghadiya_times": day_choghadiya_times,
+        "night_choghadiya_start": results["sunset"],
+        "night_choghadiya_times": night_choghadiya_times
+    }
+
+def datetime_meta(moment):
+    """Date and time part of the response meta block."""
+    year, month, day, hour, minute, second = moment
+    return {
+        "date": f"{year}-{month:02d}-{day:02d}",
+        "time": f"{hour:02d}:{minute:02d}:{second:02d}",
+        "timestamp": f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
+    }
+
 @app.get("/")
 def read_root():
     return {
@@ -29,6 +320,7 @@ def read_root():
         "endpoints": {
             "/panchang": "Hindu Panchang calculations",
             "/choghadiya": "Choghadiya muhurta timings",
+            "/choghadiya/range": "Choghadiya timings for a range of days",
             "/marathi-panchang": "Marathi Panchang (Shaka Samvat based)",
             "/gujrati-panchang": "Gujarati Panchang (Vikram Samvat based)",
             "/telugu-panchang": "Telugu Panchang (Shaka Samvat based)",
@@ -36,525 +328,284 @@ def read_root():
         }
     }
 
+@app.get("/ready")
+def get_ready():
+    """Readiness probe: 200 once cities are indexed and tables are warm, else 503."""
+    ready = STARTUP.ready()
+    return FastJSONResponse({"ready": ready, "tasks": STARTUP.status(), "ephemeris": ephemeris.report()},
+                            status_code=200 if ready else 503, headers={"Cache-Control": "no-store"})
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    """Hit rate, size and eviction counters of the in-process caches."""
+    return {
+        "sun_times": SUN_CACHE.stats(),
+        "locations": LOCATIONS.stats(),
+        "results": RESULTS.stats(),
+        "single_flight": FLIGHTS.stats(),
+        "warmup": WARMUP.stats() if WARMUP is not None else None
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text exposition of this worker's metrics (labelled with its pid)."""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/panchang")
 def get_panchang(
-    city: Optional[str] = Query(None, description="City name"),
-    state: Optional[str] = Query(None, description="State/Province name"),
-    country: Optional[str] = Query(None, description="Country name or country code"),
-    lat: Optional[float] = Query(None, description="Latitude"),
-    lon: Optional[float] = Query(None, description="Longitude"),
-    tz: Optional[float] = Query(None, description="Timezone Offset"),
-    year: Optional[int] = Query(None, description="Year"),
-    month: Optional[int] = Query(None, description="Month"),
-    day: Optional[int] = Query(None, description="Day"),
-    hour: Optional[int] = Query(None, description="Hour"),
-    minute: Optional[int] = Query(None, description="Minute"),
-    second: Optional[int] = Query(0, description="Second")
+    request: Request,
+    response: Response,
+    location: ResolvedLocation = Depends(PANCHANG_LOCATION),
+    moment: RequestTime = Depends(request_datetime),
+    fields: Optional[str] = Query(None, description="Comma-separated elements to compute, e.g. Tithi,Sunrise (default: all)"),
+    views: set = Depends(debug_views),
+    tier: str = Depends(precision_tier)
 ):
-    # Default to current time if date/time not provided
-    now = datetime.datetime.now()
-    if year is None: year = now.year
-    if month is None: month = now.month
-    if day is None: day = now.day
-    if hour is None: hour = now.hour
-    if minute is None: minute = now.minute
-    
-    final_lat = lat
-    final_lon = lon
-    final_tz = tz
-    location_name = city or "Custom Coordinates"
-    location_details = {}
-
-    # City Lookup with state and country filtering (with GeoNames API fallback)
-    if city:
-        found_name, city_data = find_city(CITIES_DB, city, state, country)
-        if city_data:
-            location_name = found_name
-            
-            location_details = {
-                'city': city_data.get('city'),
-                'state': city_data.get('stateName'),
-                'country': city_data.get('countryName'),
-                'countryCode': city_data.get('countryCode')
-            }
-            
-            if final_lat is None: 
-                final_lat = city_data.get('latitude')
-            if final_lon is None: 
-                final_lon = city_data.get('longitude')
-            
-            if final_tz is None:
-                tz_str = city_data.get('timezone')
-                if tz_str:
-                    final_tz = get_timezone_offset(tz_str, year, month, day, hour, minute)
-                else:
-                    final_tz = 5.5
-        else:
-            if final_lat is None or final_lon is None:
-                error_msg = f"City '{city}' not found"
-                if state:
-                    error_msg += f" in state '{state}'"
-                if country:
-                    error_msg += f" in country '{country}'"
-                error_msg += ". Could not find in local database or GeoNames API. Please provide coordinates."
-                raise HTTPException(status_code=404, detail=error_msg)
-    
-    # Fallback default (New Delhi)
-    if final_lat is None: final_lat = 28.6139
-    if final_lon is None: final_lon = 77.2090
-    if final_tz is None: final_tz = 5.5
-    
+    # Field projection - only the astronomy behind these elements is computed
     try:
-        results = CALC.calculate(year, month, day, hour, minute, second, final_lat, final_lon, final_tz)
-        
-        # Build comprehensive location info
-        location_info = location_name
-        if location_details:
-            parts = [location_details.get('city')]
-            if location_details.get('state'):
-                parts.append(location_details.get('state'))
-            if location_details.get('country'):
-                parts.append(location_details.get('country'))
-            location_info = ", ".join(filter(None, parts))
-        
+        keys = resolve_fields(fields.split(",") if fields else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    not_modified = conditional_get(request, response, "panchang", location, moment, DATETIME_FIELDS, views, tier, fields=keys)
+    if not_modified:
+        return not_modified
+
+    try:
+        panchang_day = CALC.day(*moment, location.latitude, location.longitude, location.timezone_offset)
+        if "graph" in views:
+            # The graph view needs the nodes evaluated by this request
+            with request_profile.stage("calculate"), precision.use(tier):
+                results = panchang_day.evaluate(keys)
+        else:
+            projection = None if len(keys) == len(ELEMENTS) else tuple(keys)
+            results = stored_result("panchang", location, moment, lambda: panchang_day.evaluate(keys), projection, tier)
+            results = {key: results[key] for key in keys}
+
         # Add metadata to response
-        response = {
-            "meta": {
-                "location": location_info,
-                "city": location_details.get('city') if location_details else city,
-                "state": location_details.get('state') if location_details else state,
-                "country": location_details.get('country') if location_details else country,
-                "countryCode": location_details.get('countryCode') if location_details else None,
-                "latitude": final_lat,
-                "longitude": final_lon,
-                "timezone_offset": final_tz,
-                "date": f"{year}-{month:02d}-{day:02d}",
-                "time": f"{hour:02d}:{minute:02d}:{second:02d}",
-                "timestamp": f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
-            },
+        body = {
+            "meta": {**location.meta(), **datetime_meta(moment), **precision_meta(tier)},
             "data": results
         }
-        return response
+        attach_debug(body, views, panchang_day)
+        return json_response(body, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/choghadiya")
 def get_choghadiya(
-    city: Optional[str] = Query(None, description="City name"),
-    state: Optional[str] = Query(None, description="State/Province name"),
-    country: Optional[str] = Query(None, description="Country name or country code"),
-    lat: Optional[float] = Query(None, description="Latitude"),
-    lon: Optional[float] = Query(None, description="Longitude"),
-    tz: Optional[float] = Query(None, description="Timezone Offset"),
-    year: Optional[int] = Query(None, description="Year"),
-    month: Optional[int] = Query(None, description="Month"),
-    day: Optional[int] = Query(None, description="Day")
+    request: Request,
+    response: Response,
+    location: ResolvedLocation = Depends(CHOGHADIYA_LOCATION),
+    moment: RequestTime = Depends(request_date),
+    views: set = Depends(debug_views),
+    tier: str = Depends(precision_tier)
 ):
-    # Default to current date if not provided
-    now = datetime.datetime.now()
-    if year is None: year = now.year
-    if month is None: month = now.month
-    if day is None: day = now.day
-    
-    final_lat = lat
-    final_lon = lon
-    final_tz = tz
-    location_name = city or "Custom Coordinates"
-    location_details = {}
-    tz_name = None
-
-    # City Lookup with state and country filtering (with GeoNames API fallback)
-    if city:
-        found_name, city_data = find_city(CITIES_DB, city, state, country)
-        if city_data:
-            location_name = found_name
-            
-            location_details = {
-                'city': city_data.get('city'),
-                'state': city_data.get('stateName'),
-                'country': city_data.get('countryName'),
-                'countryCode': city_data.get('countryCode')
-            }
-            
-            if final_lat is None: 
-                final_lat = city_data.get('latitude')
-            if final_lon is None: 
-                final_lon = city_data.get('longitude')
-            
-            if final_tz is None:
-                tz_name = city_data.get('timezone')
-                if tz_name:
-                    final_tz = get_timezone_offset(tz_name, year, month, day, 12, 0)
-                else:
-                    final_tz = 5.5
-        else:
-            if final_lat is None or final_lon is None:
-                error_msg = f"City '{city}' not found"
-                if state:
-                    error_msg += f" in state '{state}'"
-                if country:
-                    error_msg += f" in country '{country}'"
-                error_msg += ". Could not find in local database or GeoNames API. Please provide coordinates."
-                raise HTTPException(status_code=404, detail=error_msg)
-    
-    # Fallback default (New Delhi)
-    if final_lat is None: final_lat = 28.6139
-    if final_lon is None: final_lon = 77.2090
-    if final_tz is None: final_tz = 5.5
-    
+    not_modified = conditional_get(request, response, "choghadiya", location, moment, DATE_FIELDS, views, tier)
+    if not_modified:
+        return not_modified
+
+    year, month, day = moment.year, moment.month, moment.day
+
     try:
         # Calculate choghadiya
-        results = CHOG_CALC.calculate(year, month, day, final_lat, final_lon, final_tz, tz_name)
-        
-        # Build comprehensive location info
-        location_info = location_name
-        if location_details:
-            parts = [location_details.get('city')]
-            if location_details.get('state'):
-                parts.append(location_details.get('state'))
-            if location_details.get('country'):
-                parts.append(location_details.get('country'))
-            location_info = ", ".join(filter(None, parts))
-        
-        # Build day choghadiya times list (8 periods)
-        day_choghadiya_times = []
-        for chog in results["day_choghadiya"]:
-            day_choghadiya_times.append({
-                f"{chog['name']}-{chog['quality']}": f"{chog['start_time']} to {chog['end_time']}"
-            })
-        
-        # Build night choghadiya times list (8 periods)
-        night_choghadiya_times = []
-        for chog in results["night_choghadiya"]:
-            night_choghadiya_times.append({
-                f"{chog['name']}-{chog['quality']}": f"{chog['start_time']} to {chog['end_time']}"
-            })
-        
+        results = stored_result("choghadiya", location, moment, lambda: CHOG_CALC.calculate(
+            year, month, day, location.latitude, location.longitude, location.timezone_offset, location.timezone),
+            tier=tier)
+
         # Build response in desired format
-        response = {
+        body = {
             "meta": {
-                "location": location_info,
-                "city": location_details.get('city') if location_details else city,
-                "state": location_details.get('state') if location_details else state,
-                "country": location_details.get('country') if location_details else country,
-                "countryCode": location_details.get('countryCode') if location_details else None,
-                "latitude": final_lat,
-                "longitude": final_lon,
-                "timezone_offset": final_tz,
+                **location.meta(),
                 "date": f"{year}-{month:02d}-{day:02d}",
-                "timestamp": f"{year}-{month:02d}-{day:02d}"
-            },
-            "choghadiya": {
-                "day_choghadiya_start": results["sunrise"],
-                "day_choghadiya_times": day_choghadiya_times,
-                "night_choghadiya_start": results["sunset"],
-                "night_choghadiya_times": night_choghadiya_times
+                "timestamp": f"{year}-{month:02d}-{day:02d}",
+                **precision_meta(tier)
             },
-            "Note": f"All timings are represented in 12-hour notation in local time of {location_info} with DST adjustment (if applicable). Hours which are past midnight are suffixed with next day date. In Panchang day starts and ends with sunrise."
+            "choghadiya": format_choghadiya(results),
+            "Note": f"All timings are represented in 12-hour notation in local time of {location.name} with DST adjustment (if applicable). Hours which are past midnight are suffixed with next day date. In Panchang day starts and ends with sunrise."
+        }
+        attach_debug(body, views)
+        return json_response(body, response)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/choghadiya/range")
+def get_choghadiya_range(
+    request: Request,
+    response: Response,
+    location: ResolvedLocation = Depends(CHOGHADIYA_LOCATION),
+    moment: RequestTime = Depends(request_date),
+    views: set = Depends(debug_views),
+    tier: str = Depends(precision_tier),
+    days: int = Query(30, ge=1, le=MAX_CHOGHADIYA_RANGE_DAYS, description="Number of days"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json for one document, ndjson to stream one line per day")
+):
+    try:
+        start = datetime.date(moment.year, moment.month, moment.day)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    not_modified = conditional_get(request, response, "choghadiya/range", location, moment, DATE_FIELDS, views, tier,
+                                   days=days, format=format)
+    if not_modified:
+        return not_modified
+
+    dates = [start + datetime.timedelta(days=i) for i in range(days)]
+
+    # One offset per day so the range follows the city's DST changes;
+    # an explicit tz applies to all days
+    offsets = LOCATIONS.day_offsets(location, dates)
+
+    meta = location.meta()
+    del meta["timezone_offset"]
+    meta.update({
+        "start_date": dates[0].isoformat(),
+        "end_date": dates[-1].isoformat(),
+        "days": days,
+        **precision_meta(tier)
+    })
+    note = f"All timings are represented in 12-hour notation in local time of {location.name} with DST adjustment (if applicable). Hours which are past midnight are suffixed with next day date. In Panchang day starts and ends with sunrise."
+
+    try:
+        with request_profile.stage("calculate"), precision.use(tier):
+            results = list(CHOG_CALC.calculate_range(moment.year, moment.month, moment.day, days,
+                                                     location.latitude, location.longitude, offsets, location.timezone))
+
+        def day_entry(date, result):
+            return {
+                "date": date.isoformat(),
+                "timezone_offset": offsets[(date - start).days],
+                "choghadiya": format_choghadiya(result)
+            }
+
+        if format == "ndjson":
+            # Compute the whole batch up front so errors surface before streaming starts
+            entries = [day_entry(date, result) for date, result in results]
+
+            def stream():
+                yield dumps({"meta": meta, "Note": note}) + b"\n"
+                for entry in entries:
+                    yield dumps(entry) + b"\n"
+
+            return StreamingResponse(stream(), media_type="application/x-ndjson", headers=dict(response.headers))
+
+        body = {
+            "meta": meta,
+            "days": [day_entry(date, result) for date, result in results],
+            "Note": note
         }
-        return response
+        attach_debug(body, views)
+        return json_response(body, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/marathi-panchang")
 def get_marathi_panchang(
-    city: Optional[str] = Query(None, description="City name"),
-    state: Optional[str] = Query(None, description="State/Province name"),
-    country: Optional[str] = Query(None, description="Country name or country code"),
-    lat: Optional[float] = Query(None, description="Latitude"),
-    lon: Optional[float] = Query(None, description="Longitude"),
-    tz: Optional[float] = Query(None, description="Timezone Offset"),
-    year: Optional[int] = Query(None, description="Year"),
-    month: Optional[int] = Query(None, description="Month"),
-    day: Optional[int] = Query(None, description="Day"),
-    hour: Optional[int] = Query(None, description="Hour"),
-    minute: Optional[int] = Query(None, description="Minute"),
-    second: Optional[int] = Query(0, description="Second")
+    request: Request,
+    response: Response,
+    location: ResolvedLocation = Depends(MARATHI_LOCATION),
+    moment: RequestTime = Depends(request_datetime),
+    views: set = Depends(debug_views),
+    tier: str = Depends(precision_tier)
 ):
     """
     Marathi Panchang endpoint - calculates panchang according to Marathi calendar tradition
     Uses Shaka Samvat and Amanta (New Moon to New Moon) month system
     """
-    # Default to current time if date/time not provided
-    now = datetime.datetime.now()
-    if year is None: year = now.year
-    if month is None: month = now.month
-    if day is None: day = now.day
-    if hour is None: hour = now.hour
-    if minute is None: minute = now.minute
-    
-    final_lat = lat
-    final_lon = lon
-    final_tz = tz
-    location_name = city or "Custom Coordinates"
-    location_details = {}
-
-    # City Lookup with state and country filtering (with GeoNames API fallback)
-    if city:
-        found_name, city_data = find_city(CITIES_DB, city, state, country)
-        if city_data:
-            location_name = found_name
-            
-            location_details = {
-                'city': city_data.get('city'),
-                'state': city_data.get('stateName'),
-                'country': city_data.get('countryName'),
-                'countryCode': city_data.get('countryCode')
-            }
-            
-            if final_lat is None: 
-                final_lat = city_data.get('latitude')
-            if final_lon is None: 
-                final_lon = city_data.get('longitude')
-            
-            if final_tz is None:
-                tz_str = city_data.get('timezone')
-                if tz_str:
-                    final_tz = get_timezone_offset(tz_str, year, month, day, hour, minute)
-                else:
-                    final_tz = 5.5
-        else:
-            if final_lat is None or final_lon is None:
-                error_msg = f"City '{city}' not found"
-                if state:
-                    error_msg += f" in state '{state}'"
-                if country:
-                    error_msg += f" in country '{country}'"
-                error_msg += ". Could not find in local database or GeoNames API. Please provide coordinates."
-                raise HTTPException(status_code=404, detail=error_msg)
-    
-    # Fallback default (Mumbai, Maharashtra)
-    if final_lat is None: final_lat = 19.0760
-    if final_lon is None: final_lon = 72.8777
-    if final_tz is None: final_tz = 5.5
-    
+    not_modified = conditional_get(request, response, "marathi-panchang", location, moment, DATETIME_FIELDS, views, tier)
+    if not_modified:
+        return not_modified
+
     try:
-        results = MARATHI_CALC.calculate(year, month, day, hour, minute, second, final_lat, final_lon, final_tz)
-        
-        # Build comprehensive location info
-        location_info = location_name
-        if location_details:
-            parts = [location_details.get('city')]
-            if location_details.get('state'):
-                parts.append(location_details.get('state'))
-            if location_details.get('country'):
-                parts.append(location_details.get('country'))
-            location_info = ", ".join(filter(None, parts))
-        
+        results = stored_result("marathi-panchang", location, moment, lambda: MARATHI_CALC.calculate(
+            *moment, location.latitude, location.longitude, location.timezone_offset), tier=tier)
+
         # Add metadata to response
-        response = {
+        body = {
             "meta": {
-                "location": location_info,
-                "city": location_details.get('city') if location_details else city,
-                "state": location_details.get('state') if location_details else state,
-                "country": location_details.get('country') if location_details else country,
-                "countryCode": location_details.get('countryCode') if location_details else None,
-                "latitude": final_lat,
-                "longitude": final_lon,
-                "timezone_offset": final_tz,
-                "date": f"{year}-{month:02d}-{day:02d}",
-                "time": f"{hour:02d}:{minute:02d}:{second:02d}",
-                "timestamp": f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}",
-                "calendar_system": "Marathi Panchang (Shaka Samvat, Amanta)"
+                **location.meta(),
+                **datetime_meta(moment),
+                "calendar_system": "Marathi Panchang (Shaka Samvat, Amanta)",
+                **precision_meta(tier)
             },
             "data": results
         }
-        return response
+        attach_debug(body, views)
+        return json_response(body, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/gujrati-panchang")
 def get_gujrati_panchang(
-    city: Optional[str] = Query(None, description="City name"),
-    state: Optional[str] = Query(None, description="State/Province name"),
-    country: Optional[str] = Query(None, description="Country name or country code"),
-    lat: Optional[float] = Query(None, description="Latitude"),
-    lon: Optional[float] = Query(None, description="Longitude"),
-    tz: Optional[float] = Query(None, description="Timezone Offset"),
-    year: Optional[int] = Query(None, description="Year"),
-    month: Optional[int] = Query(None, description="Month"),
-    day: Optional[int] = Query(None, description="Day"),
-    hour: Optional[int] = Query(None, description="Hour"),
-    minute: Optional[int] = Query(None, description="Minute"),
-    second: Optional[int] = Query(0, description="Second")
+    request: Request,
+    response: Response,
+    location: ResolvedLocation = Depends(GUJARATI_LOCATION),
+    moment: RequestTime = Depends(request_datetime),
+    views: set = Depends(debug_views),
+    tier: str = Depends(precision_tier)
 ):
-    now = datetime.datetime.now()
-    if year is None: year = now.year
-    if month is None: month = now.month
-    if day is None: day = now.day
-    if hour is None: hour = now.hour
-    if minute is None: minute = now.minute
-    
-    final_lat = lat
-    final_lon = lon
-    final_tz = tz
-    location_name = city or "Custom Coordinates"
-    location_details = {}
-
-    # City Lookup with state and country filtering (with GeoNames API fallback)
-    if city:
-        found_name, city_data = find_city(CITIES_DB, city, state, country)
-        if city_data:
-            location_name = found_name
-            
-            location_details = {
-                'city': city_data.get('city'),
-                'state': city_data.get('stateName'),
-                'country': city_data.get('countryName'),
-                'countryCode': city_data.get('countryCode')
-            }
-            
-            if final_lat is None: 
-                final_lat = city_data.get('latitude')
-            if final_lon is None: 
-                final_lon = city_data.get('longitude')
-            
-            if final_tz is None:
-                tz_str = city_data.get('timezone')
-                if tz_str:
-                    final_tz = get_timezone_offset(tz_str, year, month, day, hour, minute)
-                else:
-                    final_tz = 5.5
-        else:
-            if final_lat is None or final_lon is None:
-                error_msg = f"City '{city}' not found"
-                if state:
-                    error_msg += f" in state '{state}'"
-                if country:
-                    error_msg += f" in country '{country}'"
-                error_msg += ". Could not find in local database or GeoNames API. Please provide coordinates."
-                raise HTTPException(status_code=404, detail=error_msg)
-    
-    # Fallback default (Ahmedabad, Gujarat)
-    if final_lat is None: final_lat = 23.0225
-    if final_lon is None: final_lon = 72.5714
-    if final_tz is None: final_tz = 5.5
-    
-    try:        
-        full_result = GUJARATI_CALC.calculate_full(year, month, day, hour, minute, second, final_lat, final_lon, final_tz)
-        results = full_result['data']
-        
-        # Build comprehensive location info
-        location_info = location_name
-        if location_details:
-            parts = [location_details.get('city')]
-            if location_details.get('state'):
-                parts.append(location_details.get('state'))
-            if location_details.get('country'):
-                parts.append(location_details.get('country'))
-            location_info = ", ".join(filter(None, parts))
-        
+    not_modified = conditional_get(request, response, "gujrati-panchang", location, moment, DATETIME_FIELDS, views, tier)
+    if not_modified:
+        return not_modified
+
+    try:
+        results = stored_result("gujrati-panchang", location, moment, lambda: GUJARATI_CALC.calculate_full(
+            *moment, location.latitude, location.longitude, location.timezone_offset)['data'], tier=tier)
+
         # Add metadata to response
-        response = {
+        body = {
             "meta": {
-                "location": location_info,
-                "city": location_details.get('city') if location_details else city,
-                "state": location_details.get('state') if location_details else state,
-                "country": location_details.get('country') if location_details else country,
-                "countryCode": location_details.get('countryCode') if location_details else None,
-                "latitude": final_lat,
-                "longitude": final_lon,
-                "timezone_offset": final_tz,
-                "date": f"{year}-{month:02d}-{day:02d}",
-                "time": f"{hour:02d}:{minute:02d}:{second:02d}",
-                "timestamp": f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}",
-                "calendar_system": "Gujarati Panchang"
+                **location.meta(),
+                **datetime_meta(moment),
+                "calendar_system": "Gujarati Panchang",
+                **precision_meta(tier)
             },
             "data": results
         }
-        return response
+        attach_debug(body, views)
+        return json_response(body, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/telugu-panchang")
 def get_telugu_panchang(
-    city: Optional[str] = Query(None, description="City name"),
-    state: Optional[str] = Query(None, description="State/Province name"),
-    country: Optional[str] = Query(None, description="Country name or country code"),
-    lat: Optional[float] = Query(None, description="Latitude"),
-    lon: Optional[float] = Query(None, description="Longitude"),
-    tz: Optional[float] = Query(None, description="Timezone Offset"),
-    year: Optional[int] = Query(None, description="Year"),
-    month: Optional[int] = Query(None, description="Month"),
-    day: Optional[int] = Query(None, description="Day"),
-    hour: Optional[int] = Query(None, description="Hour"),
-    minute: Optional[int] = Query(None, description="Minute"),
-    second: Optional[int] = Query(0, description="Second")
+    request: Request,
+    response: Response,
+    location: ResolvedLocation = Depends(TELUGU_LOCATION),
+    moment: RequestTime = Depends(request_datetime),
+    views: set = Depends(debug_views),
+    tier: str = Depends(precision_tier)
 ):
     """
     Telugu Panchang endpoint - calculates panchang according to Telugu calendar tradition
     Uses Shaka Samvat and Amanta month system
     """
-    # Default to current time if date/time not provided
-    now = datetime.datetime.now()
-    if year is None: year = now.year
-    if month is None: month = now.month
-    if day is None: day = now.day
-    if hour is None: hour = now.hour
-    if minute is None: minute = now.minute
-    
-    final_lat = lat
-    final_lon = lon
-    final_tz = tz
-    location_name = city or "Custom Coordinates"
-    location_details = {}
-
-    if city:
-        found_name, city_data = find_city(CITIES_DB, city, state, country)
-        if city_data:
-            location_name = found_name
-            location_details = {
-                'city': city_data.get('city'),
-                'state': city_data.get('stateName'),
-                'country': city_data.get('countryName'),
-                'countryCode': city_data.get('countryCode')
-            }
-            if final_lat is None: final_lat = city_data.get('latitude')
-            if final_lon is None: final_lon = city_data.get('longitude')
-            if final_tz is None:
-                tz_str = city_data.get('timezone')
-                if tz_str:
-                    final_tz = get_timezone_offset(tz_str, year, month, day, hour, minute)
-                else:
-                    final_tz = 5.5
-        else:
-            if final_lat is None or final_lon is None:
-                error_msg = f"City '{city}' not found"
-                if state: error_msg += f" in state '{state}'"
-                if country: error_msg += f" in country '{country}'"
-                error_msg += ". Could not find in local database or GeoNames API. Please provide coordinates."
-                raise HTTPException(status_code=404, detail=error_msg)
-    
-    # Fallback default (Hyderabad, Telangana)
-    if final_lat is None: final_lat = 17.3850
-    if final_lon is None: final_lon = 78.4867
-    if final_tz is None: final_tz = 5.5
-    
+    not_modified = conditional_get(request, response, "telugu-panchang", location, moment, DATETIME_FIELDS, views, tier)
+    if not_modified:
+        return not_modified
+
     try:
-        full_result = TELUGU_CALC.calculate_full(year, month, day, hour, minute, second, final_lat, final_lon, final_tz)
-        
-        # Build comprehensive location info
-        location_info = location_name
-        if location_details:
-            parts = [location_details.get('city')]
-            if location_details.get('state'): parts.append(location_details.get('state'))
-            if location_details.get('country'): parts.append(location_details.get('country'))
-            location_info = ", ".join(filter(None, parts))
-        
+        results = stored_result("telugu-panchang", location, moment, lambda: TELUGU_CALC.calculate_full(
+            *moment, location.latitude, location.longitude, location.timezone_offset)['data'], tier=tier)
+        full_result = {
+            "meta": TELUGU_CALC.result_meta(*moment, location.latitude, location.longitude, location.timezone_offset),
+            "data": results
+        }
+
         # Inject metadata
-        full_result['meta']['location'] = location_info
-        full_result['meta']['city'] = location_details.get('city') if location_details else city
-        full_result['meta']['state'] = location_details.get('state') if location_details else state
-        full_result['meta']['country'] = location_details.get('country') if location_details else country
-        full_result['meta']['countryCode'] = location_details.get('countryCode') if location_details else None
-        
-        return full_result
+        meta = location.meta()
+        for key in ('location', 'city', 'state', 'country', 'countryCode'):
+            full_result['meta'][key] = meta[key]
+        full_result['meta'].update(precision_meta(tier))
+
+        attach_debug(full_result, views)
+        return json_response(full_result, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
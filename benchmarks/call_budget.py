@@ -0,0 +1,183 @@
+"""
+Ephemeris Call Budget
+
+Counts the swe.calc_ut and swe.rise_trans calls each calculator and each
+calendar endpoint makes for a set of representative days, and fails when
+any count rises above the recorded baseline (call_budget.json next to this
+script). An extra sankranti.sunrise in a formatter or a lost cache shows up
+here as a failed check long before it shows up in latency:
+
+    python benchmarks/call_budget.py            # check; exit status 1 on regression
+    python benchmarks/call_budget.py --update   # record the current counts as the baseline
+
+Counts come from the request_profile counters, the same ones /metrics
+reports per request. Every case starts with empty sun-times and result
+caches, so the counts are exact and do not depend on the order of cases.
+A count below its budget is reported but passes; run --update to lock the
+saving in. Counts are taken with the standard precision tier.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import warnings
+
+from common import PLACES
+
+# The API must compute, not answer from a store left over from another run
+os.environ["PANCHANG_RESULT_STORE"] = ""
+os.environ["PANCHANG_WARMUP_CITIES"] = "0"
+
+import panchang_calculator
+import request_profile
+from precompute import VARIANTS
+from sun_cache import SUN_CACHE
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "call_budget.json")
+
+COUNTERS = ("swe_calc_ut", "swe_rise_trans")
+
+# New Delhi, Sydney, New York, Reykjavik
+CASE_PLACES = [PLACES[0], PLACES[3], PLACES[4], PLACES[6]]
+
+# Winter, a full moon, the monsoon and a past solstice
+CASE_DATES = [datetime.date(2026, 1, 1), datetime.date(2026, 5, 1), datetime.date(2026, 8, 15),
+              datetime.date(1950, 6, 21)]
+
+ENDPOINTS = ["/panchang", "/choghadiya", "/marathi-panchang", "/gujrati-panchang", "/telugu-panchang"]
+
+
+def cases():
+    """(case name, place, date) of every representative day."""
+    for place in CASE_PLACES:
+        for date in CASE_DATES:
+            yield f"{place[0]} {date.isoformat()}", place, date
+
+
+def counted(fn):
+    """Ephemeris call counters of fn() run under a fresh profile, with cold sun times."""
+    SUN_CACHE.clear()
+    profile, token = request_profile.activate()
+    try:
+        fn()
+    finally:
+        request_profile.deactivate(token)
+    return {name: profile.counters.get(name, 0) for name in COUNTERS}
+
+
+def calculator_counts():
+    from common import calculators
+
+    calcs = calculators()
+    counts = {}
+    for variant, compute in VARIANTS.items():
+        counts[f"calculator {variant}"] = {
+            case: counted(lambda: compute(calcs, date.year, date.month, date.day, *place[1:]))
+            for case, place, date in cases()
+        }
+    return counts
+
+
+def endpoint_counts():
+    warnings.filterwarnings("ignore")
+    from fastapi.testclient import TestClient
+    import api
+
+    client = TestClient(api.app)
+    counts = {}
+    for path in ENDPOINTS:
+        counts[f"GET {path}"] = {}
+        for case, (name, lat, lon, tz), date in cases():
+            api.RESULTS.tiers[0].clear()
+            SUN_CACHE.clear()
+            response = client.get(path, params={"lat": lat, "lon": lon, "tz": tz, "year": date.year,
+                                                "month": date.month, "day": date.day, "hour": 12, "minute": 0,
+                                                "debug": "timing"})
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} for {case} returned {response.status_code}: {response.text[:200]}")
+            counters = response.json()["debug"]["timing"]["counters"]
+            counts[f"GET {path}"][case] = {name: counters.get(name, 0) for name in COUNTERS}
+    return counts
+
+
+def measure_all():
+    # Built once per process; keep its calls out of the first case
+    panchang_calculator._get_kshaya_adhika_years()
+    counts = calculator_counts()
+    counts.update(endpoint_counts())
+    return counts
+
+
+def write_budget(path, counts):
+    """Write counts as the budget file, one case per line so diffs show which days changed."""
+    targets = []
+    for target, by_case in sorted(counts.items()):
+        lines = [f"   {json.dumps(case)}: {json.dumps(counters)}" for case, counters in sorted(by_case.items())]
+        targets.append(f"  {json.dumps(target)}: {{\n" + ",\n".join(lines) + "\n  }")
+    with open(path, "w") as f:
+        f.write('{\n "budgets": {\n' + ",\n".join(targets) + "\n }\n}\n")
+
+
+def check(counts, budgets):
+    """(regressions, savings, missing) lines comparing counts with budgets."""
+    regressions, savings, missing = [], [], []
+    for target, by_case in counts.items():
+        for case, counters in by_case.items():
+            budget = budgets.get(target, {}).get(case)
+            if budget is None:
+                missing.append(f"{target} / {case}: no budget recorded")
+                continue
+            for name in COUNTERS:
+                used, allowed = counters[name], budget.get(name, 0)
+                if used > allowed:
+                    regressions.append(f"{target} / {case}: {name} {used} > budget {allowed}")
+                elif used < allowed:
+                    savings.append(f"{target} / {case}: {name} {used} < budget {allowed}")
+    return regressions, savings, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check ephemeris call counts against the recorded budget")
+    parser.add_argument("--update", action="store_true", help="Record the current counts as the new budget")
+    parser.add_argument("--baseline", type=str, default=BASELINE, help="Budget file (default: call_budget.json)")
+
+    args = parser.parse_args()
+
+    counts = measure_all()
+    for target, by_case in counts.items():
+        totals = {name: sum(c[name] for c in by_case.values()) for name in COUNTERS}
+        peak = max(sum(c.values()) for c in by_case.values())
+        print(f"{target:<34} calc_ut {totals['swe_calc_ut']:>7}  rise_trans {totals['swe_rise_trans']:>5}  "
+              f"max/day {peak:>5}")
+
+    if args.update:
+        write_budget(args.baseline, counts)
+        print(f"Budget written to {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline) as f:
+            budgets = json.load(f)["budgets"]
+    except FileNotFoundError:
+        print(f"No budget at {args.baseline}; record one with --update")
+        sys.exit(1)
+
+    regressions, savings, missing = check(counts, budgets)
+    for line in savings:
+        print(f"below budget: {line}")
+    for line in missing:
+        print(f"missing: {line}")
+    for line in regressions:
+        print(f"OVER BUDGET: {line}")
+
+    if regressions or missing:
+        print(f"{len(regressions)} count(s) over budget, {len(missing)} without a budget")
+        sys.exit(1)
+    print("All ephemeris call counts within budget"
+          + (f" ({len(savings)} below; run --update to lock in)" if savings else ""))
+
+
+if __name__ == "__main__":
+    main()
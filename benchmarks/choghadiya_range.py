@@ -0,0 +1,69 @@
+"""
+Choghadiya Range Check
+
+Compares ChoghadiyaCalculator.calculate_range with calculate() day by day
+and fails on any difference. The range path takes its sunrises from one
+vectorized batch (sunrise_engine) and has to fall back to the per-day path
+where the batch has none, so the places run up to Tromso, where the sun
+does not set in June and does not rise in December:
+
+    python benchmarks/choghadiya_range.py
+    python benchmarks/choghadiya_range.py --year 2030 --days 366
+
+Every place of common.PLACES and Tromso is checked for --days days from
+1 January of --year. Only the standard precision tier promises identical
+output; under fast the range uses a Newton step where calculate() uses
+swe.rise_trans, so minute-level differences are expected there.
+"""
+
+import argparse
+import datetime
+import sys
+
+from common import PLACES, calculators
+
+import precision
+
+# Polar day and polar night
+TROMSO = ("Tromso", 69.6492, 18.9553, 1.0)
+
+
+def check_place(calc, place, start, days):
+    """(date, first differing key) of every day where the range and calculate() differ."""
+    name, lat, lon, tz = place
+    differences = []
+    for date, result in calc.calculate_range(start.year, start.month, start.day, days, lat, lon, tz):
+        expected = calc.calculate(date.year, date.month, date.day, lat, lon, tz)
+        if result != expected:
+            key = next(k for k in expected if result.get(k) != expected[k])
+            differences.append((date, key))
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the Choghadiya range mode against the per-day calculation")
+    parser.add_argument("--year", type=int, default=2024, help="First year checked (default: 2024)")
+    parser.add_argument("--days", type=int, default=366, help="Days checked per place (default: 366)")
+    parser.add_argument("--precision", type=str, default=precision.DEFAULT, choices=list(precision.TIERS),
+                        help=f"Precision tier (default: {precision.DEFAULT})")
+
+    args = parser.parse_args()
+
+    calc = calculators()["choghadiya"]
+    start = datetime.date(args.year, 1, 1)
+    failed = 0
+    with precision.use(args.precision):
+        for place in PLACES + [TROMSO]:
+            differences = check_place(calc, place, start, args.days)
+            failed += bool(differences)
+            first = f"  first: {differences[0][0]} {differences[0][1]}" if differences else ""
+            print(f"{place[0]:<12}{args.days:>6} days{len(differences):>6} differ{first}")
+
+    if failed:
+        print(f"{failed} place(s) where the range differs from calculate()")
+        sys.exit(1)
+    print("Range output matches calculate() on every day")
+
+
+if __name__ == "__main__":
+    main()
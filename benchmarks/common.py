@@ -0,0 +1,140 @@
+"""
+Shared Benchmark Fixtures
+
+The fixed place and date matrix, the calculators and the timing helpers
+used by the scripts in this directory. Importing this module also puts the
+repository root on sys.path, so the scripts run from any directory:
+
+    python benchmarks/run.py
+"""
+
+import datetime
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# name, latitude, longitude, timezone offset - equator to 64 N, both hemispheres
+PLACES = [
+    ("New Delhi", 28.6139, 77.2090, 5.5),
+    ("Chennai", 13.0827, 80.2707, 5.5),
+    ("Singapore", 1.3521, 103.8198, 8.0),
+    ("Sydney", -33.8688, 151.2093, 10.0),
+    ("New York", 40.7128, -74.0060, -5.0),
+    ("London", 51.5074, -0.1278, 0.0),
+    ("Reykjavik", 64.1466, -21.9426, 0.0),
+]
+
+# First of every month of one year, a solstice in the past and in the future
+DATES = ([datetime.date(2026, month, 1) for month in range(1, 13)]
+         + [datetime.date(1950, 6, 21), datetime.date(2100, 12, 21)])
+
+_TIME = re.compile(r"(\d{1,2}):(\d{2}) (AM|PM)(, \w{3} \d{2})?")
+
+
+def minutes(text):
+    """Minutes after local midnight of every formatted time in text (next-day times past 1440)."""
+    found = []
+    for hour, minute, half, next_day in _TIME.findall(text):
+        value = int(hour) % 12 * 60 + int(minute) + (720 if half == "PM" else 0)
+        found.append(value + (1440 if next_day else 0))
+    return found
+
+
+def strip_times(text):
+    """text without its formatted times, to tell a timing difference from a different value."""
+    return _TIME.sub("", text)
+
+
+def flatten(result, prefix=""):
+    """(element, text) pairs of a calculator result, nested lists and dicts joined with '.'."""
+    if isinstance(result, dict):
+        for key, value in result.items():
+            yield from flatten(value, f"{prefix}{key}.")
+    elif isinstance(result, list):
+        for i, value in enumerate(result):
+            yield from flatten(value, f"{prefix}{i}.")
+    else:
+        yield prefix.rstrip("."), str(result)
+
+
+def element_name(path):
+    """Element of a flattened path without list indexes: day_choghadiya.3.start_time -> day_choghadiya.start_time."""
+    return re.sub(r"\.\d+(?=\.|$)", "", path)
+
+
+def calculators():
+    """Calculators by the names precompute.VARIANTS uses."""
+    from choghadiya_calculator import ChoghadiyaCalculator
+    from gujarati_panchang_calculator import GujaratiPanchangCalculator
+    from marathi_panchang_calculator import MarathiPanchangCalculator
+    from panchang_calculator import PanchangCalculator
+    from telugu_panchang_calculator import TeluguPanchangCalculator
+    return {
+        "panchang": PanchangCalculator(),
+        "choghadiya": ChoghadiyaCalculator(),
+        "marathi": MarathiPanchangCalculator(),
+        "gujarati": GujaratiPanchangCalculator(),
+        "telugu": TeluguPanchangCalculator(),
+    }
+
+
+# Upper bound of the calls per run chosen by measure()
+MAX_CALLS = 1 << 16
+
+
+def measure(fn, repeat=5, number=None, min_seconds=0.2):
+    """
+    Seconds per call of fn(): best, median and mean of repeat runs.
+
+    number is the calls per run; by default it is raised until one run
+    takes at least min_seconds (like timeit's autorange).
+    """
+    timer = timeit.Timer(fn)
+    if number is None:
+        number = 1
+        while number < MAX_CALLS and timer.timeit(number) < min_seconds:
+            number *= 2
+    runs = [t / number for t in timer.repeat(repeat, number)]
+    return {
+        "best": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.fmean(runs),
+        "calls": number,
+        "repeat": repeat,
+    }
+
+
+def git_commit():
+    """Commit of the checkout with a -dirty suffix for local changes, or None outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def environment():
+    """What a result depends on besides the code: interpreter, machine and ephemeris backend."""
+    import ephemeris
+    import precision
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "ephemeris_path": ephemeris.ephe_path(),
+        "ephemeris_backend": ephemeris.probe(),
+        "precision": precision.current().name,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
@@ -0,0 +1,57 @@
+"""
+Compare Benchmark Results
+
+Prints the median time of every benchmark present in two result files of
+run.py and the ratio new / old, marking changes beyond --threshold:
+
+    python benchmarks/compare.py before.json after.json
+    python benchmarks/compare.py before.json after.json --threshold 0.05
+
+Results from different machines, interpreters or ephemeris backends are
+not comparable; a differing environment is printed first.
+"""
+
+import argparse
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old", type=str, help="Baseline results (run.py --output)")
+    parser.add_argument("new", type=str, help="Results to compare with the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change marked as slower/faster (default: 0.10)")
+
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    for key in ("python", "platform", "cpu_count", "ephemeris_backend", "precision"):
+        a, b = old["environment"].get(key), new["environment"].get(key)
+        if a != b:
+            print(f"Environment differs: {key} {a} -> {b}")
+    print(f"{old['environment'].get('commit')} -> {new['environment'].get('commit')}")
+
+    print(f"{'benchmark':<36}{'old ms':>12}{'new ms':>12}{'ratio':>8}")
+    for name, result in new["benchmarks"].items():
+        baseline = old["benchmarks"].get(name)
+        if baseline is None:
+            print(f"{name:<36}{'':>12}{result['median'] * 1000:>12.3f}{'new':>8}")
+            continue
+        ratio = result["median"] / baseline["median"] if baseline["median"] else float("inf")
+        mark = ""
+        if ratio > 1 + args.threshold:
+            mark = "  slower"
+        elif ratio < 1 - args.threshold:
+            mark = "  faster"
+        print(f"{name:<36}{baseline['median'] * 1000:>12.3f}{result['median'] * 1000:>12.3f}{ratio:>8.2f}{mark}")
+    for name in old["benchmarks"]:
+        if name not in new["benchmarks"]:
+            print(f"{name:<36}{old['benchmarks'][name]['median'] * 1000:>12.3f}{'':>12}{'gone':>8}")
+
+
+if __name__ == "__main__":
+    main()
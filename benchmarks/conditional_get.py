@@ -0,0 +1,90 @@
+"""
+Conditional GET Check
+
+Sends the revalidations a browser or proxy makes to every calculation
+endpoint and fails when one is answered wrongly:
+
+    python benchmarks/conditional_get.py
+
+For a fixed date both validators must hold: If-None-Match with the ETag
+and If-Modified-Since with the Last-Modified the response carried are
+answered with 304. For a date taken from the clock ("today") the response
+must carry no Last-Modified and If-Modified-Since must be answered with a
+full 200, since the content changes at local midnight without a new
+release; only the ETag, which holds the resolved date, may produce a 304.
+An ETag of another date must never produce one.
+"""
+
+import os
+import sys
+import warnings
+
+# The API must compute, not answer from a store left over from another run
+os.environ["PANCHANG_RESULT_STORE"] = ""
+os.environ["PANCHANG_WARMUP_CITIES"] = "0"
+
+from http_cache import last_modified
+
+ENDPOINTS = ["/panchang", "/choghadiya", "/choghadiya/range", "/marathi-panchang", "/gujrati-panchang",
+             "/telugu-panchang"]
+
+# Mumbai
+PLACE = {"lat": 19.07, "lon": 72.87, "tz": 5.5}
+FIXED = dict(PLACE, year=2024, month=6, day=18, hour=12, minute=0)
+OTHER_DAY = dict(FIXED, day=17)
+
+
+def check_endpoint(client, path):
+    """Descriptions of every wrong answer of one endpoint."""
+    errors = []
+    extra = {"days": 3} if path.endswith("/range") else {}
+
+    def get(params, **headers):
+        return client.get(path, params=dict(params, **extra), headers=headers)
+
+    fixed = get(FIXED)
+    if fixed.status_code != 200:
+        return [f"fixed date returned {fixed.status_code}"]
+    if fixed.headers.get("last-modified") != last_modified():
+        errors.append(f"fixed date Last-Modified is {fixed.headers.get('last-modified')!r}")
+    if get(FIXED, **{"If-None-Match": fixed.headers["etag"]}).status_code != 304:
+        errors.append("fixed date If-None-Match with its ETag is not 304")
+    if get(FIXED, **{"If-Modified-Since": last_modified()}).status_code != 304:
+        errors.append("fixed date If-Modified-Since with its Last-Modified is not 304")
+    if get(OTHER_DAY, **{"If-None-Match": fixed.headers["etag"]}).status_code != 200:
+        errors.append("ETag of another date is answered with 304")
+
+    today = get(PLACE)
+    if today.status_code != 200:
+        return errors + [f"today returned {today.status_code}"]
+    if "last-modified" in today.headers:
+        errors.append(f"today has Last-Modified {today.headers['last-modified']!r}")
+    if get(PLACE, **{"If-Modified-Since": last_modified()}).status_code != 200:
+        errors.append("today If-Modified-Since is answered with 304")
+    if get(PLACE, **{"If-None-Match": today.headers["etag"]}).status_code != 304:
+        errors.append("today If-None-Match with its ETag is not 304")
+    if get(PLACE, **{"If-None-Match": fixed.headers["etag"]}).status_code != 200:
+        errors.append("today is answered with 304 for the ETag of another date")
+    return errors
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    from fastapi.testclient import TestClient
+    import api
+
+    client = TestClient(api.app)
+    failed = 0
+    for path in ENDPOINTS:
+        errors = check_endpoint(client, path)
+        failed += bool(errors)
+        print(f"{path:<22}{'ok' if not errors else '; '.join(errors)}")
+
+    if failed:
+        print(f"{failed} endpoint(s) answer revalidations wrongly")
+        sys.exit(1)
+    print("Every revalidation answered correctly")
+
+
+if __name__ == "__main__":
+    main()
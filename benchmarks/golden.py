@@ -0,0 +1,315 @@
+"""
+Golden Output Corpus
+
+Reference outputs of every calculator from the standard (slowest, most
+precise) paths, and a comparison that reports how far another path
+deviates from them, per element:
+
+    python benchmarks/golden.py generate
+    python benchmarks/golden.py compare --precision fast
+    python benchmarks/golden.py compare --output deviations.json
+
+generate computes every precompute.VARIANTS variant for PLACES (Ushuaia to
+Tromso, so polar days are included) on dates from 1900 to 2200, --step-days
+apart, and writes one JSON line per result to golden/reference.jsonl.gz
+(generated data, not committed). Results that raise are recorded with
+their error, which is part of the reference too.
+
+compare recomputes the same cases with the current code and the given
+precision tier and reports, per variant and element, the largest deviation
+in minutes of the formatted times and the number of values that differ
+otherwise (a different name, a missing end time, a new error). Across
+tiers only whether a case raised is compared, not the message: the polar
+days at Tromso raise under both tiers, but with the error of the tier's
+ephemeris backend. Cases where the reference raised and the candidate
+returned a result have nothing to be compared with and are counted
+separately as reference errors. It exits with status 1 when a count
+exceeds the tier's declared tolerance in TOLERANCES (None: not limited),
+so a fast path can only be enabled within its tolerance.
+
+The corpus header records the source tree (commit, plus a hash of the
+uncommitted changes) and the tier it was generated with. compare refuses
+a corpus generated from the same tree at the same tier, which would only
+check the code against itself. Generate the reference from a known-good
+commit instead:
+
+    git worktree add /tmp/golden-ref <known-good commit>
+    python /tmp/golden-ref/benchmarks/golden.py generate --corpus benchmarks/golden/reference.jsonl.gz
+
+Timezone offsets are fixed standard offsets, so the corpus does not change
+with the tz database.
+"""
+
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+from common import ROOT, calculators, element_name, environment, flatten, git_commit, minutes, strip_times
+
+import precision
+from http_cache import ALGORITHM_VERSION
+from precompute import VARIANTS
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "reference.jsonl.gz")
+
+# name, latitude, longitude, standard timezone offset - south to north
+PLACES = [
+    ("Ushuaia", -54.8019, -68.3030, -3.0),
+    ("Cape Town", -33.9249, 18.4241, 2.0),
+    ("Sydney", -33.8688, 151.2093, 10.0),
+    ("Quito", -0.1807, -78.4678, -5.0),
+    ("Singapore", 1.3521, 103.8198, 8.0),
+    ("Chennai", 13.0827, 80.2707, 5.5),
+    ("New Delhi", 28.6139, 77.2090, 5.5),
+    ("New York", 40.7128, -74.0060, -5.0),
+    ("London", 51.5074, -0.1278, 0.0),
+    ("Oslo", 59.9139, 10.7522, 1.0),
+    ("Reykjavik", 64.1466, -21.9426, 0.0),
+    ("Tromso", 69.6492, 18.9553, 1.0),
+]
+
+FIRST_DATE = datetime.date(1900, 1, 1)
+LAST_DATE = datetime.date(2200, 12, 31)
+
+# Largest deviation in minutes, number of other differences and number of
+# results where the reference raised allowed per tier; None is not limited
+TOLERANCES = {
+    "standard": {"minutes": 0, "mismatches": 0, "reference_errors": 0},
+    "fast": {"minutes": 1, "mismatches": 0, "reference_errors": None},
+}
+
+# Exit status when compare refuses a corpus from the tree being checked
+SAME_TREE = 2
+
+# Calculators of this worker process, created by _init_worker
+_CALCULATORS = None
+
+
+def _init_worker():
+    global _CALCULATORS
+    _CALCULATORS = calculators()
+
+
+def source_tree():
+    """Commit of the checkout, with a hash of the uncommitted changes if any; None outside git."""
+    commit = git_commit()
+    if commit is None or not commit.endswith("-dirty"):
+        return commit
+    diff = subprocess.run(["git", "diff", "HEAD"], cwd=ROOT, capture_output=True).stdout
+    return f"{commit}.{hashlib.sha1(diff).hexdigest()[:12]}"
+
+
+def dates(step_days):
+    """Dates from FIRST_DATE to LAST_DATE, step_days apart."""
+    days = (LAST_DATE - FIRST_DATE).days
+    return [FIRST_DATE + datetime.timedelta(days=offset) for offset in range(0, days + 1, step_days)]
+
+
+def _compute_place(task):
+    """Records of every date and variant of one place under the given tier."""
+    place, date_list, variants, tier = task
+    name, lat, lon, tz = place
+    records = []
+    with precision.use(tier):
+        for date in date_list:
+            for variant in variants:
+                record = {"variant": variant, "place": name, "date": date.isoformat()}
+                try:
+                    record["result"] = VARIANTS[variant](_CALCULATORS, date.year, date.month, date.day, lat, lon, tz)
+                except Exception as e:
+                    record["error"] = str(e)
+                records.append(record)
+    return records
+
+
+def compute(date_list, variants, tier, workers, places=PLACES):
+    """All records for places x date_list x variants, in a pool of workers."""
+    tasks = [(place, date_list, variants, tier) for place in places]
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        for records in pool.imap(_compute_place, tasks):
+            yield from records
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def generate(args):
+    variants = args.variants
+    date_list = dates(args.step_days)
+    os.makedirs(os.path.dirname(os.path.abspath(args.corpus)), exist_ok=True)
+    print(f"Generating {len(variants)} variant(s) x {len(date_list)} date(s) x {len(PLACES)} place(s) "
+          f"into {args.corpus}")
+
+    started = time.perf_counter()
+    count = errors = 0
+    with _open(args.corpus, "w") as f:
+        header = {"algorithm_version": ALGORITHM_VERSION, "source": source_tree(), "precision": precision.DEFAULT,
+                  "step_days": args.step_days, "variants": variants, "places": PLACES,
+                  "environment": environment()}
+        f.write(json.dumps({"header": header}) + "\n")
+        for record in compute(date_list, variants, precision.DEFAULT, args.workers):
+            f.write(json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n")
+            count += 1
+            errors += "error" in record
+    print(f"Wrote {count} records ({errors} errors) in {time.perf_counter() - started:.1f}s")
+
+
+# deviations() value for a result where the reference has an error
+REFERENCE_ERROR = "reference_error"
+
+
+def deviations(reference, candidate, messages=True):
+    """
+    (element, deviation) of every element that differs between two records.
+
+    deviation is the difference in minutes, None for a mismatch, or
+    REFERENCE_ERROR when the reference raised and the candidate did not.
+    Error messages are only compared with messages set; across tiers they
+    name the ephemeris backend (a missing .se1 file under Swiss Ephemeris,
+    a date outside the Moon range under Moshier) for the same failure.
+    """
+    if "error" in reference:
+        if "error" not in candidate:
+            yield "error", REFERENCE_ERROR
+        elif messages and reference["error"] != candidate["error"]:
+            yield "error", None
+        return
+    if "error" in candidate:
+        yield "error", None
+        return
+
+    actual = dict(flatten(candidate["result"]))
+    for path, text in flatten(reference["result"]):
+        other = actual.get(path)
+        if other == text:
+            continue
+        element = element_name(path)
+        expected_times, actual_times = minutes(text), minutes(other or "")
+        # Same text apart from the times: a timing deviation
+        if (other is not None and expected_times and len(expected_times) == len(actual_times)
+                and strip_times(text) == strip_times(other)):
+            yield element, max(abs(a - b) for a, b in zip(expected_times, actual_times))
+        else:
+            yield element, None
+
+
+def compare(args):
+    with _open(args.corpus, "r") as f:
+        header = json.loads(f.readline())["header"]
+        references = [json.loads(line) for line in f]
+
+    source = header.get("source")
+    same_tier = args.precision == header.get("precision", precision.DEFAULT)
+    if source is None:
+        print("Corpus does not record the tree it was generated from; generate it again")
+        sys.exit(SAME_TREE)
+    if source == source_tree() and same_tier:
+        print(f"Corpus was generated from this tree ({source}) at {args.precision} precision, so compare "
+              f"would check the code against itself. Generate it from a known-good commit:\n"
+              f"    git worktree add /tmp/golden-ref <known-good commit>\n"
+              f"    python /tmp/golden-ref/benchmarks/golden.py generate --corpus {args.corpus}")
+        sys.exit(SAME_TREE)
+    print(f"Reference: {source} at {header.get('precision', precision.DEFAULT)} precision, "
+          f"generated {header['environment'].get('timestamp')}")
+
+    if header["algorithm_version"] != ALGORITHM_VERSION:
+        print(f"Corpus was generated for algorithm {header['algorithm_version']}, this checkout is "
+              f"{ALGORITHM_VERSION}; differences may be intended")
+
+    variants = [v for v in header["variants"] if v in args.variants]
+    date_list = dates(header["step_days"])
+    places = [tuple(place) for place in header["places"]]
+    tolerance = dict(TOLERANCES[args.precision])
+    if args.tolerance is not None:
+        tolerance["minutes"] = args.tolerance
+
+    # Through JSON like the corpus, so tuples and lists compare equal
+    candidates = {(r["variant"], r["place"], r["date"]): json.loads(json.dumps(r))
+                  for r in compute(date_list, variants, args.precision, args.workers, places)}
+
+    report = {}
+    compared = 0
+    for reference in references:
+        key = (reference["variant"], reference["place"], reference["date"])
+        if reference["variant"] not in variants:
+            continue
+        compared += 1
+        for element, deviation in deviations(reference, candidates[key], same_tier):
+            entry = report.setdefault(reference["variant"], {}).setdefault(
+                element, {"max_minutes": 0, "mismatches": 0, "reference_errors": 0, "worst": None})
+            if deviation == REFERENCE_ERROR:
+                entry["reference_errors"] += 1
+            elif deviation is None:
+                entry["mismatches"] += 1
+                entry["worst"] = entry["worst"] or f"{key[1]} {key[2]}"
+            elif deviation > entry["max_minutes"]:
+                entry["max_minutes"] = deviation
+                entry["worst"] = f"{key[1]} {key[2]}"
+
+    failed = []
+    limit = lambda name: "any" if tolerance[name] is None else tolerance[name]
+    print(f"Compared {compared} records at {args.precision} precision (tolerance {limit('minutes')} min, "
+          f"{limit('mismatches')} mismatches, {limit('reference_errors')} reference errors)")
+    print(f"{'variant':<18}{'element':<34}{'max min':>8}{'mismatch':>10}{'ref err':>9}  worst case")
+    for variant, elements in sorted(report.items()):
+        for element, entry in sorted(elements.items()):
+            over = any(tolerance[name] is not None and entry[key] > tolerance[name]
+                       for key, name in (("max_minutes", "minutes"), ("mismatches", "mismatches"),
+                                         ("reference_errors", "reference_errors")))
+            if over:
+                failed.append(f"{variant} {element}")
+            print(f"{variant:<18}{element:<34}{entry['max_minutes']:>8}{entry['mismatches']:>10}"
+                  f"{entry['reference_errors']:>9}  {entry['worst'] or ''}{'  OVER TOLERANCE' if over else ''}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"precision": args.precision, "reference": source, "tolerance": tolerance,
+                       "compared": compared, "elements": report}, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if failed:
+        print(f"{len(failed)} element(s) over tolerance")
+        sys.exit(1)
+    print("All elements within tolerance")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the golden output corpus or compare against it")
+    parser.add_argument("command", choices=("generate", "compare"))
+    parser.add_argument("--corpus", type=str, default=DEFAULT_CORPUS,
+                        help="Corpus file, gzipped if it ends in .gz (default: golden/reference.jsonl.gz)")
+    parser.add_argument("--variants", type=str, default=",".join(VARIANTS),
+                        help=f"Comma-separated variants (default: all of {', '.join(VARIANTS)})")
+    parser.add_argument("--step-days", type=int, default=1009,
+                        help="Days between generated dates (default: 1009, about 110 dates)")
+    parser.add_argument("--precision", type=str, default=precision.DEFAULT, choices=list(precision.TIERS),
+                        help=f"Precision tier compared with the corpus (default: {precision.DEFAULT})")
+    parser.add_argument("--tolerance", type=float, help="Override the tier's tolerance in minutes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", type=str, help="compare: write the report as JSON to this file")
+
+    args = parser.parse_args()
+
+    args.variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    unknown = [v for v in args.variants if v not in VARIANTS]
+    if unknown:
+        parser.error(f"Unknown variant(s): {', '.join(unknown)}. Valid variants: {', '.join(VARIANTS)}")
+
+    if args.command == "generate":
+        generate(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
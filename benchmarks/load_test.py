@@ -0,0 +1,455 @@
+"""
+Load Test
+
+Starts the API locally (serve.py, uvicorn workers) against a stub GeoNames
+server, replays a configurable request mix at it and reports throughput,
+latency percentiles and error rates as JSON:
+
+    python benchmarks/load_test.py --duration 60 --concurrency 32
+    python benchmarks/load_test.py --workers 4 --rate 400 --output release.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --duration 30
+
+Traffic:
+    --mix           endpoint weights, e.g. panchang=50,choghadiya=20,...
+    cities          the --cities most populous cities of cities.json, picked
+                    with Zipfian popularity (--zipf exponent); without a
+                    cities.json, coordinates of common.PLACES are used instead
+    --unknown-share share of requests for cities that are not in cities.json;
+                    they fall through to the GeoNames stub, which finds
+                    nothing, and are expected to end in 404
+    --now-share     share of requests without a date (the API uses now); the
+                    rest ask for a day within --date-spread days of today
+
+Without --rate, --concurrency clients send requests back to back (closed
+loop). With --rate, requests arrive as a Poisson process at that rate and
+latency is measured from the scheduled arrival, so a server that falls
+behind shows it in the percentiles instead of silently slowing the clients.
+
+An error is a failed connection, a timeout, a 5xx, or a 4xx for a known
+city or coordinates. The first --warmup seconds are not counted. Only the
+standard library is used on the client side; the server gets a fresh
+result store in a temporary directory unless --store is given.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+from common import PLACES, ROOT, environment
+
+DEFAULT_MIX = "panchang=50,choghadiya=20,marathi-panchang=10,gujrati-panchang=10,telugu-panchang=10"
+
+# Endpoints that take hour and minute besides the date
+DATETIME_ENDPOINTS = {"panchang", "marathi-panchang", "gujrati-panchang", "telugu-panchang"}
+
+
+# -----------------------------------------------------------------------------
+# Stub GeoNames server
+# -----------------------------------------------------------------------------
+
+class StubGeoNames:
+    """Minimal HTTP server answering every GeoNames search with no results."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = 0
+        self._server = None
+
+    async def start(self, host="127.0.0.1"):
+        self._server = await asyncio.start_server(self._handle, host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{self.port}"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                self.requests += 1
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                body = b'{"totalResultsCount": 0, "geonames": []}'
+                keep_alive = b"connection: close" not in request.lower()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                             + (b"" if keep_alive else b"Connection: close\r\n") + b"\r\n" + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+# -----------------------------------------------------------------------------
+# HTTP/1.1 keep-alive client
+# -----------------------------------------------------------------------------
+
+class Connection:
+    """One keep-alive connection; reopened after an error."""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def get(self, target):
+        """Status code of GET target; the body is read and discarded."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            return await asyncio.wait_for(self._get(target), self.timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _get(self, target):
+        self.writer.write(f"GET {target} HTTP/1.1\r\nHost: {self.host}\r\nAccept: application/json\r\n\r\n".encode())
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+# -----------------------------------------------------------------------------
+# Workload
+# -----------------------------------------------------------------------------
+
+def parse_mix(text):
+    """{endpoint: weight} from 'panchang=50,choghadiya=20'."""
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        mix[name.strip().strip("/")] = float(weight or 1)
+    return mix
+
+
+class Workload:
+    """Random requests following the configured mix, city popularity and dates."""
+
+    def __init__(self, args, seed=0):
+        self.rng = random.Random(seed)
+        self.mix = parse_mix(args.mix)
+        self.endpoints = list(self.mix)
+        self.endpoint_weights = list(self.mix.values())
+        self.unknown_share = args.unknown_share
+        self.now_share = args.now_share
+        self.date_spread = args.date_spread
+
+        from city_utils import load_cities
+        from precompute import top_cities
+        cities = top_cities(load_cities(), args.cities)
+        if cities:
+            self.locations = [{"city": city["city"], **({"country": city["countryCode"]} if city.get("countryCode") else {})}
+                              for city in cities]
+        else:
+            print("No cities.json: requesting the coordinates of common.PLACES instead of city names")
+            self.locations = [{"lat": lat, "lon": lon, "tz": tz} for name, lat, lon, tz in PLACES]
+        # Zipf: the city of rank r is requested in proportion to 1 / r^s
+        weights = [1 / (rank ** args.zipf) for rank in range(1, len(self.locations) + 1)]
+        total = 0.0
+        self.cumulative = []
+        for weight in weights:
+            total += weight
+            self.cumulative.append(total)
+
+        self.unknown = [f"Nowhereville {i}" for i in range(1000)]
+
+    def next(self):
+        """(endpoint, target, unknown) of the next request."""
+        endpoint = self.rng.choices(self.endpoints, self.endpoint_weights)[0]
+        unknown = self.rng.random() < self.unknown_share
+        if unknown:
+            params = {"city": self.rng.choice(self.unknown)}
+        else:
+            params = dict(self.rng.choices(self.locations, cum_weights=self.cumulative)[0])
+
+        if self.rng.random() >= self.now_share:
+            date = datetime.date.today() + datetime.timedelta(days=self.rng.randrange(self.date_spread))
+            params.update(year=date.year, month=date.month, day=date.day)
+            if endpoint in DATETIME_ENDPOINTS:
+                params.update(hour=self.rng.randrange(24), minute=self.rng.randrange(60))
+        return endpoint, f"/{endpoint}?{urllib.parse.urlencode(params)}", unknown
+
+
+# -----------------------------------------------------------------------------
+# Runner
+# -----------------------------------------------------------------------------
+
+class Recorder:
+    def __init__(self, measure_from, measure_until):
+        self.measure_from = measure_from
+        self.measure_until = measure_until
+        self.samples = []  # (endpoint, seconds, status or None, unknown)
+        self.exceptions = {}
+
+    def record(self, start, endpoint, seconds, status, unknown, error=None):
+        if not self.measure_from <= start < self.measure_until:
+            return
+        self.samples.append((endpoint, seconds, status, unknown))
+        if error is not None:
+            name = type(error).__name__
+            self.exceptions[name] = self.exceptions.get(name, 0) + 1
+
+
+async def send(connection, workload_item, recorder, scheduled=None):
+    endpoint, target, unknown = workload_item
+    start = time.perf_counter()
+    since = scheduled if scheduled is not None else start
+    try:
+        status = await connection.get(target)
+        recorder.record(since, endpoint, time.perf_counter() - since, status, unknown)
+    except Exception as e:
+        recorder.record(since, endpoint, time.perf_counter() - since, None, unknown, e)
+
+
+async def closed_loop(host, port, workload, recorder, args, end):
+    async def client():
+        connection = Connection(host, port, args.timeout)
+        while time.perf_counter() < end:
+            await send(connection, workload.next(), recorder)
+        connection.close()
+
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+
+
+async def open_loop(host, port, workload, recorder, args, end):
+    queue = asyncio.Queue()
+
+    async def arrivals():
+        rng = random.Random(1)
+        scheduled = time.perf_counter()
+        while scheduled < end:
+            scheduled += rng.expovariate(args.rate)
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            queue.put_nowait((scheduled, workload.next()))
+        for _ in range(args.concurrency):
+            queue.put_nowait(None)
+
+    async def client():
+        connection = Connection(host, port, args.timeout)
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            scheduled, request = item
+            await send(connection, request, recorder, scheduled)
+        connection.close()
+
+    await asyncio.gather(arrivals(), *(client() for _ in range(args.concurrency)))
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, seconds):
+    latencies = sorted(s[1] for s in samples)
+    status = {}
+    errors = 0
+    for endpoint, latency, code, unknown in samples:
+        key = str(code) if code is not None else "exception"
+        status[key] = status.get(key, 0) + 1
+        # Unknown cities are expected to be 404
+        if code is None or code >= 500 or (code >= 400 and not (unknown and code == 404)):
+            errors += 1
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / seconds, 2) if seconds else None,
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 5) if samples else None,
+        "status": dict(sorted(status.items())),
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1] if latencies else None),
+            "mean": ms(sum(latencies) / len(latencies) if latencies else None),
+        },
+    }
+
+
+def report(recorder, seconds, stub, args):
+    by_endpoint = {}
+    for sample in recorder.samples:
+        by_endpoint.setdefault(sample[0], []).append(sample)
+    unknown = [s for s in recorder.samples if s[3]]
+    return {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "environment": environment(),
+        "seconds": round(seconds, 3),
+        **summarize(recorder.samples, seconds),
+        "exceptions": recorder.exceptions,
+        "endpoints": {name: summarize(samples, seconds) for name, samples in sorted(by_endpoint.items())},
+        "unknown_cities": {
+            "requests": len(unknown),
+            "not_found": sum(1 for s in unknown if s[2] == 404),
+        },
+        "geonames_stub_requests": stub.requests if stub else None,
+    }
+
+
+# -----------------------------------------------------------------------------
+# Server
+# -----------------------------------------------------------------------------
+
+def start_server(args, geonames_url, workdir):
+    """serve.py in a subprocess on a free port; returns (process, port, log path)."""
+    import socket
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    env = dict(os.environ)
+    env["PANCHANG_GEONAMES_URL"] = geonames_url
+    env["PANCHANG_RESULT_STORE"] = args.store if args.store is not None else os.path.join(workdir, "results.sqlite")
+    log_path = os.path.join(workdir, "server.log")
+    log = open(log_path, "w")
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "serve.py"), "--host", "127.0.0.1",
+                                "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"],
+                               cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return process, port, log_path
+
+
+async def wait_ready(host, port, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        connection = Connection(host, port, 5)
+        try:
+            if await connection.get("/ready") == 200:
+                return True
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            connection.close()
+        await asyncio.sleep(0.2)
+    return False
+
+
+async def run(args):
+    stub = None
+    process = None
+    workdir = tempfile.mkdtemp(prefix="panchang-load-")
+    try:
+        if args.url:
+            parsed = urllib.parse.urlsplit(args.url)
+            host, port = parsed.hostname, parsed.port or 80
+        else:
+            stub = StubGeoNames(args.geonames_delay / 1000)
+            geonames_url = await stub.start()
+            process, port, log_path = start_server(args, geonames_url, workdir)
+            host = "127.0.0.1"
+            print(f"Started {args.workers} worker(s) on port {port} (log: {log_path}), GeoNames stub at {geonames_url}")
+
+        if not await wait_ready(host, port):
+            raise RuntimeError(f"Server on {host}:{port} did not become ready")
+
+        workload = Workload(args)
+        start = time.perf_counter()
+        measure_from = start + args.warmup
+        end = measure_from + args.duration
+        recorder = Recorder(measure_from, end)
+        mode = f"{args.rate}/s open loop" if args.rate else "closed loop"
+        print(f"Running {args.warmup}s warm-up + {args.duration}s, {args.concurrency} connections, {mode}")
+        if args.rate:
+            await open_loop(host, port, workload, recorder, args, end)
+        else:
+            await closed_loop(host, port, workload, recorder, args, end)
+        return report(recorder, args.duration, stub, args)
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if stub is not None:
+            await stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a realistic request mix against a local API server")
+    parser.add_argument("--url", type=str, help="Test an already running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes (default: 1)")
+    parser.add_argument("--store", type=str, help="Result store for the server (default: a fresh temporary file)")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds (default: 30)")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds before measuring starts (default: 5)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Client connections (default: 16)")
+    parser.add_argument("--rate", type=float, help="Open loop: requests per second (default: closed loop)")
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout in seconds (default: 30)")
+    parser.add_argument("--mix", type=str, default=DEFAULT_MIX, help=f"Endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--cities", type=int, default=1000, help="Most populous cities requested (default: 1000)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of city popularity (default: 1.1)")
+    parser.add_argument("--unknown-share", type=float, default=0.02,
+                        help="Share of requests for unknown cities (default: 0.02)")
+    parser.add_argument("--now-share", type=float, default=0.5, help="Share of requests without a date (default: 0.5)")
+    parser.add_argument("--date-spread", type=int, default=30, help="Days after today requested dates fall in (default: 30)")
+    parser.add_argument("--geonames-delay", type=float, default=50,
+                        help="Stub GeoNames response delay in ms (default: 50)")
+    parser.add_argument("--output", type=str, help="Write the report to this file (default: print it)")
+
+    args = parser.parse_args()
+
+    unknown = [name for name in parse_mix(args.mix) if name not in DATETIME_ENDPOINTS | {"choghadiya"}]
+    if unknown:
+        parser.error(f"Unknown endpoint(s) in --mix: {', '.join(unknown)}")
+
+    result = asyncio.run(run(args))
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"RPS {result['rps']}, p50 {result['latency_ms']['p50']} ms, p99 {result['latency_ms']['p99']} ms, "
+              f"error rate {result['error_rate']}; report written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
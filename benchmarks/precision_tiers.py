@@ -0,0 +1,171 @@
+"""
+Precision Tier Benchmark
+
+Times every calculator variant under each precision tier over a matrix of
+places and dates, and measures how far the fast tier's results are from
+standard ones:
+
+    python benchmarks/precision_tiers.py
+    python benchmarks/precision_tiers.py --repeat 5 --output tiers.json
+
+Two errors are reported for the fast tier:
+
+    primitives  sankranti sunrise, sunset, new/full moon and the tithi and
+                nakshatra end times as Julian days, difference in seconds
+    calculators every "HH:MM AM" time in the formatted results, difference
+                in minutes per element; elements whose structure differs
+                (e.g. a skipped tithi found by one tier only) are counted
+                separately
+
+The sun-times cache is cleared before every timed run so each run pays for
+its own sunrises. Without ephemeris files (see /ready) standard also runs
+on Moshier, and both the speedup and the errors leave out the ephemeris
+itself: they only show the tolerance, interpolation and sunrise
+refinement of the tiers. How far Moshier is from the Swiss Ephemeris
+files can only be measured with the files installed; the report records
+the backend and says so when it is Moshier.
+"""
+
+import argparse
+import json
+import time
+
+from common import DATES, PLACES, calculators, element_name, flatten, minutes
+
+import ephemeris
+import precision
+import sankranti
+from precompute import VARIANTS
+from sankranti import Place
+from sun_cache import SUN_CACHE
+
+def primitives(jd, place):
+    """Julian days of the primitive events of one day, by name."""
+    tz = place.timezone
+    tithi = sankranti.tithi(jd, place)
+    nakshatra = sankranti.nakshatra(jd, place)
+    day_start = jd - tz / 24
+    dms_jd = lambda dms: day_start + (dms[0] + dms[1] / 60 + dms[2] / 3600) / 24
+    return {
+        "sunrise": sankranti.sunrise(jd, place)[0],
+        "sunset": sankranti.sunset(jd, place)[0],
+        "new_moon": sankranti.new_moon(jd, tithi[0], -1),
+        "full_moon": sankranti.full_moon(jd, tithi[0], +1),
+        "tithi_end": dms_jd(tithi[1]),
+        "nakshatra_end": dms_jd(nakshatra[1]),
+    }
+
+
+def run_tier(name, calcs, repeat):
+    """Results and timings of every variant and primitive under the named tier."""
+    results, seconds, events = {}, {}, {}
+    with precision.use(name):
+        for variant, compute in VARIANTS.items():
+            best = None
+            for _ in range(repeat):
+                SUN_CACHE.clear()
+                start = time.perf_counter()
+                for place_name, lat, lon, tz in PLACES:
+                    for date in DATES:
+                        try:
+                            result = compute(calcs, date.year, date.month, date.day, lat, lon, tz)
+                        except Exception as e:
+                            result = {"error": str(e)}
+                        results[(variant, place_name, date)] = result
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            seconds[variant] = best
+
+        SUN_CACHE.clear()
+        start = time.perf_counter()
+        for place_name, lat, lon, tz in PLACES:
+            place = Place(lat, lon, tz)
+            for date in DATES:
+                try:
+                    events[(place_name, date)] = primitives(sankranti.gregorian_to_jd(date), place)
+                except Exception:
+                    events[(place_name, date)] = None
+        seconds["primitives"] = time.perf_counter() - start
+    return results, seconds, events
+
+
+def compare_primitives(reference, candidate):
+    """Largest difference in seconds per primitive event."""
+    worst = {}
+    for key, expected in reference.items():
+        actual = candidate.get(key)
+        if expected is None or actual is None:
+            continue
+        for event, jd in expected.items():
+            error = abs(actual[event] - jd) * 86400
+            worst[event] = max(worst.get(event, 0.0), error)
+    return {event: round(error, 3) for event, error in sorted(worst.items())}
+
+
+def compare_results(reference, candidate):
+    """Per variant: largest difference in minutes per element and elements that differ in structure."""
+    report = {}
+    for (variant, place_name, date), expected in reference.items():
+        entry = report.setdefault(variant, {"max_minutes": {}, "structural": 0})
+        actual = dict(flatten(candidate[(variant, place_name, date)]))
+        for element, text in flatten(expected):
+            a, b = minutes(text), minutes(actual.get(element, ""))
+            if len(a) != len(b):
+                entry["structural"] += 1
+                continue
+            if a:
+                element = element_name(element)
+                error = max(abs(x - y) for x, y in zip(a, b))
+                entry["max_minutes"][element] = max(entry["max_minutes"].get(element, 0), error)
+    for entry in report.values():
+        entry["max_minutes"] = dict(sorted(entry["max_minutes"].items()))
+        entry["max_minutes_overall"] = max(entry["max_minutes"].values(), default=0)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the precision tiers against each other")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant, best is kept (default: 3)")
+    parser.add_argument("--output", type=str, help="Write the report as JSON to this file")
+
+    args = parser.parse_args()
+
+    calcs = calculators()
+    tiers = list(precision.TIERS)
+    print(f"{len(PLACES)} places x {len(DATES)} dates, best of {args.repeat}")
+
+    runs = {name: run_tier(name, calcs, args.repeat) for name in tiers}
+    reference_results, reference_seconds, reference_events = runs[precision.DEFAULT]
+
+    backend = ephemeris.probe()
+    report = {"places": len(PLACES), "dates": len(DATES), "repeat": args.repeat,
+              "ephemeris_backend": backend, "tiers": {}}
+    for name in tiers:
+        results, seconds, events = runs[name]
+        report["tiers"][name] = {
+            "flags": precision.tier(name).flags,
+            "seconds": {key: round(value, 4) for key, value in seconds.items()},
+            "speedup": {key: round(reference_seconds[key] / value, 2) for key, value in seconds.items() if value},
+            "max_error_seconds": compare_primitives(reference_events, events),
+            "calculators": compare_results(reference_results, results),
+        }
+
+    print(f"{'tier':<10}{'variant':<20}{'seconds':>10}{'speedup':>10}{'max min':>10}{'structural':>12}")
+    for name, entry in report["tiers"].items():
+        for key, value in entry["seconds"].items():
+            calculator = entry["calculators"].get(key, {})
+            print(f"{name:<10}{key:<20}{value:>10.3f}{entry['speedup'][key]:>10.2f}"
+                  f"{calculator.get('max_minutes_overall', ''):>10}{calculator.get('structural', ''):>12}")
+        print(f"{name:<10}max error (s) {entry['max_error_seconds']}")
+    if backend == "moshier":
+        print(f"Standard ran on the Moshier fallback ({ephemeris.ephe_path()} has no ephemeris files): "
+              f"the errors above do not include the difference between Moshier and Swiss Ephemeris")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Benchmark Suite
+
+Times the sankranti primitives, every calculator over a fixed matrix of
+places and dates, city lookups on a large synthetic city store and
+end-to-end requests through the ASGI app in-process, and writes the
+results as JSON so runs can be compared across commits:
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --groups sankranti,calculators --output after.json
+    python benchmarks/compare.py before.json after.json
+
+Groups:
+    sankranti    sunrise, tithi, nakshatra, masa, new_moon, bisection_search,
+                 inverse_lagrange for one day and place
+    calculators  calculate of each variant over PLACES x DATES (common.py),
+                 and a 30-day choghadiya range
+    cities       find_city and search_cities on --cities synthetic cities
+    api          GET requests through api.app with a cold and a warm cache
+
+Times are seconds per call: best, median and mean of --repeat runs.
+Unless a name ends in .cached the sun-times cache (and for the API the
+result cache) is cleared before every call, so each call pays for its own
+sunrises. The result store, the GeoNames fallback and the cache warm-up
+are disabled. The environment block records the commit, interpreter and
+ephemeris backend, which all change the numbers.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import time
+
+from common import DATES, PLACES, calculators, environment, measure
+
+GROUPS = ("sankranti", "calculators", "cities", "api")
+
+# Day and place of the single-day benchmarks
+DAY = datetime.date(2026, 5, 1)
+PLACE = PLACES[0]
+
+
+def sankranti_benchmarks(args):
+    import sankranti
+    from sankranti import Place
+    from sun_cache import SUN_CACHE
+
+    place = Place(*PLACE[1:])
+    jd = sankranti.gregorian_to_jd(DAY)
+    tithi = sankranti.tithi(jd, place)[0]
+    rise = sankranti.sunrise(jd, place)[0] - place.timezone / 24
+    target = sankranti.lunar_longitude(rise + 0.5)
+    offsets = [0.0, 0.25, 0.5, 0.75, 1.0]
+    longitudes = sankranti.unwrap_angles([sankranti.lunar_longitude(rise + t) for t in offsets])
+
+    def cold(fn):
+        def call():
+            SUN_CACHE.clear()
+            return fn()
+        return call
+
+    return {
+        "sankranti.sunrise": cold(lambda: sankranti.sunrise(jd, place)),
+        "sankranti.sunrise.cached": lambda: sankranti.sunrise(jd, place),
+        "sankranti.tithi": cold(lambda: sankranti.tithi(jd, place)),
+        "sankranti.nakshatra": cold(lambda: sankranti.nakshatra(jd, place)),
+        "sankranti.masa": cold(lambda: sankranti.masa(jd, place)),
+        "sankranti.new_moon": lambda: sankranti.new_moon(jd, tithi, -1),
+        "sankranti.bisection_search": lambda: sankranti.bisection_search(
+            lambda t: sankranti.norm180((sankranti.lunar_longitude(t) - target) % 360), rise, rise + 1),
+        "sankranti.inverse_lagrange": lambda: sankranti.inverse_lagrange(offsets, longitudes, longitudes[2] + 1),
+    }
+
+
+def calculator_benchmarks(args):
+    from precompute import VARIANTS
+    from sun_cache import SUN_CACHE
+
+    calcs = calculators()
+
+    def over_matrix(compute):
+        def call():
+            SUN_CACHE.clear()
+            for name, lat, lon, tz in PLACES:
+                for date in DATES:
+                    compute(calcs, date.year, date.month, date.day, lat, lon, tz)
+        return call
+
+    def choghadiya_range():
+        SUN_CACHE.clear()
+        name, lat, lon, tz = PLACE
+        list(calcs["choghadiya"].calculate_range(DAY.year, DAY.month, DAY.day, 30, lat, lon, tz))
+
+    benchmarks = {f"calculators.{variant}": (over_matrix(compute), len(PLACES) * len(DATES))
+                  for variant, compute in VARIANTS.items()}
+    benchmarks["calculators.choghadiya_range_30"] = (choghadiya_range, 30)
+    return benchmarks
+
+
+def synthetic_cities(n, seed=0):
+    """n cities with generated names, states and countries; deterministic for a seed."""
+    rng = random.Random(seed)
+    syllables = ["ka", "ra", "pur", "na", "ga", "bad", "ab", "li", "to", "san", "mer", "vil",
+                 "ton", "sk", "ov", "ia", "del", "har", "ban", "shi"]
+    countries = [(f"Country{i:02d}", f"C{i:02d}") for i in range(60)]
+    cities = []
+    for i in range(n):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+        country, code = rng.choice(countries)
+        cities.append({
+            "city": f"{name} {i}" if rng.random() < 0.3 else name,
+            "asciiName": name,
+            "stateName": f"State{rng.randint(0, 40):02d}",
+            "countryName": country,
+            "countryCode": code,
+            "latitude": round(rng.uniform(-60, 70), 4),
+            "longitude": round(rng.uniform(-180, 180), 4),
+            "timezone": "Asia/Kolkata",
+            "population": rng.randint(1000, 10_000_000),
+        })
+    return cities
+
+
+def city_benchmarks(args):
+    from city_utils import find_city, search_cities
+
+    cities = synthetic_cities(args.cities)
+    last = cities[-1]
+
+    return {
+        "cities.find_city.exact": lambda: find_city(cities, last["city"], use_geonames_fallback=False),
+        "cities.find_city.state_country": lambda: find_city(
+            cities, last["city"], last["stateName"], last["countryCode"], use_geonames_fallback=False),
+        "cities.find_city.miss": lambda: find_city(cities, "Nowhereville", use_geonames_fallback=False),
+        "cities.search_cities": lambda: search_cities(cities, last["asciiName"][:4]),
+    }
+
+
+def api_benchmarks(args):
+    # Measure the calculation, not a store left over from another run
+    os.environ["PANCHANG_RESULT_STORE"] = ""
+    os.environ["PANCHANG_WARMUP_CITIES"] = "0"
+    import warnings
+    warnings.filterwarnings("ignore")
+    from fastapi.testclient import TestClient
+    import api
+    from sun_cache import SUN_CACHE
+
+    client = TestClient(api.app)
+    api.STARTUP.ensure("cities")
+    name, lat, lon, tz = PLACE
+    query = {"lat": lat, "lon": lon, "tz": tz, "year": DAY.year, "month": DAY.month, "day": DAY.day,
+             "hour": 12, "minute": 0}
+
+    def get(path, params):
+        response = client.get(path, params=params)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}: {response.text[:200]}")
+
+    def cold(path, params=query):
+        def call():
+            api.RESULTS.tiers[0].clear()
+            SUN_CACHE.clear()
+            get(path, params)
+        return call
+
+    def cached(path, params=query):
+        get(path, params)
+        return lambda: get(path, params)
+
+    return {
+        "api.panchang": cold("/panchang"),
+        "api.panchang.cached": cached("/panchang"),
+        "api.panchang.fields": cold("/panchang", dict(query, fields="Tithi,Nakshatra")),
+        "api.choghadiya": cold("/choghadiya"),
+        "api.choghadiya_range_30": cold("/choghadiya/range", dict(query, days=30)),
+        "api.marathi_panchang": cold("/marathi-panchang"),
+        "api.gujrati_panchang": cold("/gujrati-panchang"),
+        "api.telugu_panchang": cold("/telugu-panchang"),
+        "api.ready": lambda: client.get("/ready"),
+    }
+
+
+BUILDERS = {
+    "sankranti": sankranti_benchmarks,
+    "calculators": calculator_benchmarks,
+    "cities": city_benchmarks,
+    "api": api_benchmarks,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--groups", type=str, default=",".join(GROUPS),
+                        help=f"Comma-separated groups (default: all of {', '.join(GROUPS)})")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (default: 5)")
+    parser.add_argument("--cities", type=int, default=100_000, help="Synthetic cities for the cities group (default: 100000)")
+    parser.add_argument("--filter", type=str, help="Only run benchmarks whose name contains this")
+    parser.add_argument("--output", type=str, help="Write the results as JSON to this file")
+
+    args = parser.parse_args()
+
+    groups = [g.strip() for g in args.groups.split(",") if g.strip()]
+    unknown = [g for g in groups if g not in BUILDERS]
+    if unknown:
+        parser.error(f"Unknown group(s): {', '.join(unknown)}. Valid groups: {', '.join(GROUPS)}")
+
+    report = {"environment": environment(), "benchmarks": {}}
+    print(f"{'benchmark':<36}{'best ms':>12}{'median ms':>12}{'calls':>8}")
+    started = time.perf_counter()
+    for group in groups:
+        for name, benchmark in BUILDERS[group](args).items():
+            if args.filter and args.filter not in name:
+                continue
+            # Calculator benchmarks cover several days per call
+            fn, days = benchmark if isinstance(benchmark, tuple) else (benchmark, None)
+            result = measure(fn, repeat=args.repeat, number=1 if days else None)
+            if days:
+                result["days"] = days
+                result["best_per_day"] = result["best"] / days
+            report["benchmarks"][name] = result
+            print(f"{name:<36}{result['best'] * 1000:>12.3f}{result['median'] * 1000:>12.3f}{result['calls']:>8}")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
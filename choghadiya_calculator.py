@@ -7,11 +7,21 @@ to calculate auspicious time muhurta for starting new work or journey.
 The day (sunrise to sunset) and night (sunset to next sunrise) are each 
 divided into 8 equal parts called Choghadiya.
 
+Sunrise and sunset are the same Swiss Ephemeris visual sunrise used by the
+panchang calculators (sankranti.sun_times), and the division itself is done
+by day_division.DayDivision.
+
 Each weekday has a specific sequence of Choghadiya starting from sunrise.
 """
 
 import datetime
-import math
+
+import numpy as np
+
+import sankranti
+from sankranti import Date, Place
+from day_division import DayDivision
+import precision
 
 
 # Choghadiya names with their qualities
@@ -59,112 +69,22 @@ class ChoghadiyaCalculator:
     def calculate_sunrise_sunset(self, year, month, day, lat, lon, tz_offset):
         """
         Calculate sunrise and sunset times for a given date and location.
-        Uses the standard astronomical algorithm.
+        Uses the cached Swiss Ephemeris sunrise shared with the panchang endpoints.
         
         Returns:
             tuple: (sunrise_hour, sunrise_min, sunset_hour, sunset_min)
         """
-        import math
-        
-        # Day of year
-        n1 = math.floor(275 * month / 9)
-        n2 = math.floor((month + 9) / 12)
-        n3 = (1 + math.floor((year - 4 * math.floor(year / 4) + 2) / 3))
-        day_of_year = n1 - (n2 * n3) + day - 30
-        
-        # Convert longitude to hour value
-        lng_hour = lon / 15.0
-        
-        # Sunrise calculation
-        t_rise = day_of_year + ((6 - lng_hour) / 24)
-        
-        # Sun's mean anomaly
-        m_rise = (0.9856 * t_rise) - 3.289
-        
-        # Sun's true longitude
-        l_rise = m_rise + (1.916 * math.sin(math.radians(m_rise))) + \
-                 (0.020 * math.sin(math.radians(2 * m_rise))) + 282.634
-        l_rise = l_rise % 360
-        
-        # Sun's right ascension
-        ra_rise = math.degrees(math.atan(0.91764 * math.tan(math.radians(l_rise))))
-        ra_rise = ra_rise % 360
-        
-        # Right ascension adjustment
-        l_quad = (math.floor(l_rise / 90)) * 90
-        ra_quad = (math.floor(ra_rise / 90)) * 90
-        ra_rise = ra_rise + (l_quad - ra_quad)
-        ra_rise = ra_rise / 15
-        
-        # Sun's declination
-        sin_dec = 0.39782 * math.sin(math.radians(l_rise))
-        cos_dec = math.cos(math.asin(sin_dec))
-        
-        # Sun's local hour angle for sunrise
-        zenith = 90.833  # Official zenith for sunrise/sunset
-        cos_h = (math.cos(math.radians(zenith)) - (sin_dec * math.sin(math.radians(lat)))) / \
-                (cos_dec * math.cos(math.radians(lat)))
-        
-        # Clamp cos_h to valid range
-        cos_h = max(-1, min(1, cos_h))
-        
-        # Sunrise hour angle
-        h_rise = 360 - math.degrees(math.acos(cos_h))
-        h_rise = h_rise / 15
-        
-        # Local mean time of sunrise
-        t_rise_local = h_rise + ra_rise - (0.06571 * t_rise) - 6.622
-        
-        # UTC time of sunrise
-        ut_rise = t_rise_local - lng_hour
-        ut_rise = ut_rise % 24
-        
-        # Local time of sunrise
-        local_rise = ut_rise + tz_offset
-        local_rise = local_rise % 24
-        
-        sunrise_hour = int(local_rise)
-        sunrise_min = int((local_rise - sunrise_hour) * 60)
-        
-        # Sunset calculation
-        t_set = day_of_year + ((18 - lng_hour) / 24)
-        m_set = (0.9856 * t_set) - 3.289
-        l_set = m_set + (1.916 * math.sin(math.radians(m_set))) + \
-                (0.020 * math.sin(math.radians(2 * m_set))) + 282.634
-        l_set = l_set % 360
+        jd = sankranti.gregorian_to_jd(Date(year, month, day))
+        times = sankranti.sun_times(jd, Place(lat, lon, tz_offset))
         
-        ra_set = math.degrees(math.atan(0.91764 * math.tan(math.radians(l_set))))
-        ra_set = ra_set % 360
-        l_quad = (math.floor(l_set / 90)) * 90
-        ra_quad = (math.floor(ra_set / 90)) * 90
-        ra_set = ra_set + (l_quad - ra_quad)
-        ra_set = ra_set / 15
+        sunrise_h, sunrise_m = self._minutes_to_time(self._jd_to_minutes(times.sunrise, jd, tz_offset))
+        sunset_h, sunset_m = self._minutes_to_time(self._jd_to_minutes(times.sunset, jd, tz_offset))
         
-        sin_dec = 0.39782 * math.sin(math.radians(l_set))
-        cos_dec = math.cos(math.asin(sin_dec))
-        
-        cos_h = (math.cos(math.radians(zenith)) - (sin_dec * math.sin(math.radians(lat)))) / \
-                (cos_dec * math.cos(math.radians(lat)))
-        cos_h = max(-1, min(1, cos_h))
-        
-        h_set = math.degrees(math.acos(cos_h))
-        h_set = h_set / 15
-        
-        t_set_local = h_set + ra_set - (0.06571 * t_set) - 6.622
-        ut_set = t_set_local - lng_hour
-        ut_set = ut_set % 24
-        
-        local_set = ut_set + tz_offset
-        local_set = local_set % 24
-        
-        sunset_hour = int(local_set)
-        sunset_min = int((local_set - sunset_hour) * 60)
-        
-        return (sunrise_hour, sunrise_min, sunset_hour, sunset_min)
+        return (sunrise_h, sunrise_m, sunset_h, sunset_m)
     
-    def _time_to_minutes(self, hour, minute):
-        """Convert time to total minutes from midnight."""
-        return hour * 60 + minute
+    def _jd_to_minutes(self, jd_ut, jd_midnight, tz_offset):
+        """Convert a UT julian day to local minutes from midnight of the given date."""
+        return ((jd_ut - jd_midnight) * 24 + tz_offset) * 60
     
     def _minutes_to_time(self, total_minutes):
         """Convert total minutes to hour and minute."""
@@ -197,34 +117,71 @@ class ChoghadiyaCalculator:
         Returns:
             dict: Complete Choghadiya information
         """
-        # Get weekday (0=Monday in Python, we need 0=Sunday)
         date = datetime.date(year, month, day)
-        weekday = (date.weekday() + 1) % 7  # Convert to 0=Sunday
+        jd = sankranti.gregorian_to_jd(date)
         
-        # Calculate sunrise and sunset
-        sunrise_h, sunrise_m, sunset_h, sunset_m = self.calculate_sunrise_sunset(
-            year, month, day, lat, lon, tz_offset
-        )
+        # Sunrise, sunset and next day sunrise for night choghadiya
+        times = sankranti.sun_times(jd, Place(lat, lon, tz_offset))
+        division = DayDivision(*times, weekday=sankranti.vaara(jd))
         
-        # Calculate next day sunrise for night choghadiya
-        next_date = date + datetime.timedelta(days=1)
-        next_sunrise_h, next_sunrise_m, _, _ = self.calculate_sunrise_sunset(
-            next_date.year, next_date.month, next_date.day, lat, lon, tz_offset
-        )
+        return self._format_day(date, jd, tz_offset, division)
+    
+    def calculate_range(self, year, month, day, days, lat, lon, tz_offset, tz_name=None):
+        """
+        Calculate Choghadiya for consecutive days starting at the given date.
         
-        # Day duration in minutes
-        sunrise_minutes = self._time_to_minutes(sunrise_h, sunrise_m)
-        sunset_minutes = self._time_to_minutes(sunset_h, sunset_m)
-        day_duration = sunset_minutes - sunrise_minutes
+        Sunrises for the whole range come from one vectorized batch and each
+        day's next sunrise is reused as the following day's sunrise, so a
+        month needs 61 sunrise/sunset computations instead of 120. Days
+        without a sunrise or sunset in the batch (polar day or night) fall
+        back to the per-day sunrise of calculate().
         
-        # Night duration in minutes (sunset to next sunrise)
-        # Next sunrise is on the next day, so add 24*60 minutes
-        next_sunrise_minutes = self._time_to_minutes(next_sunrise_h, next_sunrise_m) + (24 * 60)
-        night_duration = next_sunrise_minutes - sunset_minutes
+        Args:
+            year, month, day: First date of the range
+            days: Number of days
+            lat: Latitude
+            lon: Longitude
+            tz_offset: Timezone offset in hours, or a list with one offset per
+                day when the range crosses a DST change
+            tz_name: Timezone name (e.g., "Asia/Kolkata") - optional
         
-        # Each choghadiya duration
-        day_choghadiya_duration = day_duration / 8
-        night_choghadiya_duration = night_duration / 8
+        Yields:
+            (datetime.date, dict): Date and its Choghadiya information, as
+            returned by calculate()
+        """
+        start = datetime.date(year, month, day)
+        jd_start = sankranti.gregorian_to_jd(start)
+        
+        offsets = list(tz_offset) if isinstance(tz_offset, (list, tuple)) else [tz_offset] * days
+        if len(offsets) != days:
+            raise ValueError(f"Expected {days} timezone offsets, got {len(offsets)}")
+        # Next sunrise of the last day is in that day's offset
+        tz = np.array(offsets + offsets[-1:], dtype=float)
+        
+        local = DayDivision.for_range(jd_start, days, Place(lat, lon, tz), precision.current().sunrise_refine)
+        
+        # for_range returns local julian days; _format_day works from UT
+        sunrise = local.sunrise - tz[:-1] / 24
+        sunset = local.sunset - tz[:-1] / 24
+        next_sunrise = local.next_sunrise - tz[1:] / 24
+        
+        # The batch has no sunrise or sunset on polar days (NaN); those days
+        # take the per-day path of calculate() so both give the same table
+        for i in np.flatnonzero(np.isnan(sunrise) | np.isnan(sunset) | np.isnan(next_sunrise)):
+            sunrise[i], sunset[i], next_sunrise[i] = sankranti.sun_times(jd_start + i, Place(lat, lon, offsets[i]))
+        
+        division = DayDivision(sunrise, sunset, next_sunrise, local.weekday)
+        division.day(8)
+        division.night(8)
+        
+        for i in range(days):
+            date = start + datetime.timedelta(days=i)
+            yield date, self._format_day(date, jd_start + i, offsets[i], division[i])
+    
+    def _format_day(self, date, jd, tz_offset, division):
+        """Build the Choghadiya table of one day from its DayDivision."""
+        weekday = int(division.weekday)
+        next_date = date + datetime.timedelta(days=1)
         
         # Get choghadiya sequences for the day
         day_sequence = DAY_CHOGHADIYA_SEQUENCE[weekday]
@@ -232,12 +189,9 @@ class ChoghadiyaCalculator:
         
         # Calculate day choghadiya periods
         day_choghadiya = []
-        for i in range(8):
-            start_minutes = sunrise_minutes + (i * day_choghadiya_duration)
-            end_minutes = start_minutes + day_choghadiya_duration
-            
-            start_h, start_m = self._minutes_to_time(start_minutes)
-            end_h, end_m = self._minutes_to_time(end_minutes)
+        for i, (start, end) in enumerate(division.day(8)):
+            start_h, start_m = self._minutes_to_time(self._jd_to_minutes(start, jd, tz_offset))
+            end_h, end_m = self._minutes_to_time(self._jd_to_minutes(end, jd, tz_offset))
             
             name = day_sequence[i]
             
@@ -250,12 +204,11 @@ class ChoghadiyaCalculator:
         
         # Calculate night choghadiya periods
         night_choghadiya = []
-        for i in range(8):
-            start_minutes = sunset_minutes + (i * night_choghadiya_duration)
-            end_minutes = start_minutes + night_choghadiya_duration
+        for i, (start, end) in enumerate(division.night(8)):
+            end_minutes = self._jd_to_minutes(end, jd, tz_offset)
             
             # Handle day overflow
-            start_h, start_m = self._minutes_to_time(start_minutes)
+            start_h, start_m = self._minutes_to_time(self._jd_to_minutes(start, jd, tz_offset))
             end_h, end_m = self._minutes_to_time(end_minutes)
             
             # Check if end time is on next day
@@ -275,6 +228,9 @@ class ChoghadiyaCalculator:
                 "end_time": end_time_12h
             })
         
+        sunrise_h, sunrise_m = self._minutes_to_time(self._jd_to_minutes(division.sunrise, jd, tz_offset))
+        sunset_h, sunset_m = self._minutes_to_time(self._jd_to_minutes(division.sunset, jd, tz_offset))
+        
         return {
             "sunrise": self._format_time_12h(sunrise_h, sunrise_m),
             "sunset": self._format_time_12h(sunset_h, sunset_m),
@@ -1,8 +1,10 @@
 import json
 import os
 import datetime
-import requests
 import threading
+import time
+from request_profile import stage
+from metrics import CITY_LOOKUPS, GEONAMES_LATENCY, GEONAMES_REQUESTS
 try:
     import zoneinfo
 except ImportError:
@@ -11,10 +13,12 @@ except ImportError:
 # Path to cities.json (assumed to be in the same directory)
 CITIES_FILE = os.path.join(os.path.dirname(__file__), 'cities.json')
 
-# GeoNames API configuration
-GEONAMES_USERNAME = "divyesh"
-GEONAMES_SEARCH_URL = "http://api.geonames.org/searchJSON"
-GEONAMES_GET_URL = "http://api.geonames.org/getJSON"
+# GeoNames API configuration; PANCHANG_GEONAMES_URL points the fallback at
+# another server (e.g. the stub of benchmarks/load_test.py)
+GEONAMES_USERNAME = os.environ.get("PANCHANG_GEONAMES_USERNAME", "divyesh")
+GEONAMES_URL = os.environ.get("PANCHANG_GEONAMES_URL", "http://api.geonames.org").rstrip("/")
+GEONAMES_SEARCH_URL = f"{GEONAMES_URL}/searchJSON"
+GEONAMES_GET_URL = f"{GEONAMES_URL}/getJSON"
 
 # Lock for thread-safe file operations
 _cities_file_lock = threading.Lock()
@@ -107,6 +111,12 @@ def fetch_city_from_geonames(city_name, state_name=None, country_name=None):
     Returns:
         dict: City data in the same format as cities.json entries, or None if not found
     """
+    # requests is only needed for the GeoNames fallback; importing it lazily
+    # keeps it out of worker start-up
+    import requests
+
+    start = time.perf_counter()
+    outcome = "error"
     try:
         # Build search query
         search_query = city_name
@@ -135,6 +145,7 @@ def fetch_city_from_geonames(city_name, state_name=None, country_name=None):
         response.raise_for_status()
         data = response.json()
         
+        outcome = "not_found"
         results = data.get('geonames', [])
         if not results:
             return None
@@ -193,6 +204,7 @@ def fetch_city_from_geonames(city_name, state_name=None, country_name=None):
         if not best_match:
             return None
         
+        outcome = "found"
         # Convert to our city format
         city_data = {
             'geonameId': best_match.get('geonameId'),
@@ -210,14 +222,20 @@ def fetch_city_from_geonames(city_name, state_name=None, country_name=None):
         return city_data
         
     except requests.exceptions.Timeout:
+        outcome = "timeout"
         print(f"GeoNames API timeout for city: {city_name}")
         return None
     except requests.exceptions.RequestException as e:
+        outcome = "error"
         print(f"GeoNames API request error: {e}")
         return None
     except Exception as e:
+        outcome = "error"
         print(f"Error fetching city from GeoNames: {e}")
         return None
+    finally:
+        GEONAMES_REQUESTS.inc(outcome=outcome)
+        GEONAMES_LATENCY.observe(time.perf_counter() - start)
 
 def find_city(cities, city_name, state_name=None, country_name=None, use_geonames_fallback=True):
     """
@@ -239,6 +257,7 @@ def find_city(cities, city_name, state_name=None, country_name=None, use_geoname
     
     # First, try to find in local database
     found_name, city_data = _find_city_local(cities, city_name, state_name, country_name)
+    CITY_LOOKUPS.inc(result="hit" if city_data else "miss")
     
     if city_data:
         return found_name, city_data
@@ -246,7 +265,8 @@ def find_city(cities, city_name, state_name=None, country_name=None, use_geoname
     # If not found locally and fallback is enabled, try GeoNames API
     if use_geonames_fallback:
         print(f"City '{city_name}' not found locally, fetching from GeoNames API...")
-        city_data = fetch_city_from_geonames(city_name, state_name, country_name)
+        with stage("geonames"):
+            city_data = fetch_city_from_geonames(city_name, state_name, country_name)
         
         if city_data:
             # Save to cities.json for future use
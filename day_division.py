@@ -0,0 +1,139 @@
+"""
+Day Division Engine
+
+Choghadiya, the kalams (Rahu/Gulika/Yamaganda) and the muhurtas all split
+the day (sunrise to sunset) and the night (sunset to next sunrise) into N
+equal parts and pick parts from a fixed table per weekday. This module
+holds that arithmetic and the weekday tables once.
+
+DayDivision works on scalars for a single day or on NumPy arrays for many
+days at once; DayDivision.for_range builds the arrays for a run of days from
+one vectorized sunrise batch (see sunrise_engine).
+
+All times are Julian days, in whatever time base the caller passes in.
+"""
+
+import numpy as np
+
+# Day is divided into 8 parts for the kalams.
+# Value in each list is the part for given weekday (0 = sunday, etc.)
+TRIKALAM_PARTS = {
+    'rahu': (7, 1, 6, 4, 5, 3, 2),
+    'gulika': (6, 5, 4, 3, 2, 1, 0),
+    'yamaganda': (4, 3, 2, 1, 0, 6, 5)
+}
+
+# Day and night are divided into 15 muhurtas each. Dur muhurtam for given
+# weekday as (half, muhurta index); one on Sun, Wed and two on the rest
+DURMUHURTAM_PARTS = (
+    (('day', 13),),                # Sunday
+    (('day', 8), ('day', 11)),     # Monday
+    (('day', 3), ('night', 6)),    # Tuesday - second one is at night
+    (('day', 7),),                 # Wednesday
+    (('day', 5), ('day', 11)),     # Thursday
+    (('day', 3), ('day', 8)),      # Friday
+    (('day', 0), ('day', 1))       # Saturday - two consecutive periods in morning
+)
+
+# Abhijit is the 8th (middle) muhurta of the day
+ABHIJIT_PART = 7
+
+MUHURTAS = 15
+KALAM_PARTS = 8
+
+
+def divide(start, end, parts):
+    """
+    Split [start, end] into equal parts.
+
+    Returns an array of shape start.shape + (parts, 2) holding the
+    (start, end) of every part.
+    """
+    start = np.asarray(start, dtype=float)[..., None]
+    duration = np.asarray(end, dtype=float)[..., None] - start
+    k = np.arange(parts + 1, dtype=float)
+    bounds = start + duration * k / parts
+    return np.stack((bounds[..., :-1], bounds[..., 1:]), axis=-1)
+
+
+def weekdays(jd):
+    """sankranti.vaara for arrays: 0 = Sunday, 1 = Monday,..., 6 = Saturday"""
+    return (np.ceil(np.asarray(jd, dtype=float) + 1) % 7).astype(int)
+
+
+class DayDivision:
+    """Equal divisions of the day and night between sunrise, sunset and next sunrise."""
+
+    def __init__(self, sunrise, sunset, next_sunrise, weekday):
+        self.sunrise = np.asarray(sunrise, dtype=float)
+        self.sunset = np.asarray(sunset, dtype=float)
+        self.next_sunrise = np.asarray(next_sunrise, dtype=float)
+        self.weekday = np.asarray(weekday, dtype=int)
+        self._tables = {}
+
+    @classmethod
+    def for_range(cls, jd_start, days, place, refine="rise_trans"):
+        """
+        Divisions for consecutive days from one vectorized sunrise batch.
+
+        jd_start is 00:00 UT of the first civil date; times are local Julian
+        days like sankranti.sunrise. The place's tz may be one offset per date
+        (days + 1 values). refine is passed to sunrise_engine.
+        """
+        from sunrise_engine import sunrise_sunset_range
+
+        lat, lon, tz = place
+        rises, sets, next_rises = sunrise_sunset_range(jd_start, days, lat, lon, tz, refine)
+        jds = jd_start + np.arange(days, dtype=float)
+        return cls(rises, sets, next_rises, weekdays(jds))
+
+    def __getitem__(self, index):
+        """Division of one day (or a slice of days) of a range, sharing computed tables"""
+        item = DayDivision(self.sunrise[index], self.sunset[index], self.next_sunrise[index], self.weekday[index])
+        item._tables = {key: table[index] for key, table in self._tables.items()}
+        return item
+
+    def __len__(self):
+        return len(self.weekday)
+
+    def day(self, parts):
+        """(start, end) of every part of the day, shape (..., parts, 2)"""
+        return self._table('day', parts)
+
+    def night(self, parts):
+        """(start, end) of every part of the night, shape (..., parts, 2)"""
+        return self._table('night', parts)
+
+    def _table(self, half, parts):
+        key = (half, parts)
+        if key not in self._tables:
+            if half == 'day':
+                self._tables[key] = divide(self.sunrise, self.sunset, parts)
+            else:
+                self._tables[key] = divide(self.sunset, self.next_sunrise, parts)
+        return self._tables[key]
+
+    def pick(self, table, parts, half='day'):
+        """(start, end) of the part chosen by a weekday table, shape (..., 2)"""
+        index = np.asarray(table)[self.weekday]
+        periods = self._table(half, parts)
+        return np.take_along_axis(periods, index[..., None, None], axis=-2)[..., 0, :]
+
+    def kalam(self, option):
+        """Rahu, Gulika or Yamaganda kalam, shape (..., 2)"""
+        return self.pick(TRIKALAM_PARTS[option], KALAM_PARTS)
+
+    def abhijit(self):
+        """Abhijit muhurta, shape (..., 2)"""
+        return self.day(MUHURTAS)[..., ABHIJIT_PART, :]
+
+    def durmuhurtam(self):
+        """Dur muhurtam periods as a list of (start, end); one list per day for arrays"""
+        tables = {'day': self.day(MUHURTAS), 'night': self.night(MUHURTAS)}
+
+        def periods(d):
+            return [tuple(tables[half][d][i]) for half, i in DURMUHURTAM_PARTS[self.weekday[d]]]
+
+        if self.weekday.ndim == 0:
+            return periods(())
+        return [periods(d) for d in range(len(self.weekday))]
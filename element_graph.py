@@ -0,0 +1,118 @@
+"""
+Element Graph
+
+Panchang elements depend on each other: Karana needs the tithi phase,
+Varjyam the nakshatra interval, Dur Muhurtam sunrise, sunset and next
+sunrise, Purnimanta the masa and tithi. A NodeGraph subclass declares each
+of these as a @node method. A node is evaluated on first access, memoized
+for the lifetime of the graph object, and records which nodes it pulled in
+and how long it took. Consumers read the nodes they need and nothing else
+is computed.
+
+    class Day(NodeGraph):
+        @node
+        def sunrise(self): ...
+
+        @node
+        def tithi(self):
+            return ... self.sunrise ...
+
+    day = Day()
+    day.tithi           # evaluates sunrise, then tithi
+    day.trace()         # [{'node': 'sunrise', ...}, {'node': 'tithi', ...}]
+
+A graph object is meant for one calculation and is not thread-safe.
+"""
+
+import time
+
+from request_profile import record
+
+
+class node:
+    """Memoized graph node: a method evaluated once per graph on first access."""
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, graph, owner=None):
+        if graph is None:
+            return self
+        return graph._evaluate(self.name, self.func)
+
+
+class NodeGraph:
+    """Base class holding node values, the dependency edges seen and node timings."""
+
+    def __init__(self):
+        self._values = {}
+        self._depends_on = {}
+        self._evaluations = []
+        self._stack = []
+
+    def _evaluate(self, name, func):
+        if self._stack:
+            deps = self._depends_on.setdefault(self._stack[-1][0], [])
+            if name not in deps:
+                deps.append(name)
+
+        if name in self._values:
+            return self._values[name]
+
+        # frame is [node name, time spent in nodes it evaluated]
+        frame = [name, 0.0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            value = func(self)
+        finally:
+            self._stack.pop()
+        elapsed = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+        self._values[name] = value
+        self._evaluations.append((name, elapsed, elapsed - frame[1]))
+        record("node." + name, elapsed - frame[1])
+        return value
+
+    @classmethod
+    def nodes(cls):
+        """Names of all nodes declared on the graph class."""
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, node) and name not in names:
+                    names.append(name)
+        return names
+
+    def evaluated(self):
+        """Names of the nodes evaluated so far, in completion order."""
+        return [name for name, _, _ in self._evaluations]
+
+    def trace(self):
+        """
+        Debug view of the evaluated nodes in completion order.
+
+        ms is the node's total time including the nodes it pulled in,
+        self_ms excludes them.
+        """
+        return [{
+            "node": name,
+            "ms": round(total * 1000, 3),
+            "self_ms": round(own * 1000, 3),
+            "depends_on": list(self._depends_on.get(name, []))
+        } for name, total, own in self._evaluations]
+
+    def debug_view(self):
+        """Evaluated nodes with timings, and the declared nodes never evaluated."""
+        evaluated = set(self._values)
+        return {
+            "evaluated": self.trace(),
+            "skipped": [name for name in self.nodes() if name not in evaluated]
+        }
@@ -0,0 +1,149 @@
+"""
+Ephemeris Files
+
+Swiss Ephemeris reads planet and moon positions from .se1 files
+(sepl_18.se1 and semo_18.se1 cover 1800-2399). When it cannot find them it
+silently falls back to the Moshier analytical ephemeris, which is less
+precise and slower, and answers the same calls with different numbers.
+
+This module sets the path once (sankranti calls configure() on import),
+checks at startup which of the files the calculators need are present,
+reads them ahead into the page cache so the first calc_ut calls do not wait
+for the disk, and probes which backend Swiss Ephemeris actually uses:
+
+    configure()   # swe.set_ephe_path(PANCHANG_EPHE_PATH)
+    validate()    # {"path", "exists", "present", "missing"}
+    preload()     # bytes read ahead
+    probe()       # "swiss", "jpl" or "moshier"
+    check()       # all three, kept for report()
+
+swe.set_ephe_path also closes any open ephemeris files (keeping the
+ayanamsa setting), which is how a forked worker gets its own file handles
+instead of sharing the parent's file offsets.
+
+Configuration (environment):
+    PANCHANG_EPHE_PATH      directory holding the .se1 files (default /usr/share/libswe/ephe)
+    PANCHANG_EPHE_REQUIRED  1 to fail start-up (and /ready) when the files are missing
+                            and Moshier would be used (default 0)
+"""
+
+import os
+
+import swisseph as swe
+
+DEFAULT_EPHE_PATH = '/usr/share/libswe/ephe'
+
+# Years the calculators look up; each file covers a block of 600 years
+FIRST_YEAR = 1800
+LAST_YEAR = 2399
+
+_READ_CHUNK = 1 << 20
+
+# Sun and Moon at J2000 for the backend probe
+_PROBE_JD = 2451545.0
+
+_path = None
+_report = None
+
+
+def ephe_path():
+    """The configured ephemeris directory."""
+    return os.environ.get("PANCHANG_EPHE_PATH") or DEFAULT_EPHE_PATH
+
+
+def configure(path=None):
+    """Point Swiss Ephemeris at path (default: ephe_path()); reopens the files on next use."""
+    global _path
+    path = path or ephe_path()
+    swe.set_ephe_path(path)
+    _path = path
+    return path
+
+
+def required_files(first_year=FIRST_YEAR, last_year=LAST_YEAR):
+    """Planet and moon file names covering the years first_year..last_year (AD)."""
+    names = []
+    for block in range(first_year // 600 * 6, last_year // 600 * 6 + 1, 6):
+        names.append(f"sepl_{block:02d}.se1")
+        names.append(f"semo_{block:02d}.se1")
+    return names
+
+
+def validate(path=None):
+    """Which of the required files are present under path."""
+    path = path or _path or ephe_path()
+    present, missing = [], []
+    for name in required_files():
+        (present if os.path.isfile(os.path.join(path, name)) else missing).append(name)
+    return {"path": path, "exists": os.path.isdir(path), "present": present, "missing": missing}
+
+
+def preload(path=None):
+    """Read the required files that are present into the page cache; returns bytes read."""
+    path = path or _path or ephe_path()
+    total = 0
+    for name in required_files():
+        filename = os.path.join(path, name)
+        try:
+            with open(filename, 'rb', buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                while True:
+                    chunk = f.read(_READ_CHUNK)
+                    if not chunk:
+                        break
+                    total += len(chunk)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            print(f"Error reading ahead {filename}: {e}")
+    return total
+
+
+def probe():
+    """Backend Swiss Ephemeris uses for the Sun and Moon: "swiss", "jpl" or "moshier"."""
+    backends = set()
+    for planet in (swe.SUN, swe.MOON):
+        _, flags = swe.calc_ut(_PROBE_JD, planet, swe.FLG_SWIEPH)
+        if flags & swe.FLG_JPLEPH:
+            backends.add("jpl")
+        elif flags & swe.FLG_SWIEPH:
+            backends.add("swiss")
+        else:
+            backends.add("moshier")
+    # A single Moshier fallback decides the precision of the results
+    for backend in ("moshier", "swiss", "jpl"):
+        if backend in backends:
+            return backend
+
+
+def check():
+    """Validate, read ahead and probe the configured files; the result is kept for report()."""
+    global _report
+    summary = validate()
+    summary["preloaded_bytes"] = preload(summary["path"])
+    summary["backend"] = probe()
+    _report = summary
+    if summary["backend"] == "moshier":
+        print(f"Ephemeris files missing from {summary['path']} ({', '.join(summary['missing'])}); "
+              f"Swiss Ephemeris is using the Moshier fallback")
+    return summary
+
+
+def required():
+    """True when start-up must fail on the Moshier fallback (PANCHANG_EPHE_REQUIRED=1)."""
+    return os.environ.get("PANCHANG_EPHE_REQUIRED", "0") == "1"
+
+
+def report():
+    """The last check() result, or None before the startup check ran."""
+    return _report
+
+
+def _after_fork():
+    # Reopen the files in the child rather than share the parent's offsets
+    if _path is not None:
+        configure(_path)
+
+
+os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,48 @@
+"""
+Fast JSON Responses
+
+FastAPI passes every returned dict through jsonable_encoder, which walks
+and copies the whole payload, before JSONResponse serializes it. The
+endpoints build plain dicts of str/int/float/list values that need no
+encoding, so they return FastJSONResponse directly and skip that pass.
+
+orjson is used when installed (pip install orjson) and serializes nested
+dicts several times faster than the standard library; otherwise the
+output falls back to json.dumps with the same compact settings as
+FastAPI's JSONResponse.
+"""
+
+import json
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def dumps(content):
+    """Serialize content to compact UTF-8 JSON bytes."""
+    if orjson:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    """Parse JSON bytes or str."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson when available, without jsonable_encoder."""
+
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps(content)
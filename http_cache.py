@@ -0,0 +1,103 @@
+"""
+HTTP Conditional Caching
+
+A panchang for a given date and location is fully determined by its
+inputs, so it only changes when the calculation itself changes. Every
+response gets a strong ETag hashed from the canonical resolved inputs
+(endpoint, location, date/time, options) and ALGORITHM_VERSION. A request
+whose If-None-Match (or If-Modified-Since) matches can be answered with
+304 Not Modified before any calculator runs.
+
+Last-Modified is the release of the algorithm, which only dates a
+response whose inputs are fixed. A response whose date/time was taken from
+the clock changes at local midnight without a new release, so it gets no
+Last-Modified and If-Modified-Since is ignored for it; only its ETag,
+which holds the resolved date, can produce a 304.
+
+Cache-Control depends on the request:
+    date/time defaulted to "now"        no-cache (the inputs move with the clock)
+    requested day within a day of today  short max-age
+    any other day                        long max-age
+
+Bump ALGORITHM_VERSION (and ALGORITHM_RELEASED) with every change that
+alters calculated values, so cached copies are revalidated and replaced.
+"""
+
+import datetime
+import hashlib
+import json
+from email.utils import format_datetime, parsedate_to_datetime
+
+# Version of the calculation output; part of every ETag
+ALGORITHM_VERSION = "2026.10.1"
+
+# When ALGORITHM_VERSION last changed; sent as Last-Modified
+ALGORITHM_RELEASED = datetime.datetime(2026, 10, 19, tzinfo=datetime.timezone.utc)
+
+# max-age in seconds for days near today and for all other days
+NEAR_TODAY_MAX_AGE = 3600
+FIXED_DATE_MAX_AGE = 7 * 24 * 3600
+
+
+def compute_etag(endpoint, **inputs):
+    """Strong ETag from the endpoint name, canonical inputs and ALGORITHM_VERSION."""
+    canonical = json.dumps({"endpoint": endpoint, "version": ALGORITHM_VERSION, "inputs": inputs},
+                           sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def last_modified():
+    """Last-Modified header value: release time of the current algorithm."""
+    return format_datetime(ALGORITHM_RELEASED, usegmt=True)
+
+
+def cache_control(date, tz_offset, defaulted):
+    """
+    Cache-Control header value for a result of the given local date.
+
+    defaulted is True when any date/time input was taken from the clock.
+    """
+    if defaulted:
+        return "no-cache"
+    now = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=tz_offset)
+    if abs((date - now.date()).days) <= 1:
+        return f"public, max-age={NEAR_TODAY_MAX_AGE}"
+    return f"public, max-age={FIXED_DATE_MAX_AGE}"
+
+
+def _etag_matches(if_none_match, etag):
+    """Weak comparison of If-None-Match against etag (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(headers, etag, modified=ALGORITHM_RELEASED):
+    """
+    True if the request's conditional headers show the client copy is current.
+
+    If-None-Match takes precedence; If-Modified-Since is only considered
+    when it is absent, and compared with modified. Pass modified=None for
+    a response sent without Last-Modified to ignore If-Modified-Since.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        return since >= modified.replace(microsecond=0)
+    return False
@@ -0,0 +1,221 @@
+"""
+Location Resolver
+
+Every endpoint turns (city, state, country, lat, lon, tz) query parameters
+into coordinates, a timezone offset and a display name. The city search
+(local list scan with GeoNames fallback) and the zoneinfo offset lookup are
+the same for every request of a popular city on a given date, so resolved
+cities are kept in a bounded LRU cache keyed on
+
+    (city, state, country, date)
+
+with the names normalized. Each entry stores the timezone offset at noon
+and whether the offset is the same for the whole day; only on DST
+transition days is the offset recomputed for the requested hour and minute.
+
+Lookups that find no city are not cached, since a GeoNames miss may be a
+transient network error.
+
+Configuration (environment):
+    PANCHANG_LOCATION_CACHE_SIZE  maximum number of entries (default 2048)
+"""
+
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from city_utils import find_city, get_timezone_offset, normalize_string
+
+# Timezone offset used when a city has no timezone or nothing else is given
+DEFAULT_TZ_OFFSET = 5.5
+
+
+class CityNotFoundError(LookupError):
+    """Raised when a city cannot be found and no coordinates were given."""
+
+
+_CityEntry = namedtuple('_CityEntry', ['name', 'details', 'latitude', 'longitude',
+                                       'timezone', 'day_offset', 'constant_offset'])
+
+
+class ResolvedLocation(namedtuple('ResolvedLocation', ['name', 'city', 'state', 'country', 'countryCode',
+                                                       'latitude', 'longitude', 'timezone_offset', 'timezone'])):
+    """Coordinates, timezone and display names of a request's location."""
+
+    __slots__ = ()
+
+    def meta(self):
+        """Location part of the response meta block."""
+        return {
+            "location": self.name,
+            "city": self.city,
+            "state": self.state,
+            "country": self.country,
+            "countryCode": self.countryCode,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "timezone_offset": self.timezone_offset
+        }
+
+
+def _location_info(location_name, details):
+    """Display name: 'City, State, Country' for known cities, else the given name."""
+    if not details:
+        return location_name
+    parts = [details.get('city')]
+    if details.get('state'):
+        parts.append(details.get('state'))
+    if details.get('country'):
+        parts.append(details.get('country'))
+    return ", ".join(filter(None, parts))
+
+
+class LocationResolver:
+    """Resolve request locations with a thread-safe LRU cache of city lookups."""
+
+    def __init__(self, cities, maxsize=2048):
+        self.cities = cities
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup_city(self, city, state, country, year, month, day):
+        """Cached city search and day offset, or None if the city is unknown."""
+        key = (normalize_string(city), normalize_string(state), normalize_string(country), (year, month, day))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        found_name, city_data = find_city(self.cities, city, state, country)
+        if not city_data:
+            return None
+
+        details = {
+            'city': city_data.get('city'),
+            'state': city_data.get('stateName'),
+            'country': city_data.get('countryName'),
+            'countryCode': city_data.get('countryCode')
+        }
+        tz_name = city_data.get('timezone')
+        day_offset, constant = None, True
+        if tz_name:
+            day_offset = get_timezone_offset(tz_name, year, month, day, 12, 0)
+            constant = (get_timezone_offset(tz_name, year, month, day, 0, 0) == day_offset ==
+                        get_timezone_offset(tz_name, year, month, day, 23, 59))
+
+        entry = _CityEntry(found_name, details, city_data.get('latitude'), city_data.get('longitude'),
+                           tz_name, day_offset, constant)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return entry
+
+    def resolve(self, city, state, country, lat, lon, tz, year, month, day, hour=12, minute=0,
+                default_lat=28.6139, default_lon=77.2090):
+        """
+        Resolve query parameters to a ResolvedLocation.
+
+        Explicit lat/lon/tz override the city's values; without a city or
+        coordinates the endpoint's default location is used. hour and minute
+        pick the timezone offset on DST transition days.
+
+        Raises:
+            CityNotFoundError: city is unknown and lat/lon were not both given
+        """
+        final_lat = lat
+        final_lon = lon
+        final_tz = tz
+        location_name = city or "Custom Coordinates"
+        details = {}
+        tz_name = None
+
+        if city:
+            entry = self._lookup_city(city, state, country, year, month, day)
+            if entry:
+                location_name = entry.name
+                details = entry.details
+
+                if final_lat is None:
+                    final_lat = entry.latitude
+                if final_lon is None:
+                    final_lon = entry.longitude
+
+                if final_tz is None:
+                    tz_name = entry.timezone
+                    if not tz_name:
+                        final_tz = DEFAULT_TZ_OFFSET
+                    elif entry.constant_offset:
+                        final_tz = entry.day_offset
+                    else:
+                        final_tz = get_timezone_offset(tz_name, year, month, day, hour, minute)
+            elif final_lat is None or final_lon is None:
+                error_msg = f"City '{city}' not found"
+                if state:
+                    error_msg += f" in state '{state}'"
+                if country:
+                    error_msg += f" in country '{country}'"
+                error_msg += ". Could not find in local database or GeoNames API. Please provide coordinates."
+                raise CityNotFoundError(error_msg)
+
+        # Fallback default (endpoint's regional city)
+        if final_lat is None: final_lat = default_lat
+        if final_lon is None: final_lon = default_lon
+        if final_tz is None: final_tz = DEFAULT_TZ_OFFSET
+
+        return ResolvedLocation(
+            name=_location_info(location_name, details),
+            city=details.get('city') if details else city,
+            state=details.get('state') if details else state,
+            country=details.get('country') if details else country,
+            countryCode=details.get('countryCode') if details else None,
+            latitude=final_lat,
+            longitude=final_lon,
+            timezone_offset=final_tz,
+            timezone=tz_name
+        )
+
+    def day_offsets(self, location, dates):
+        """Noon timezone offset of each date, following the location's DST rules
+        unless the offset was given explicitly."""
+        if not location.timezone:
+            return [location.timezone_offset] * len(dates)
+        return [get_timezone_offset(location.timezone, d.year, d.month, d.day, 12, 0) for d in dates]
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Current size, hit/miss/eviction counts and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def location_resolver(cities):
+    """LocationResolver sized from PANCHANG_LOCATION_CACHE_SIZE."""
+    return LocationResolver(cities, maxsize=int(os.environ.get("PANCHANG_LOCATION_CACHE_SIZE", 2048)))
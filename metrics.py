@@ -0,0 +1,289 @@
+"""
+Process Metrics
+
+In-process counters, gauges and histograms rendered in the Prometheus text
+exposition format by GET /metrics. No client library or push gateway is
+involved: metrics live in this module and are read at scrape time.
+
+Every sample carries a pid label. Each worker process keeps its own
+registry, so when several workers serve one port their series stay
+distinct and Prometheus sums them with sum by (...) rather than one worker
+silently overwriting another.
+
+    REQUESTS.inc(endpoint="/panchang", status="200")
+    LATENCY.observe(0.012, endpoint="/panchang")
+    register_cache("sun_times", SUN_CACHE.stats)
+
+Caches are registered as stats() callables and read on each scrape, so
+they are not touched on the request path.
+
+Counting a request's ephemeris calls means running it under a
+request_profile Profile, which wraps the ephemeris functions, so only a
+sample of requests (and every debug=timing request) feeds
+panchang_ephemeris_calls_per_request.
+
+Configuration (environment):
+    PANCHANG_EPHEMERIS_SAMPLE_RATE  share of requests profiled for the
+                                    ephemeris call histogram (default 0.01,
+                                    0 disables it)
+"""
+
+import bisect
+import os
+import random
+import threading
+import time
+
+import request_profile
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# swe.calc_ut + swe.rise_trans calls
+EPHEMERIS_CALL_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+EPHEMERIS_SAMPLE_RATE = float(os.environ.get("PANCHANG_EPHEMERIS_SAMPLE_RATE", 0.01))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _pairs(self, key, base):
+        return base + list(zip(self.labelnames, key))
+
+    def collect(self, base):
+        """Exposition lines of this metric, with base labels prepended."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(self._samples(items, base))
+        return lines
+
+    def _samples(self, items, base):
+        return [f"{self.name}{_labels(self._pairs(key, base))} {_number(value)}" for key, value in items]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, n=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + n
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def inc(self, n=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + n
+
+    def dec(self, n=1, **labels):
+        self.inc(-n, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket counts (last one is +Inf), sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def _samples(self, items, base):
+        lines = []
+        for key, (counts, total) in items:
+            pairs = self._pairs(key, base)
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(pairs + [('le', _number(float(bound)))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics and cache stats collectors of this process."""
+
+    def __init__(self):
+        self._metrics = []
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_cache(self, name, stats):
+        """Expose a cache through its stats() callable (hits, misses, size...)."""
+        with self._lock:
+            self._caches[name] = stats
+
+    def _cache_lines(self, base):
+        with self._lock:
+            caches = sorted(self._caches.items())
+        families = {
+            "panchang_cache_hits_total": ("counter", "Cache lookups answered from the cache", "hits"),
+            "panchang_cache_misses_total": ("counter", "Cache lookups that had to compute", "misses"),
+            "panchang_cache_evictions_total": ("counter", "Entries evicted to stay within maxsize", "evictions"),
+            "panchang_cache_entries": ("gauge", "Entries currently held", "size"),
+            "panchang_cache_hit_ratio": ("gauge", "hits / (hits + misses) since start", "hit_rate"),
+        }
+        snapshots = [(name, stats()) for name, stats in caches]
+        lines = []
+        for family, (kind, documentation, field) in families.items():
+            lines.append(f"# HELP {family} {documentation}")
+            lines.append(f"# TYPE {family} {kind}")
+            for name, snapshot in snapshots:
+                if field in snapshot:
+                    lines.append(f"{family}{_labels(base + [('cache', name)])} {_number(snapshot[field])}")
+        return lines
+
+    def render(self):
+        """The full exposition text for this process."""
+        base = [("pid", os.getpid())]
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+        for metric in metrics:
+            lines.extend(metric.collect(base))
+        lines.extend(self._cache_lines(base))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    "panchang_http_requests_total", "HTTP requests by endpoint and status code", ("endpoint", "status")))
+LATENCY = REGISTRY.register(Histogram(
+    "panchang_http_request_duration_seconds", "Request latency by endpoint", ("endpoint",)))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "panchang_http_requests_in_flight", "Requests currently being served"))
+EPHEMERIS_CALLS = REGISTRY.register(Histogram(
+    "panchang_ephemeris_calls_per_request", "swe.calc_ut and swe.rise_trans calls made by one sampled request",
+    ("endpoint",), buckets=EPHEMERIS_CALL_BUCKETS))
+CITY_LOOKUPS = REGISTRY.register(Counter(
+    "panchang_city_index_lookups_total", "Local city index lookups by result (hit, miss)", ("result",)))
+GEONAMES_REQUESTS = REGISTRY.register(Counter(
+    "panchang_geonames_requests_total", "GeoNames fallback requests by outcome (found, not_found, timeout, error)",
+    ("outcome",)))
+COALESCED_REQUESTS = REGISTRY.register(Counter(
+    "panchang_coalesced_requests_total", "Requests that shared an identical in-progress calculation", ("variant",)))
+EPHEMERIS_BACKEND = REGISTRY.register(Gauge(
+    "panchang_ephemeris_backend_info", "Ephemeris backend in use (swiss, jpl, moshier) and file path; value is 1",
+    ("backend", "path")))
+GEONAMES_LATENCY = REGISTRY.register(Histogram(
+    "panchang_geonames_request_duration_seconds", "GeoNames fallback request latency"))
+
+register_cache = REGISTRY.register_cache
+
+
+class MetricsMiddleware:
+    """
+    Count and time HTTP requests, and profile a sample of them.
+
+    endpoint is the route path for known routes and "other" for anything
+    else, which keeps label cardinality bounded. A sample_rate share of
+    requests, and every debug=timing request, runs under a request_profile
+    Profile so its ephemeris calls can be counted; the rest run unprofiled.
+    """
+
+    def __init__(self, app, skip=("/metrics", "/ready"), sample_rate=None):
+        self.app = app
+        self.skip = set(skip)
+        self.sample_rate = EPHEMERIS_SAMPLE_RATE if sample_rate is None else sample_rate
+        self._routes = None
+
+    def _endpoint(self, scope):
+        if self._routes is None:
+            app = scope.get("app")
+            routes = getattr(app, "routes", None) or []
+            self._routes = {getattr(route, "path", None) for route in routes}
+        path = scope.get("path", "")
+        return path if path in self._routes else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.skip:
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = self._endpoint(scope)
+        status = ["500"]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        profile = token = None
+        if random.random() < self.sample_rate or request_profile.wants_timing(scope.get("query_string", b"")):
+            profile, token = request_profile.activate()
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            REQUESTS.inc(endpoint=endpoint, status=status[0])
+            LATENCY.observe(elapsed, endpoint=endpoint)
+            if token is not None:
+                request_profile.deactivate(token)
+                calls = profile.counters.get("swe_calc_ut", 0) + profile.counters.get("swe_rise_trans", 0)
+                if calls:
+                    EPHEMERIS_CALLS.observe(calls, endpoint=endpoint)
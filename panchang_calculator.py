@@ -2,6 +2,9 @@ import sankranti
 from sankranti import Date, Place, gregorian_to_jd, jd_to_gregorian, to_dms, swe
 from math import ceil
 import datetime
+import threading
+
+from element_graph import NodeGraph, node
 
 # Import data dictionaries
 from religious_data import TITHI_NAMES, NAKSHATRA_NAMES, YOGA_NAMES, RASHI_NAMES, VARA_NAMES, SAMVAT_YEAR_NAMES, KARANA_NAMES
@@ -149,15 +152,17 @@ def _calculate_kshaya_adhika_years(start_vikram, end_vikram):
 
 # Pre-computed Kshaya/Adhika years for performance (covers 1900-2200 CE / Vikram 1956-2256)
 # These are calculated from Jupiter's actual position at each Mesha Sankranti
-_KSHAYA_YEARS = None
-_ADHIKA_YEARS = None
+_KSHAYA_ADHIKA_YEARS = None
+_kshaya_lock = threading.Lock()
 
 def _get_kshaya_adhika_years():
-    """Get or compute the Kshaya/Adhika years cache."""
-    global _KSHAYA_YEARS, _ADHIKA_YEARS
-    if _KSHAYA_YEARS is None:
-        _KSHAYA_YEARS, _ADHIKA_YEARS = _calculate_kshaya_adhika_years(1956, 2256)
-    return _KSHAYA_YEARS, _ADHIKA_YEARS
+    """Get or compute the Kshaya/Adhika years cache (built once, also from a background thread)."""
+    global _KSHAYA_ADHIKA_YEARS
+    if _KSHAYA_ADHIKA_YEARS is None:
+        with _kshaya_lock:
+            if _KSHAYA_ADHIKA_YEARS is None:
+                _KSHAYA_ADHIKA_YEARS = _calculate_kshaya_adhika_years(1956, 2256)
+    return _KSHAYA_ADHIKA_YEARS
 
 def get_vikram_samvatsara_index(vikram_year):
     """
@@ -338,387 +343,206 @@ def get_pravishte(jd_ut, place):
     # Return days since sun entered current rashi (1-indexed)
     return (d2 - d1).days + 1
 
-class PanchangCalculator:
-    def __init__(self):
-        # Ensure Lahiri Ayanamsa (Chitrapaksha) is used, matching DrikPanchang
-        sankranti.set_ayanamsa_mode()
-        pass
-        
-    def calculate(self, year, month, day, hour, minute, second, lat, lon, info_timezone):
+MONTHS_LIST = ["Chaitra", "Vaisakha", "Jyeshtha", "Ashadha", "Shravana", "Bhadrapada", "Ashwina", "Kartika", "Margashirsha", "Pausha", "Magha", "Phalguni"]
+
+def get_mname(num, leap):
+    return f"{MONTHS_LIST[num-1]} (Adhik)" if leap else MONTHS_LIST[num-1]
+
+def get_karana_name(num):
+    if num == 1: return "Kimstughna"
+    elif num >= 58:
+        if num == 58: return "Shakuni"
+        elif num == 59: return "Chatushpada"
+        elif num == 60: return "Naga"
+    else:
+        idx = (num - 2) % 7
+        name = KARANA_NAMES[idx]
+        # Fix spelling: Gara -> Garaja
+        if name == "Gara":
+            name = "Garaja"
+        return name
+
+# Output elements in response order and the PanchangDay node computing each.
+# An element only pulls the astronomy it needs, so a field projection such as
+# ['Tithi', 'Sunrise'] never computes masa, moonrise or the varjyam bisections.
+ELEMENTS = {
+    'Sunrise': 'sunrise',
+    'Sunset': 'sunset',
+    'Moonrise': 'moonrise',
+    'Moonset': 'moonset',
+    'Shaka Samvat': 'shaka_samvat',
+    'Vikram Samvat': 'vikram_samvat',
+    'Gujarati Samvat': 'gujarati_samvat',
+    'Amanta Month': 'amanta_month',
+    'Purnimanta Month': 'purnimanta_month',
+    'Weekday': 'weekday',
+    'Paksha': 'paksha',
+    'Tithi': 'tithi',
+    'Nakshatra': 'nakshatra',
+    'Yoga': 'yoga',
+    'Karana': 'karana',
+    'Pravishte/Gate': 'pravishte',
+    'Sunsign': 'sunsign',
+    'Moonsign': 'moonsign',
+    'Rahu Kalam': 'rahu_kalam',
+    'Gulikai Kalam': 'gulikai_kalam',
+    'Yamaganda': 'yamaganda',
+    'Abhijit': 'abhijit',
+    'Dur Muhurtam': 'dur_muhurtam',
+    'Varjyam': 'varjyam',
+    'Amrit Kalam': 'amrit_kalam'
+}
+
+def resolve_fields(fields, elements=ELEMENTS):
+    """
+    Output keys for a field projection, in response order.
+
+    fields is None (everything) or an iterable of element names, matched
+    case-insensitively against the output key ('Rahu Kalam') or its method
+    name ('rahu_kalam'). elements is the element table of the calendar
+    (ELEMENTS, or a regional one). Raises ValueError for unknown names.
+    """
+    if fields is None:
+        return list(elements)
+
+    lookup = {}
+    for key, method in elements.items():
+        lookup[key.lower()] = key
+        lookup[method] = key
+
+    wanted = set()
+    for field in fields:
+        key = lookup.get(field.strip().lower())
+        if key is None:
+            raise ValueError(f"Unknown field '{field}'. Valid fields: {', '.join(elements)}")
+        wanted.add(key)
+    return [key for key in elements if key in wanted]
+
+class PanchangDay(NodeGraph):
+    """
+    Panchang elements of one day as a lazy graph of memoized nodes.
+
+    Shared astronomy (sunrise, masa, tithi, nakshatra spans, ...) and every
+    output element are nodes: each is computed at most once, only when read,
+    and debug_view() shows what was evaluated and how long it took.
+
+    The regional calendars subclass it, overriding the nodes they format
+    differently and listing their own output keys in elements, so the
+    astronomy is shared and computed the same way for every calendar.
+    """
+
+    # Output key -> node, in response order
+    elements = ELEMENTS
+
+    def __init__(self, year, month, day, hour, minute, second, lat, lon, info_timezone):
+        super().__init__()
         # Use IST timezone for all calculations and display
         # Note: Traditional Hindu astronomy uses LMT (longitude/15) for calculations,
         # but modern panchangs typically show IST for consistency
-        place = Place(lat, lon, info_timezone)
-        
+        self.place = Place(lat, lon, info_timezone)
+        self.info_timezone = info_timezone
+        self.year, self.month, self.day = year, month, day
+
         # 1. JD for Start of Day (UTC Midnight)
-        jd_midnight = sankranti.gregorian_to_jd(Date(year, month, day))
-        
+        self.jd_midnight = sankranti.gregorian_to_jd(Date(year, month, day))
+
         # 2. JD for Current Moment
-        jd_now = sankranti.local_time_to_jdut1(year, month, day, hour, minute, second, info_timezone)
-        
-        result = {}
-        ref_date = datetime.date(year, month, day)
-        
-        # Rise/Set times
-        sr_info = sankranti.sunrise(jd_midnight, place)
-        ss_info = sankranti.sunset(jd_midnight, place)
-        mr_val = sankranti.moonrise(jd_midnight, place)
-        ms_val = sankranti.moonset(jd_midnight, place)
-        
-        result['Sunrise'] = format_time_12hr(sr_info[1])
-        result['Sunset'] = format_time_12hr(ss_info[1])
-        
-        # Calculate sunrise hours for comparison
-        sunrise_hours = sr_info[1][0] + sr_info[1][1]/60 + sr_info[1][2]/3600
-        sunset_hours = ss_info[1][0] + ss_info[1][1]/60 + ss_info[1][2]/3600
-        
-        # Handle moonrise - check if it's too close to sunrise (within 2 minutes)
-        # When moonrise is essentially at sunrise, it's not a distinct visible event
-        # Also handle cases where moonrise is out of valid range
-        if mr_val[0] < 0 or mr_val[0] >= 48:
-            result['Moonrise'] = "No Moonrise"
-        else:
-            moonrise_hours = mr_val[0] + mr_val[1]/60 + mr_val[2]/3600
-            # Check if moonrise is within 2 minutes of sunrise
-            diff_minutes = abs(moonrise_hours - sunrise_hours) * 60
-            if diff_minutes < 2:
-                result['Moonrise'] = "No Moonrise"
-            else:
-                result['Moonrise'] = format_time_12hr(mr_val, include_date=True, ref_date=ref_date)
-        
-        # Handle moonset - check if it falls within the current Hindu day
-        # Hindu day runs from sunrise to next sunrise
-        # If moonset is on the next calendar day, check if it's before next day's sunrise
-        if ms_val[0] < 0 or ms_val[0] >= 36:
-            result['Moonset'] = "No Moonset"
-        else:
-            moonset_hours = ms_val[0] + ms_val[1]/60 + ms_val[2]/3600
-            
-            # If moonset is after 24 hours (next calendar day)
-            if moonset_hours >= 24:
-                # Get next day's sunrise
-                next_day = datetime.date(year, month, day) + datetime.timedelta(days=1)
-                jd_next = sankranti.gregorian_to_jd(next_day)
-                sr_next = sankranti.sunrise(jd_next, place)
-                sunrise_next_hours = sr_next[1][0] + sr_next[1][1]/60 + sr_next[1][2]/3600
-                
-                # Convert moonset to next day's time (subtract 24)
-                moonset_next_day_hours = moonset_hours - 24
-                
-                # If moonset is after next day's sunrise, it doesn't belong to current Hindu day
-                if moonset_next_day_hours >= sunrise_next_hours:
-                    result['Moonset'] = "No Moonset"
-                else:
-                    result['Moonset'] = format_time_12hr(ms_val, include_date=True, ref_date=ref_date)
-            else:
-                result['Moonset'] = format_time_12hr(ms_val, include_date=True, ref_date=ref_date)
-        
+        self.jd_now = sankranti.local_time_to_jdut1(year, month, day, hour, minute, second, info_timezone)
+
+        self.ref_date = datetime.date(year, month, day)
+
+    # -------------------------------------------------------------------------
+    # Shared astronomy
+    # -------------------------------------------------------------------------
+
+    @node
+    def sr_info(self):
+        return sankranti.sunrise(self.jd_midnight, self.place)
+
+    @node
+    def ss_info(self):
+        return sankranti.sunset(self.jd_midnight, self.place)
+
+    @node
+    def sunrise_jd_ut(self):
+        # sr_info[0] is local JD (rise + tz/24), so we need to convert back to UT
+        return self.sr_info[0] - self.info_timezone / 24.0
+
+    @node
+    def masa_info(self):
         # Samvats/Months need Tithi info based on Sunrise
-        masa_info = sankranti.masa(jd_midnight, place, amanta=True)
-        masa_num, is_leap = masa_info[0], masa_info[1]
-        kali, saka = sankranti.elapsed_year(jd_midnight, masa_num)
+        return sankranti.masa(self.jd_midnight, self.place, amanta=True)
+
+    @node
+    def samvat(self):
+        """(saka, vikram, gujarati) years"""
+        masa_num = self.masa_info[0]
+        kali, saka = sankranti.elapsed_year(self.jd_midnight, masa_num)
         vikram = saka + 135
-        
+
         # Gujarati
-        tithi_at_rise = sankranti.tithi(jd_midnight, place)[0]
+        tithi_at_rise = self.tithi_data[0]
         gujarati = vikram - 1
         if masa_num > 8: gujarati = vikram
         elif masa_num == 8 and tithi_at_rise <= 15: gujarati = vikram
-        
-        # The 60-year cycle name changes at Chaitra Shukla Pratipada (Hindu New Year)
-        # For months before Chaitra (Magha=11, Phalguna=12), use previous year's cycle position
-        # Chaitra is month 1, so months 11 and 12 are before the new year
-        
-        # Shaka Samvat - the library's elapsed_year already returns the correct year
-        # accounting for months before Chaitra, so we just use a constant offset of 11
-        saka_cycle_idx = (saka + 11) % 60
-        
-        # Vikram Samvat - Use dynamic offset that accounts for Kshaya/Adhika years
-        # The 60-year Brihaspati cycle "slips" relative to calendar years because
-        # Jupiter's ~11.86 year period doesn't exactly match 12 years
-        vikram_cycle_idx = get_vikram_samvatsara_index(vikram)
-        
-        # Gujarati Samvat
-        gujarati_cycle_idx = (gujarati + 8) % 60
-        
-        result['Shaka Samvat'] = f"{saka} {SAMVAT_YEAR_NAMES[saka_cycle_idx]}"
-        result['Vikram Samvat'] = f"{vikram} {SAMVAT_YEAR_NAMES[vikram_cycle_idx]}"
-        result['Gujarati Samvat'] = f"{gujarati} {SAMVAT_YEAR_NAMES[gujarati_cycle_idx]}"
-        
-        months_list = ["Chaitra", "Vaisakha", "Jyeshtha", "Ashadha", "Shravana", "Bhadrapada", "Ashwina", "Kartika", "Margashirsha", "Pausha", "Magha", "Phalguni"]
-        def get_mname(num, leap): return f"{months_list[num-1]} (Adhik)" if leap else months_list[num-1]
-        
-        result['Amanta Month'] = get_mname(masa_num, is_leap)
-        
-        # Purnimanta month calculation:
-        # In Purnimanta system, month ends on Purnima (full moon), so:
-        # - Krishna Paksha comes FIRST in the month
-        # - Shukla Paksha comes SECOND in the month
-        # 
-        # Relationship to Amanta:
-        # - During Shukla Paksha (tithi 1-15): Purnimanta = Amanta (same month)
-        # - During Krishna Paksha (tithi 16-30): Purnimanta = Amanta + 1 (next month)
-        #
-        # In adhik masa, both systems show the same adhik month
-        if is_leap:
-            result['Purnimanta Month'] = get_mname(masa_num, is_leap)
-        else:
-            # Check if we're in Shukla or Krishna Paksha
-            is_shukla_paksha = tithi_at_rise <= 15
-            
-            if is_shukla_paksha:
-                # Shukla Paksha: Purnimanta = Amanta (same month)
-                purnimanta_month = masa_num
-                purnimanta_leap = is_leap
-            else:
-                # Krishna Paksha: Purnimanta = Amanta + 1 (next month)
-                purnimanta_month = (masa_num % 12) + 1
-                purnimanta_leap = False  # Next month is not adhik
-            
-            result['Purnimanta Month'] = get_mname(purnimanta_month, purnimanta_leap)
-        
-        result['Weekday'] = VARA_NAMES[sankranti.vaara(jd_midnight)]['sanskrit']
-        
-        # Use sankranti functions for Tithi, Nakshatra, Yoga, Karana
-        # These calculate at sunrise and return end times
-        # They can return 2 or 4 elements if there's a skipped/overlapping value
-        tithi_data = sankranti.tithi(jd_midnight, place)
-        nakshatra_data = sankranti.nakshatra(jd_midnight, place)
-        yoga_data = sankranti.yoga(jd_midnight, place)
-        karana_data = sankranti.karana(jd_midnight, place)
-        
-        # Format Tithi (can have 2 tithis if one ends during the day)
-        tithi_num = tithi_data[0]
-        tithi_end_time = tithi_data[1]
-        result['Paksha'] = "Shukla Paksha" if tithi_num <= 15 else "Krishna Paksha"
-        t_name = TITHI_NAMES[tithi_num]['english']
-        
-        # Convert end time to hours for comparison
-        end_hours = tithi_end_time[0] + tithi_end_time[1]/60.0
-        sunrise_hours = sr_info[1][0] + sr_info[1][1]/60.0
-        sunset_hours = ss_info[1][0] + ss_info[1][1]/60.0
-        
-        # Show end time if it's during the panchang day (sunrise to next sunrise, i.e., within ~24 hours)
-        if end_hours < 24 + sunrise_hours:  # Ends before next sunrise
-            result['Tithi'] = f"{t_name} upto {format_time_12hr(tithi_end_time, include_date=True, ref_date=ref_date)}"
-            # Add the next tithi if end time is before midnight or early next day
-            if end_hours < 24:
-                next_tithi_num = (tithi_num % 30) + 1
-                next_t_name = TITHI_NAMES[next_tithi_num]['english']
-                result['Tithi'] += f"; {next_t_name}"
-        else:
-            # Tithi prevails the whole day
-            result['Tithi'] = t_name
-        
-        # Format Nakshatra
-        nak_num = nakshatra_data[0]
-        nak_end_time = nakshatra_data[1]
-        nak_name = NAKSHATRA_NAMES[nak_num-1]['english']
-        
-        # Convert end time to hours for comparison
-        nak_end_hours = nak_end_time[0] + nak_end_time[1]/60.0
-        
-        # Check if nakshatra changes during the day (between sunrise and early next morning up to 30 hours)
-        if sunrise_hours <= nak_end_hours < 30 or nak_end_hours < sunrise_hours:
-            result['Nakshatra'] = f"{nak_name} upto {format_time_12hr(nak_end_time, include_date=True, ref_date=ref_date)}"
-            # Add the next nakshatra
-            next_nak_num = (nak_num % 27) + 1
-            next_nak_name = NAKSHATRA_NAMES[next_nak_num-1]['english']
-            result['Nakshatra'] += f"; {next_nak_name}"
-        else:
-            # Nakshatra prevails the whole day
-            result['Nakshatra'] = nak_name
-        
-        # Format Yoga
-        yoga_num = yoga_data[0]
-        yoga_end_time = yoga_data[1]
-        y_name = YOGA_NAMES[yoga_num-1]['english']
-        
-        # Convert end time to hours for comparison
-        yoga_end_hours = yoga_end_time[0] + yoga_end_time[1]/60.0
-        
-        # Show end time if yoga ends within the panchang day (sunrise to next sunrise ~30 hours)
-        if yoga_end_hours < 30:
-            result['Yoga'] = f"{y_name} upto {format_time_12hr(yoga_end_time, include_date=True, ref_date=ref_date)}"
-            # Add the next yoga if it starts before next sunrise
-            if yoga_end_hours < 24 + sunrise_hours:
-                next_yoga_num = (yoga_num % 27) + 1
-                next_y_name = YOGA_NAMES[next_yoga_num-1]['english']
-                result['Yoga'] += f"; {next_y_name}"
-        else:
-            result['Yoga'] = y_name
-        
-        # Format Karana
-        def get_karana_name(num):
-            if num == 1: return "Kimstughna"
-            elif num >= 58:
-                if num == 58: return "Shakuni"
-                elif num == 59: return "Chatushpada"
-                elif num == 60: return "Naga"
-            else:
-                idx = (num - 2) % 7
-                name = KARANA_NAMES[idx]
-                # Fix spelling: Gara -> Garaja
-                if name == "Gara":
-                    name = "Garaja"
-                return name
-        
-        # Sunrise time in fractional hours (for comparison)
-        sunrise_hours = sr_info[1][0] + sr_info[1][1]/60.0 + sr_info[1][2]/3600.0
-        
-        # Filter karanas - only include those that end at or after sunrise, and remove duplicates
-        karana_list = []
-        seen_karanas = set()
-        for i in range(0, len(karana_data), 2):
-            if i+1 < len(karana_data):
-                k_num = karana_data[i]
-                k_end = karana_data[i+1]
-                k_end_hours = k_end[0] + k_end[1]/60.0 + k_end[2]/3600.0
-                
-                # Include karana if it ends at or after sunrise and not already seen
-                if k_end_hours >= sunrise_hours and k_num not in seen_karanas:
-                    karana_list.append((k_num, k_end, k_end_hours))
-                    seen_karanas.add(k_num)
-        
-        # Sort karanas by end time
-        karana_list.sort(key=lambda x: x[2])
-        
-        # Format the karanas
-        if karana_list:
-            # First karana
-            karana_num, karana_end_time, _ = karana_list[0]
-            kn = get_karana_name(karana_num)
-            result['Karana'] = f"{kn} upto {format_time_12hr(karana_end_time, include_date=True, ref_date=ref_date)}"
-            
-            # Add second karana if present and within the day
-            if len(karana_list) >= 2:
-                karana_num2, karana_end_time2, k2_hours = karana_list[1]
-                kn2 = get_karana_name(karana_num2)
-                # Only show if ends within reasonable timeframe (before midnight or early next morning)
-                if k2_hours < 24:  # Ends same day
-                    result['Karana'] += f"; {kn2} upto {format_time_12hr(karana_end_time2, include_date=True, ref_date=ref_date)}"
-                elif k2_hours < 30:  # Ends early next morning (before 6 AM next day assuming ~6 AM sunrise)
-                    result['Karana'] += f"; {kn2} upto {format_time_12hr(karana_end_time2, include_date=True, ref_date=ref_date)}"
-                else:
-                    result['Karana'] += f"; {kn2}"
-            else:
-                # Add the next karana that follows
-                next_karana_num = (karana_num % 60) + 1
-                next_kn = get_karana_name(next_karana_num)
-                result['Karana'] += f"; {next_kn}"
-        else:
-            result['Karana'] = "No karana data"
-        
-        # Pravishte - should use sunrise JD in UT for consistency with panchang tradition
-        # sr_info[0] is local JD (rise + tz/24), so we need to convert back to UT
-        sunrise_jd_local = sr_info[0]
-        sunrise_jd_ut = sunrise_jd_local - info_timezone / 24.0
-        result['Pravishte/Gate'] = get_pravishte(sunrise_jd_ut, place)
-        
-        # Signs - use sunrise positions (panchang tradition)
-        # Note: Must use UT sunrise like nakshatra() does for consistency
-        result['Sunsign'] = RASHI_NAMES[int(sankranti.solar_longitude(sunrise_jd_ut)/30)]['english']
-        result['Moonsign'] = RASHI_NAMES[int(sankranti.lunar_longitude(sunrise_jd_ut)/30)]['english']
-        
-        # Kalams
-        rk = sankranti.rahu_kalam(jd_midnight, place)
-        gk = sankranti.gulika_kalam(jd_midnight, place)
-        yg = sankranti.yamaganda_kalam(jd_midnight, place)
-        
-        result['Rahu Kalam'] = format_time_range_12hr(rk[0], rk[1], ref_date)
-        result['Gulikai Kalam'] = format_time_range_12hr(gk[0], gk[1], ref_date)
-        result['Yamaganda'] = format_time_range_12hr(yg[0], yg[1], ref_date)
-        
-        # Abhijit Muhurta is not applicable on Wednesdays
-        if sankranti.vaara(jd_midnight) == 3:
-             result['Abhijit'] = "None"
-        else:
-            ab = sankranti.abhijit_muhurta(jd_midnight, place)
-            ab_start = sankranti.to_dms(ab[0])
-            ab_end = sankranti.to_dms(ab[1])
-            result['Abhijit'] = format_time_range_12hr(ab_start, ab_end, ref_date)
-        
-        # Dur Muhurtam - Custom calculation to fix sankranti library bug
-        # The sankranti library incorrectly uses day muhurta duration for night periods
-        # We need to use night muhurta duration for night Dur Muhurtam
-        
-        # Get sunrise/sunset times in decimal hours
-        sunrise_h = sr_info[1][0] + sr_info[1][1]/60.0 + sr_info[1][2]/3600.0
-        sunset_h = ss_info[1][0] + ss_info[1][1]/60.0 + ss_info[1][2]/3600.0
-        
-        # Get next day's sunrise for night duration
-        next_sr_info = sankranti.sunrise(jd_midnight + 1, place)
-        next_sunrise_h = 24 + next_sr_info[1][0] + next_sr_info[1][1]/60.0 + next_sr_info[1][2]/3600.0
-        
-        # Calculate muhurta durations
-        day_duration = sunset_h - sunrise_h
-        night_duration = next_sunrise_h - sunset_h
-        day_muhurta = day_duration / 15.0
-        night_muhurta = night_duration / 15.0
-        
-        # Dur Muhurtam indices vary by weekday (0=Sunday, 1=Monday, etc.)
-        # Day Dur Muhurtam (from sunrise): [muhurta_index]
-        # Night Dur Muhurtam (from sunset): [muhurta_index]
-        weekday = sankranti.vaara(jd_midnight)
-        
-        # Standard Dur Muhurtam positions (0-indexed):
-        # Sunday: Day 8th (7), Night 7th (6) - but some use different
-        # Monday: Day 7th (6), Night 6th (5)
-        # Tuesday: Day 4th (3), Night 7th (6)
-        # Wednesday: Day 5th (4), Night 5th (4)
-        # Thursday: Day 6th (5), Night 6th (5)
-        # Friday: Day 3rd (2), Night 3rd (2)
-        # Saturday: Day 2nd (1), Night 2nd (1)
-        
-        # Using sankranti's muhurta indices but with correct duration
-        dm_raw = sankranti.durmuhurtam(jd_midnight, place)
-        
-        # First Dur Muhurtam (day period) - sankranti calculates this correctly
-        dm_start1 = sankranti.to_dms(dm_raw[0][0])
-        dm_end1 = sankranti.to_dms(dm_raw[1][0])
-        dm_str = format_time_range_12hr(dm_start1, dm_end1, ref_date)
-        
-        # Second Dur Muhurtam - check if it's day or night period
-        if dm_raw[0][1] != 0:
-            dm2_start_raw = dm_raw[0][1]
-            dm2_end_raw = dm_raw[1][1]
-            
-            # Check if this is a nighttime period (after sunset)
-            if dm2_start_raw >= sunset_h:
-                # Nighttime period - recalculate with night muhurta duration
-                # Sankranti uses wrong muhurta duration for night periods
-                night_muhurta_index = round((dm2_start_raw - sunset_h) / night_muhurta)
-                
-                dm2_start_correct = sunset_h + (night_muhurta_index * night_muhurta)
-                dm2_end_correct = sunset_h + ((night_muhurta_index + 1) * night_muhurta)
-                
-                dm_start2 = sankranti.to_dms(dm2_start_correct)
-                dm_end2 = sankranti.to_dms(dm2_end_correct)
-            else:
-                # Daytime period - use sankranti's values as-is
-                dm_start2 = sankranti.to_dms(dm2_start_raw)
-                dm_end2 = sankranti.to_dms(dm2_end_raw)
-            
-            dm_str += f"; {format_time_range_12hr(dm_start2, dm_end2, ref_date)}"
-        
-        result['Dur Muhurtam'] = dm_str
-        
-        # Varjyam/Amrit - Calculate ONLY for nakshatra at SUNRISE (DrikPanchang convention)
-        # DrikPanchang shows Varjyam/Amrit based on the sunrise nakshatra only
-        sunrise_jd_ut = sr_info[0] - place.timezone/24.0
-        
+        return saka, vikram, gujarati
+
+    # Use sankranti functions for Tithi, Nakshatra, Yoga, Karana
+    # These calculate at sunrise and return end times
+    # They can return 2 or 4 elements if there's a skipped/overlapping value
+    @node
+    def tithi_data(self):
+        return sankranti.tithi(self.jd_midnight, self.place)
+
+    @node
+    def nakshatra_data(self):
+        return sankranti.nakshatra(self.jd_midnight, self.place)
+
+    @node
+    def yoga_data(self):
+        return sankranti.yoga(self.jd_midnight, self.place)
+
+    @node
+    def karana_data(self):
+        return sankranti.karana(self.jd_midnight, self.place)
+
+    @node
+    def periods(self):
+        # Kalams, Abhijit and Dur Muhurtam all divide the same day
+        return sankranti.day_periods(self.jd_midnight, self.place)
+
+    def evaluate(self, fields=None, elements=None):
+        """Output elements (all, or the given field projection) in response order.
+
+        elements replaces the class's element table, e.g. for a variant of a
+        calendar that formats some elements differently.
+        """
+        elements = elements or self.elements
+        result = {}
+        for key in resolve_fields(fields, elements):
+            result[key] = getattr(self, elements[key])
+        return result
+
+    def format_period(self, period):
+        return format_time_range_12hr(to_dms(period[0]), to_dms(period[1]), self.ref_date)
+
+    @node
+    def nakshatra_spans(self):
+        """Sunrise nakshatra and the next one if it starts within the day, with UT start/end"""
+        sunrise_jd_ut = self.sunrise_jd_ut
+
         # Get nakshatra at sunrise
-        nak_num = nakshatra_data[0]
-        
+        nak_num = self.nakshatra_data[0]
+
         # Find start time of current nakshatra (in UT)
         def nak_start_dist(t):
             m = sankranti.lunar_longitude(t)
             target = (nak_num - 1) * (360/27.0)
             return sankranti.norm180(m - target)
-        
+
         # Search for nakshatra start (could be before sunrise)
         n_start_jd = sankranti.bisection_search(nak_start_dist, sunrise_jd_ut - 1.5, sunrise_jd_ut + 0.2)
-        
+
         # Find nakshatra end time - need special handling for Revati (nakshatra 27)
         # because it ends at 360°/0° which causes wrap-around issues
         if nak_num == 27:  # Revati - ends at 360°/0°
@@ -740,88 +564,413 @@ class PanchangCalculator:
             # the wrong zero crossing when moon wraps around 360°
             # A nakshatra typically spans ~1 day, so 1.2 days is sufficient
             n_end_jd = sankranti.bisection_search(nak_end_dist, sunrise_jd_ut, sunrise_jd_ut + 1.2)
-        
+
         # Calculate for sunrise nakshatra AND the next one if it starts within the day
         nakshatras_to_calculate = [{
             'num': nak_num,
             'start_jd': n_start_jd,
             'end_jd': n_end_jd
         }]
-        
+
         # Check if next nakshatra starts before next sunrise overlap (roughly)
         # We check if Current Nakshatra ends before next sunrise + buffer
-        if n_end_jd < sunrise_jd_ut + 1.2: 
+        if n_end_jd < sunrise_jd_ut + 1.2:
              next_nak_num = (nak_num % 27) + 1
-             
+
              def next_nak_end_dist(t):
                 m = sankranti.lunar_longitude(t)
                 target = next_nak_num * (360/27.0)
                 return sankranti.norm180(m - target)
-                
+
              # Prev nak end is Next nak start
              next_n_start_jd = n_end_jd
              next_n_end_jd = sankranti.bisection_search(next_nak_end_dist, next_n_start_jd, next_n_start_jd + 1.5)
-             
+
              nakshatras_to_calculate.append({
                  'num': next_nak_num,
                  'start_jd': next_n_start_jd,
                  'end_jd': next_n_end_jd
              })
-        
+
+        return nakshatras_to_calculate
+
+    @node
+    def varjyam_amrit(self):
+        """(varjyam periods, amrit kalam periods) as formatted strings"""
+        # Varjyam/Amrit - Calculate ONLY for nakshatra at SUNRISE (DrikPanchang convention)
+        # DrikPanchang shows Varjyam/Amrit based on the sunrise nakshatra only
+        sunrise_jd_ut = self.sunrise_jd_ut
+        info_timezone = self.info_timezone
+        ref_date = self.ref_date
+
         # Calculate Varjyam and Amrit Kalam for all relevant nakshatras
         varjyam_periods = []
         amrit_periods = []
-        
-        for nak_info in nakshatras_to_calculate:
+
+        for nak_info in self.nakshatra_spans:
             nak_num_calc = nak_info['num']
             n_start = nak_info['start_jd']
             n_end = nak_info['end_jd']
-            
+
             # Get table values (both are in HOURS for a 24-hour nakshatra)
             v_start_hours = VARJYAM_START_HOURS.get(nak_num_calc, 0)
             a_start_hours = AMRIT_KALAM_START_HOURS.get(nak_num_calc, 0)
-            
+
             duration_days = n_end - n_start
-            
+
             # Varjyam: Formula from calculation_formula.txt
             # Starting time = Nakshatra start + (duration * X/24) where X is in hours
             # Duration = duration * 1.6/24 (1/15th of nakshatra = 1.6 hours for 24-hour nakshatra)
             v_s_ut = n_start + (duration_days * v_start_hours / 24.0)
             v_duration_days = duration_days * 1.6 / 24.0
             v_e_ut = v_s_ut + v_duration_days
-            
+
             # Amrit Kalam: Same formula
             a_s_ut = n_start + (duration_days * a_start_hours / 24.0)
             a_duration_days = duration_days * 1.6 / 24.0
             a_e_ut = a_s_ut + a_duration_days
-            
+
             # Only include if it occurs on the panchang day
             # Panchang day = current sunrise to next sunrise
             next_sunrise_approx = sunrise_jd_ut + 1.0
-            
+
             # Minimum duration threshold (5 minutes in days)
             MIN_DURATION = 5.0 / (24 * 60)  # 5 minutes
-            
+
             # Include Varjyam only if it starts after current sunrise, before next sunrise,
             # and has meaningful duration
             if v_s_ut >= sunrise_jd_ut and v_s_ut < next_sunrise_approx and v_duration_days >= MIN_DURATION:
                 v_start_time = jd_to_time_12hr(v_s_ut, info_timezone, ref_date)
                 v_end_time = jd_to_time_12hr(v_e_ut, info_timezone, ref_date)
                 varjyam_periods.append(f"{v_start_time} to {v_end_time}")
-            
+
             # Include Amrit Kalam only if it starts after current sunrise, before next sunrise,
             # and has meaningful duration
             if a_s_ut >= sunrise_jd_ut and a_s_ut < next_sunrise_approx and a_duration_days >= MIN_DURATION:
                 a_start_time = jd_to_time_12hr(a_s_ut, info_timezone, ref_date)
                 a_end_time = jd_to_time_12hr(a_e_ut, info_timezone, ref_date)
                 amrit_periods.append(f"{a_start_time} to {a_end_time}")
-        
-        # Join multiple periods with semicolon
-        result['Varjyam'] = "; ".join(varjyam_periods) if varjyam_periods else "None"
-        result['Amrit Kalam'] = "; ".join(amrit_periods) if amrit_periods else "None"
-        
+
+        return varjyam_periods, amrit_periods
+
+    # -------------------------------------------------------------------------
+    # Elements
+    # -------------------------------------------------------------------------
+
+    @node
+    def sunrise(self):
+        return format_time_12hr(self.sr_info[1])
+
+    @node
+    def sunset(self):
+        return format_time_12hr(self.ss_info[1])
+
+    @node
+    def moonrise(self):
+        sr_info = self.sr_info
+        mr_val = sankranti.moonrise(self.jd_midnight, self.place)
+
+        # Calculate sunrise hours for comparison
+        sunrise_hours = sr_info[1][0] + sr_info[1][1]/60 + sr_info[1][2]/3600
+
+        # Handle moonrise - check if it's too close to sunrise (within 2 minutes)
+        # When moonrise is essentially at sunrise, it's not a distinct visible event
+        # Also handle cases where moonrise is out of valid range
+        if mr_val[0] < 0 or mr_val[0] >= 48:
+            return "No Moonrise"
+        moonrise_hours = mr_val[0] + mr_val[1]/60 + mr_val[2]/3600
+        # Check if moonrise is within 2 minutes of sunrise
+        diff_minutes = abs(moonrise_hours - sunrise_hours) * 60
+        if diff_minutes < 2:
+            return "No Moonrise"
+        return format_time_12hr(mr_val, include_date=True, ref_date=self.ref_date)
+
+    @node
+    def moonset(self):
+        ms_val = sankranti.moonset(self.jd_midnight, self.place)
+
+        # Handle moonset - check if it falls within the current Hindu day
+        # Hindu day runs from sunrise to next sunrise
+        # If moonset is on the next calendar day, check if it's before next day's sunrise
+        if ms_val[0] < 0 or ms_val[0] >= 36:
+            return "No Moonset"
+        moonset_hours = ms_val[0] + ms_val[1]/60 + ms_val[2]/3600
+
+        # If moonset is after 24 hours (next calendar day)
+        if moonset_hours >= 24:
+            # Get next day's sunrise
+            next_day = self.ref_date + datetime.timedelta(days=1)
+            jd_next = sankranti.gregorian_to_jd(next_day)
+            sr_next = sankranti.sunrise(jd_next, self.place)
+            sunrise_next_hours = sr_next[1][0] + sr_next[1][1]/60 + sr_next[1][2]/3600
+
+            # Convert moonset to next day's time (subtract 24)
+            moonset_next_day_hours = moonset_hours - 24
+
+            # If moonset is after next day's sunrise, it doesn't belong to current Hindu day
+            if moonset_next_day_hours >= sunrise_next_hours:
+                return "No Moonset"
+        return format_time_12hr(ms_val, include_date=True, ref_date=self.ref_date)
+
+    # The 60-year cycle name changes at Chaitra Shukla Pratipada (Hindu New Year)
+    # For months before Chaitra (Magha=11, Phalguna=12), use previous year's cycle position
+    # Chaitra is month 1, so months 11 and 12 are before the new year
+
+    @node
+    def shaka_samvat(self):
+        # Shaka Samvat - the library's elapsed_year already returns the correct year
+        # accounting for months before Chaitra, so we just use a constant offset of 11
+        saka = self.samvat[0]
+        saka_cycle_idx = (saka + 11) % 60
+        return f"{saka} {SAMVAT_YEAR_NAMES[saka_cycle_idx]}"
+
+    @node
+    def vikram_samvat(self):
+        # Vikram Samvat - Use dynamic offset that accounts for Kshaya/Adhika years
+        # The 60-year Brihaspati cycle "slips" relative to calendar years because
+        # Jupiter's ~11.86 year period doesn't exactly match 12 years
+        vikram = self.samvat[1]
+        vikram_cycle_idx = get_vikram_samvatsara_index(vikram)
+        return f"{vikram} {SAMVAT_YEAR_NAMES[vikram_cycle_idx]}"
+
+    @node
+    def gujarati_samvat(self):
+        # Gujarati Samvat
+        gujarati = self.samvat[2]
+        gujarati_cycle_idx = (gujarati + 8) % 60
+        return f"{gujarati} {SAMVAT_YEAR_NAMES[gujarati_cycle_idx]}"
+
+    @node
+    def amanta_month(self):
+        masa_num, is_leap = self.masa_info[0], self.masa_info[1]
+        return get_mname(masa_num, is_leap)
+
+    @node
+    def purnimanta_month(self):
+        masa_num, is_leap = self.masa_info[0], self.masa_info[1]
+
+        # Purnimanta month calculation:
+        # In Purnimanta system, month ends on Purnima (full moon), so:
+        # - Krishna Paksha comes FIRST in the month
+        # - Shukla Paksha comes SECOND in the month
+        #
+        # Relationship to Amanta:
+        # - During Shukla Paksha (tithi 1-15): Purnimanta = Amanta (same month)
+        # - During Krishna Paksha (tithi 16-30): Purnimanta = Amanta + 1 (next month)
+        #
+        # In adhik masa, both systems show the same adhik month
+        if is_leap:
+            return get_mname(masa_num, is_leap)
+
+        # Check if we're in Shukla or Krishna Paksha
+        is_shukla_paksha = self.tithi_data[0] <= 15
+
+        if is_shukla_paksha:
+            # Shukla Paksha: Purnimanta = Amanta (same month)
+            purnimanta_month = masa_num
+            purnimanta_leap = is_leap
+        else:
+            # Krishna Paksha: Purnimanta = Amanta + 1 (next month)
+            purnimanta_month = (masa_num % 12) + 1
+            purnimanta_leap = False  # Next month is not adhik
+
+        return get_mname(purnimanta_month, purnimanta_leap)
+
+    @node
+    def weekday(self):
+        return VARA_NAMES[sankranti.vaara(self.jd_midnight)]['sanskrit']
+
+    @node
+    def paksha(self):
+        return "Shukla Paksha" if self.tithi_data[0] <= 15 else "Krishna Paksha"
+
+    @node
+    def tithi(self):
+        # Format Tithi (can have 2 tithis if one ends during the day)
+        tithi_num = self.tithi_data[0]
+        tithi_end_time = self.tithi_data[1]
+        t_name = TITHI_NAMES[tithi_num]['english']
+
+        # Convert end time to hours for comparison
+        end_hours = tithi_end_time[0] + tithi_end_time[1]/60.0
+        sunrise_hours = self.sr_info[1][0] + self.sr_info[1][1]/60.0
+
+        # Show end time if it's during the panchang day (sunrise to next sunrise, i.e., within ~24 hours)
+        if end_hours < 24 + sunrise_hours:  # Ends before next sunrise
+            result = f"{t_name} upto {format_time_12hr(tithi_end_time, include_date=True, ref_date=self.ref_date)}"
+            # Add the next tithi if end time is before midnight or early next day
+            if end_hours < 24:
+                next_tithi_num = (tithi_num % 30) + 1
+                next_t_name = TITHI_NAMES[next_tithi_num]['english']
+                result += f"; {next_t_name}"
+            return result
+        # Tithi prevails the whole day
+        return t_name
+
+    @node
+    def nakshatra(self):
+        # Format Nakshatra
+        nak_num = self.nakshatra_data[0]
+        nak_end_time = self.nakshatra_data[1]
+        nak_name = NAKSHATRA_NAMES[nak_num-1]['english']
+
+        # Convert end time to hours for comparison
+        nak_end_hours = nak_end_time[0] + nak_end_time[1]/60.0
+        sunrise_hours = self.sr_info[1][0] + self.sr_info[1][1]/60.0
+
+        # Check if nakshatra changes during the day (between sunrise and early next morning up to 30 hours)
+        if sunrise_hours <= nak_end_hours < 30 or nak_end_hours < sunrise_hours:
+            result = f"{nak_name} upto {format_time_12hr(nak_end_time, include_date=True, ref_date=self.ref_date)}"
+            # Add the next nakshatra
+            next_nak_num = (nak_num % 27) + 1
+            next_nak_name = NAKSHATRA_NAMES[next_nak_num-1]['english']
+            return result + f"; {next_nak_name}"
+        # Nakshatra prevails the whole day
+        return nak_name
+
+    @node
+    def yoga(self):
+        # Format Yoga
+        yoga_num = self.yoga_data[0]
+        yoga_end_time = self.yoga_data[1]
+        y_name = YOGA_NAMES[yoga_num-1]['english']
+
+        # Convert end time to hours for comparison
+        yoga_end_hours = yoga_end_time[0] + yoga_end_time[1]/60.0
+        sunrise_hours = self.sr_info[1][0] + self.sr_info[1][1]/60.0
+
+        # Show end time if yoga ends within the panchang day (sunrise to next sunrise ~30 hours)
+        if yoga_end_hours < 30:
+            result = f"{y_name} upto {format_time_12hr(yoga_end_time, include_date=True, ref_date=self.ref_date)}"
+            # Add the next yoga if it starts before next sunrise
+            if yoga_end_hours < 24 + sunrise_hours:
+                next_yoga_num = (yoga_num % 27) + 1
+                next_y_name = YOGA_NAMES[next_yoga_num-1]['english']
+                result += f"; {next_y_name}"
+            return result
+        return y_name
+
+    @node
+    def karana(self):
+        karana_data = self.karana_data
+        ref_date = self.ref_date
+
+        # Sunrise time in fractional hours (for comparison)
+        sunrise_hours = self.sr_info[1][0] + self.sr_info[1][1]/60.0 + self.sr_info[1][2]/3600.0
+
+        # Filter karanas - only include those that end at or after sunrise, and remove duplicates
+        karana_list = []
+        seen_karanas = set()
+        for i in range(0, len(karana_data), 2):
+            if i+1 < len(karana_data):
+                k_num = karana_data[i]
+                k_end = karana_data[i+1]
+                k_end_hours = k_end[0] + k_end[1]/60.0 + k_end[2]/3600.0
+
+                # Include karana if it ends at or after sunrise and not already seen
+                if k_end_hours >= sunrise_hours and k_num not in seen_karanas:
+                    karana_list.append((k_num, k_end, k_end_hours))
+                    seen_karanas.add(k_num)
+
+        # Sort karanas by end time
+        karana_list.sort(key=lambda x: x[2])
+
+        # Format the karanas
+        if not karana_list:
+            return "No karana data"
+
+        # First karana
+        karana_num, karana_end_time, _ = karana_list[0]
+        kn = get_karana_name(karana_num)
+        result = f"{kn} upto {format_time_12hr(karana_end_time, include_date=True, ref_date=ref_date)}"
+
+        # Add second karana if present and within the day
+        if len(karana_list) >= 2:
+            karana_num2, karana_end_time2, k2_hours = karana_list[1]
+            kn2 = get_karana_name(karana_num2)
+            # Only show if ends within reasonable timeframe (before midnight or early next morning)
+            if k2_hours < 24:  # Ends same day
+                result += f"; {kn2} upto {format_time_12hr(karana_end_time2, include_date=True, ref_date=ref_date)}"
+            elif k2_hours < 30:  # Ends early next morning (before 6 AM next day assuming ~6 AM sunrise)
+                result += f"; {kn2} upto {format_time_12hr(karana_end_time2, include_date=True, ref_date=ref_date)}"
+            else:
+                result += f"; {kn2}"
+        else:
+            # Add the next karana that follows
+            next_karana_num = (karana_num % 60) + 1
+            next_kn = get_karana_name(next_karana_num)
+            result += f"; {next_kn}"
         return result
 
+    @node
+    def pravishte(self):
+        # Pravishte - should use sunrise JD in UT for consistency with panchang tradition
+        return get_pravishte(self.sunrise_jd_ut, self.place)
+
+    # Signs - use sunrise positions (panchang tradition)
+    # Note: Must use UT sunrise like nakshatra() does for consistency
+    @node
+    def sunsign(self):
+        return RASHI_NAMES[int(sankranti.solar_longitude(self.sunrise_jd_ut)/30)]['english']
+
+    @node
+    def moonsign(self):
+        return RASHI_NAMES[int(sankranti.lunar_longitude(self.sunrise_jd_ut)/30)]['english']
+
+    @node
+    def rahu_kalam(self):
+        return self.format_period(self.periods.rahu)
+
+    @node
+    def gulikai_kalam(self):
+        return self.format_period(self.periods.gulika)
+
+    @node
+    def yamaganda(self):
+        return self.format_period(self.periods.yamaganda)
+
+    @node
+    def abhijit(self):
+        # Abhijit Muhurta is not applicable on Wednesdays
+        if sankranti.vaara(self.jd_midnight) == 3:
+            return "None"
+        return self.format_period(self.periods.abhijit)
+
+    @node
+    def dur_muhurtam(self):
+        # Dur Muhurtam - the night period (Tuesday) uses the night muhurta length
+        return "; ".join(self.format_period(p) for p in self.periods.durmuhurtam)
+
+    @node
+    def varjyam(self):
+        # Join multiple periods with semicolon
+        varjyam_periods = self.varjyam_amrit[0]
+        return "; ".join(varjyam_periods) if varjyam_periods else "None"
+
+    @node
+    def amrit_kalam(self):
+        amrit_periods = self.varjyam_amrit[1]
+        return "; ".join(amrit_periods) if amrit_periods else "None"
+
+class PanchangCalculator:
+    def __init__(self):
+        # Ensure Lahiri Ayanamsa (Chitrapaksha) is used, matching DrikPanchang
+        sankranti.set_ayanamsa_mode()
+        pass
+
+    def calculate(self, year, month, day, hour, minute, second, lat, lon, info_timezone, fields=None):
+        """
+        Panchang elements for the given local date/time and place.
+
+        fields limits the result to the named elements (see ELEMENTS and
+        resolve_fields); only the astronomy those elements need is computed.
+        """
+        return self.day(year, month, day, hour, minute, second, lat, lon, info_timezone).evaluate(fields)
+
+    def day(self, year, month, day, hour, minute, second, lat, lon, info_timezone):
+        """PanchangDay graph for consumers that read individual nodes or need the debug view."""
+        return PanchangDay(year, month, day, hour, minute, second, lat, lon, info_timezone)
+
 if __name__ == "__main__":
     c = PanchangCalculator()
     
@@ -0,0 +1,81 @@
+"""
+Precision Tiers
+
+How accurately the calculators locate an event is a trade between file
+I/O, iterations and interpolation points. A tier switches all of them
+together:
+
+    standard  Swiss Ephemeris files (FLG_SWIEPH), bisection to 5e-10 day,
+              17-point new/full moon interpolation, range sunrises refined
+              with swe.rise_trans - the results the API has always returned
+    fast      Moshier analytical ephemeris (FLG_MOSEPH, no file I/O),
+              bisection to 1e-5 day (under a second), 9-point new/full moon
+              interpolation, range sunrises refined with one Newton step -
+              for bulk almanac generation and previews where minute-level
+              accuracy is enough
+
+The tier is a context variable, so it follows a request (or a worker task)
+without changing any calculator signature:
+
+    with use("fast"):
+        CALC.calculate(...)
+
+Results of different tiers are kept apart in the caches: sun times are
+cached per ephemeris engine and stored results under variant_key().
+
+benchmarks/precision_tiers.py measures the speed and the largest timing
+difference of each tier against standard.
+"""
+
+import contextvars
+from collections import namedtuple
+from contextlib import contextmanager
+
+import swisseph as swe
+
+Tier = namedtuple('Tier', [
+    'name',
+    'flags',           # ephemeris flag for swe.calc_ut / swe.rise_trans
+    'epsilon',         # bisection_search tolerance in days
+    'phase_step',      # day step of the new/full moon interpolation points over +-2 days
+    'sunrise_refine',  # sunrise_engine refine mode for day ranges
+    'sun_engine'       # SUN_CACHE engine name
+])
+
+TIERS = {
+    "standard": Tier("standard", swe.FLG_SWIEPH, 5E-10, 0.25, "rise_trans", "swe"),
+    "fast": Tier("fast", swe.FLG_MOSEPH, 1E-5, 0.5, "newton", "moshier"),
+}
+
+DEFAULT = "standard"
+
+_TIER = contextvars.ContextVar("precision_tier", default=TIERS[DEFAULT])
+
+
+def tier(name):
+    """Tier by name; ValueError for unknown names."""
+    try:
+        return TIERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown precision '{name}'. Valid values: {', '.join(TIERS)}") from None
+
+
+def current():
+    """Tier of the current context (standard unless inside use())."""
+    return _TIER.get()
+
+
+@contextmanager
+def use(name):
+    """Run the block with the named tier."""
+    token = _TIER.set(tier(name))
+    try:
+        yield
+    finally:
+        _TIER.reset(token)
+
+
+def variant_key(variant, name=None):
+    """Cache variant name of a result computed with the tier (default: current); standard keeps the plain name."""
+    name = name or current().name
+    return variant if name == DEFAULT else f"{variant}@{name}"
@@ -0,0 +1,146 @@
+"""
+Precompute
+
+Materialize calculator results for the most populous cities into the
+result store, so API requests for them become key lookups:
+
+    python precompute.py --top 500 --days 365
+    python precompute.py --top 50 --start 2026-11-01 --days 30 --variants panchang,choghadiya
+    python precompute.py --top 5000 --days 365 --precision fast
+
+Cities are taken from cities.json by population. Each city's dates are
+computed in a worker process (one per core by default) and written by the
+parent in one transaction per city, keyed with the algorithm version of
+this checkout. The timezone offset of each date is the city's noon offset,
+the same one the API resolves for the city. Results of the fast precision
+tier are stored apart from standard ones and served to precision=fast
+requests.
+"""
+
+import argparse
+import datetime
+import multiprocessing
+import os
+import time
+
+from city_utils import load_cities, get_timezone_offset
+from location_resolver import DEFAULT_TZ_OFFSET
+import precision
+from result_store import DEFAULT_PATH, ResultKey, result_store
+
+# Calculator output stored for each variant, as the endpoint of the same
+# name would compute it. Results do not depend on the time, noon is used.
+VARIANTS = {
+    "panchang": lambda c, y, m, d, lat, lon, tz: c["panchang"].calculate(y, m, d, 12, 0, 0, lat, lon, tz),
+    "choghadiya": lambda c, y, m, d, lat, lon, tz: c["choghadiya"].calculate(y, m, d, lat, lon, tz),
+    "marathi-panchang": lambda c, y, m, d, lat, lon, tz: c["marathi"].calculate(y, m, d, 12, 0, 0, lat, lon, tz),
+    "gujrati-panchang": lambda c, y, m, d, lat, lon, tz: c["gujarati"].calculate_full(y, m, d, 12, 0, 0, lat, lon, tz)['data'],
+    "telugu-panchang": lambda c, y, m, d, lat, lon, tz: c["telugu"].calculate_full(y, m, d, 12, 0, 0, lat, lon, tz)['data'],
+}
+
+# Calculators of this worker process, created by _init_worker
+_CALCULATORS = None
+
+
+def _init_worker():
+    global _CALCULATORS
+    from panchang_calculator import PanchangCalculator
+    from choghadiya_calculator import ChoghadiyaCalculator
+    from marathi_panchang_calculator import MarathiPanchangCalculator
+    from gujarati_panchang_calculator import GujaratiPanchangCalculator
+    from telugu_panchang_calculator import TeluguPanchangCalculator
+    _CALCULATORS = {
+        "panchang": PanchangCalculator(),
+        "choghadiya": ChoghadiyaCalculator(),
+        "marathi": MarathiPanchangCalculator(),
+        "gujarati": GujaratiPanchangCalculator(),
+        "telugu": TeluguPanchangCalculator(),
+    }
+
+
+def top_cities(cities, n):
+    """The n most populous cities with coordinates, without duplicates."""
+    seen = set()
+    ranked = []
+    for city in sorted(cities, key=lambda c: c.get('population') or 0, reverse=True):
+        lat, lon = city.get('latitude'), city.get('longitude')
+        if lat is None or lon is None:
+            continue
+        key = (city.get('city'), lat, lon)
+        if key in seen:
+            continue
+        seen.add(key)
+        ranked.append(city)
+        if len(ranked) == n:
+            break
+    return ranked
+
+
+def _compute_city(task):
+    """All (ResultKey, result) pairs of one city."""
+    name, lat, lon, tz_name, dates, variants, tier = task
+    rows = []
+    with precision.use(tier):
+        for year, month, day in dates:
+            tz = get_timezone_offset(tz_name, year, month, day, 12, 0) if tz_name else DEFAULT_TZ_OFFSET
+            for variant in variants:
+                result = VARIANTS[variant](_CALCULATORS, year, month, day, lat, lon, tz)
+                rows.append((ResultKey(precision.variant_key(variant), year, month, day, lat, lon, tz), result))
+    return name, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute panchang results for the most populous cities")
+    parser.add_argument("--top", type=int, default=500, help="Number of cities, by population (default: 500)")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="First date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--days", type=int, default=365, help="Number of days (default: 365)")
+    parser.add_argument("--variants", type=str, default=",".join(VARIANTS),
+                        help=f"Comma-separated variants (default: all of {', '.join(VARIANTS)})")
+    parser.add_argument("--precision", type=str, default=precision.DEFAULT, choices=list(precision.TIERS),
+                        help=f"Precision tier (default: {precision.DEFAULT})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    parser.add_argument("--store", type=str, default=os.environ.get("PANCHANG_RESULT_STORE", DEFAULT_PATH),
+                        help="Result store file (default: $PANCHANG_RESULT_STORE or results.sqlite)")
+
+    args = parser.parse_args()
+
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    unknown = [v for v in variants if v not in VARIANTS]
+    if unknown:
+        parser.error(f"Unknown variant(s): {', '.join(unknown)}. Valid variants: {', '.join(VARIANTS)}")
+
+    if not args.store:
+        parser.error("--store must name the result store file")
+
+    cities = top_cities(load_cities(), args.top)
+    if not cities:
+        print("No cities with coordinates found.")
+        return
+
+    dates = [(d.year, d.month, d.day)
+             for d in (args.start + datetime.timedelta(days=i) for i in range(args.days))]
+    tasks = [(city.get('city'), city['latitude'], city['longitude'], city.get('timezone'), dates, variants, args.precision)
+             for city in cities]
+
+    print(f"Precomputing {len(variants)} variant(s) x {len(dates)} day(s) for {len(cities)} cities "
+          f"at {args.precision} precision with {args.workers} worker(s) into {args.store}")
+
+    store = result_store(args.store)
+    started = time.perf_counter()
+    written = 0
+    try:
+        with multiprocessing.Pool(args.workers, initializer=_init_worker) as pool:
+            for done, (name, rows) in enumerate(pool.imap_unordered(_compute_city, tasks), 1):
+                store.put_many(rows)
+                written += len(rows)
+                print(f"[{done}/{len(tasks)}] {name}: {len(rows)} results")
+    finally:
+        store.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {written} results in {elapsed:.1f}s ({written / elapsed:.1f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Per-Request Profiling
+
+Opt-in stage timings and ephemeris call counters for a single request.
+
+A Profile is bound to the current request through a context variable, so
+code anywhere below the endpoint records into it with
+
+    with stage("masa"):
+        ...
+    count("geonames_requests")
+
+and both are no-ops costing one context variable lookup when no profile
+is active. ServerTimingMiddleware activates a profile for requests with
+debug=timing in the query string and reports it in a Server-Timing
+header; endpoints add current().as_dict() to the body.
+
+swe.calc_ut / swe.rise_trans call counts, bisection iterations and the
+sunrise and masa stages come from wrappers that are installed while at
+least one profile is active and removed again when the last one ends, so
+requests served while nothing is profiled run the unwrapped functions.
+metrics.MetricsMiddleware profiles a sample of requests to count their
+ephemeris calls; ServerTimingMiddleware reports that same profile when the
+request also asked for debug=timing.
+"""
+
+import contextvars
+import threading
+import time
+from urllib.parse import parse_qs
+
+_PROFILE = contextvars.ContextVar("panchang_profile", default=None)
+
+
+class Profile:
+    """Stage timings and counters collected for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            entry = self.stages.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self):
+        """Timings in milliseconds and counters, for a debug response field."""
+        with self._lock:
+            return {
+                "total_ms": round(self.total_ms(), 3),
+                "stages": {name: {"count": n, "ms": round(seconds * 1000, 3)}
+                           for name, (n, seconds) in self.stages.items()},
+                "counters": dict(self.counters)
+            }
+
+    def server_timing(self):
+        """Server-Timing header value: one metric per stage and counter."""
+        metrics = []
+        with self._lock:
+            for name, (n, seconds) in self.stages.items():
+                metrics.append(f'{_token(name)};dur={seconds * 1000:.3f};desc="{n}x"')
+            for name, value in self.counters.items():
+                metrics.append(f'{_token(name)};desc="{value}"')
+        metrics.append(f"total;dur={self.total_ms():.3f}")
+        return ", ".join(metrics)
+
+
+def _token(name):
+    """Metric name restricted to HTTP token characters."""
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+class _NoStage:
+    """Shared no-op context manager used when profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class _Stage:
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def current():
+    """Active Profile of this request, or None."""
+    return _PROFILE.get()
+
+
+def stage(name):
+    """Context manager timing a stage of the active profile."""
+    profile = _PROFILE.get()
+    if profile is None:
+        return _NO_STAGE
+    return _Stage(profile, name)
+
+
+def record(name, seconds):
+    """Add an already measured duration to the active profile."""
+    profile = _PROFILE.get()
+    if profile is not None:
+        profile.record(name, seconds)
+
+
+def count(name, n=1):
+    """Increment a counter of the active profile."""
+    profile = _PROFILE.get()
+    if profile is not None:
+        profile.count(name, n)
+
+
+def activate():
+    """Start a Profile for the current context; returns (profile, token)."""
+    global _active
+    with _instrument_lock:
+        _active += 1
+        if _active == 1:
+            _install()
+    profile = Profile()
+    return profile, _PROFILE.set(profile)
+
+
+def deactivate(token):
+    global _active
+    _PROFILE.reset(token)
+    with _instrument_lock:
+        _active -= 1
+        if _active == 0:
+            _uninstall()
+
+
+# -----------------------------------------------------------------------------
+# Ephemeris and sankranti instrumentation
+# -----------------------------------------------------------------------------
+
+# Profiles currently active in any context; wrappers are installed while > 0
+_active = 0
+_instrument_lock = threading.Lock()
+# (module, attribute, original) of every installed wrapper
+_installed = []
+
+
+def _counted(func, name):
+    def wrapper(*args, **kwargs):
+        profile = _PROFILE.get()
+        if profile is not None:
+            profile.count(name)
+        return func(*args, **kwargs)
+    wrapper.__wrapped__ = func
+    wrapper.__name__ = getattr(func, "__name__", name)
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def _staged(func, name):
+    def wrapper(*args, **kwargs):
+        with stage(name):
+            return func(*args, **kwargs)
+    wrapper.__wrapped__ = func
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def _counted_bisection(func):
+    def bisection_search(f, start, stop):
+        profile = _PROFILE.get()
+        if profile is None:
+            return func(f, start, stop)
+
+        evaluations = [0]
+        def counted(t):
+            evaluations[0] += 1
+            return f(t)
+
+        result = func(counted, start, stop)
+        profile.count("bisection_searches")
+        # Every iteration evaluates the function twice
+        profile.count("bisection_iterations", evaluations[0] // 2)
+        return result
+    bisection_search.__wrapped__ = func
+    bisection_search.__doc__ = func.__doc__
+    return bisection_search
+
+
+def _install():
+    """Replace the instrumented functions by their wrappers (called under _instrument_lock)."""
+    import swisseph as swe
+    import sankranti
+
+    wrappers = [
+        (swe, "calc_ut", lambda f: _counted(f, "swe_calc_ut")),
+        (swe, "rise_trans", lambda f: _counted(f, "swe_rise_trans")),
+        (sankranti, "bisection_search", _counted_bisection),
+        (sankranti, "_rise_set", lambda f: _staged(f, "sunrise")),
+        (sankranti, "masa", lambda f: _staged(f, "masa")),
+    ]
+    for module, name, wrap in wrappers:
+        original = getattr(module, name)
+        _installed.append((module, name, original))
+        setattr(module, name, wrap(original))
+
+
+def _uninstall():
+    """Put the original functions back (called under _instrument_lock)."""
+    while _installed:
+        module, name, original = _installed.pop()
+        setattr(module, name, original)
+
+
+# -----------------------------------------------------------------------------
+# ASGI middleware
+# -----------------------------------------------------------------------------
+
+def wants_timing(query_string):
+    """True when a raw query string asks for the debug=timing view."""
+    if b"timing" not in query_string:
+        return False
+    values = parse_qs(query_string.decode("latin-1")).get("debug", [])
+    return any("timing" in (view.strip().lower() for view in value.split(",")) for value in values)
+
+
+class ServerTimingMiddleware:
+    """
+    Profile requests that ask for debug=timing and add a Server-Timing
+    header. Other requests pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not wants_timing(scope.get("query_string", b"")):
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse the profile of an outer middleware (metrics) when there is one
+        profile, token = current(), None
+        if profile is None:
+            profile, token = activate()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if token is not None:
+                deactivate(token)
@@ -0,0 +1,213 @@
+"""
+Result Store
+
+Persistent store of calculator results in a local SQLite file, shared by
+all workers on a host and kept across restarts. It is the L2 tier of the
+API's tiered_cache.TieredCache, which reads through it and writes computed
+results back. precompute.py fills it ahead of time for the most populous
+cities.
+
+Results depend only on the variant, the local date, the coordinates and
+the timezone offset (never on the requested hour), so rows are keyed on
+
+    (variant, date, location, version)
+
+where location is the coordinates quantized to a configurable number of
+decimals plus the offset, and version is http_cache.ALGORITHM_VERSION.
+Results of other algorithm versions are never served; they are the first
+rows evicted. The value is the calculator output serialized as JSON;
+response meta is built by the endpoint as usual.
+
+The database runs in WAL mode, so readers in every worker proceed while
+one of them writes. When the database grows past its size limit the
+oldest written rows are deleted and their pages reused.
+
+Configuration (environment):
+    PANCHANG_RESULT_STORE            path of the SQLite file (default
+                                     results.sqlite next to this module);
+                                     empty disables the store
+    PANCHANG_RESULT_STORE_MAX_MB     size limit in megabytes (default 512)
+    PANCHANG_RESULT_STORE_PRECISION  decimals kept for lat/lon (default 6)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import namedtuple
+
+from fast_json import dumps, loads
+from http_cache import ALGORITHM_VERSION
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'results.sqlite')
+
+# Open stores; a forked worker must not use the parent's SQLite connections
+_STORES = weakref.WeakSet()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    variant TEXT NOT NULL,
+    date TEXT NOT NULL,
+    location TEXT NOT NULL,
+    version TEXT NOT NULL,
+    written REAL NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (variant, date, location, version)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_written ON results (written);
+"""
+
+
+# Inputs a calculator result depends on
+ResultKey = namedtuple('ResultKey', ['variant', 'year', 'month', 'day', 'latitude', 'longitude', 'tz_offset'])
+
+
+def date_key(year, month, day):
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+class ResultStore:
+    """SQLite-backed result store with size-based eviction."""
+
+    name = "store"
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024, precision=6, version=ALGORITHM_VERSION):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.precision = precision
+        self.version = version
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        _STORES.add(self)
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(results)")]
+        if columns and "version" not in columns:
+            # Store written before results were versioned; it is only a cache
+            conn.execute("DROP TABLE results")
+        conn.executescript(_SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # timeout waits for another worker's write transaction to finish
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def location_key(self, lat, lon, tz_offset):
+        """Quantized coordinates and timezone offset."""
+        return f"{float(lat):.{self.precision}f}:{float(lon):.{self.precision}f}:{float(tz_offset):.4f}"
+
+    def _row(self, key, result):
+        return (key.variant, date_key(key.year, key.month, key.day),
+                self.location_key(key.latitude, key.longitude, key.tz_offset),
+                self.version, time.time(), dumps(result))
+
+    def get(self, key):
+        """Stored result for a ResultKey at the current algorithm version, or None."""
+        row = self._connection().execute(
+            "SELECT body FROM results WHERE variant = ? AND date = ? AND location = ? AND version = ?",
+            (key.variant, date_key(key.year, key.month, key.day),
+             self.location_key(key.latitude, key.longitude, key.tz_offset), self.version)
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return loads(row[0])
+
+    def put(self, key, result):
+        self.put_many([(key, result)])
+
+    def put_many(self, items):
+        """Write (ResultKey, result) pairs in one transaction, replacing existing entries."""
+        self._write([self._row(key, result) for key, result in items])
+
+    def _write(self, rows):
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (variant, date, location, version, written, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        with self._lock:
+            self.writes += len(rows)
+        self._evict(conn)
+
+    def size_bytes(self, conn=None):
+        """Bytes of the database in use (freed pages excluded)."""
+        conn = conn or self._connection()
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - freelist) * page_size
+
+    def _evict(self, conn):
+        """Delete other-version rows, then the oldest written, until under max_bytes."""
+        if not self.max_bytes or self.size_bytes(conn) <= self.max_bytes:
+            return
+        with conn:
+            deleted = conn.execute("DELETE FROM results WHERE version != ?", (self.version,)).rowcount
+        while self.size_bytes(conn) > self.max_bytes:
+            rows = conn.execute("SELECT count(*) FROM results").fetchone()[0]
+            if not rows:
+                break
+            # Drop the oldest tenth per round; freed pages are reused by later writes
+            with conn:
+                deleted += conn.execute(
+                    "DELETE FROM results WHERE (variant, date, location, version) IN "
+                    "(SELECT variant, date, location, version FROM results ORDER BY written LIMIT ?)",
+                    (max(rows // 10, 1),)).rowcount
+        with self._lock:
+            self.evictions += deleted
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def stats(self):
+        """Hit/miss/write/eviction counts and hit rate since start."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "version": self.version,
+                "max_bytes": self.max_bytes,
+                "precision": self.precision,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def _after_fork():
+    for store in list(_STORES):
+        store._local = threading.local()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def result_store(path=None):
+    """Store configured from the environment (path overrides the file), or None when disabled."""
+    if path is None:
+        path = os.environ.get("PANCHANG_RESULT_STORE", DEFAULT_PATH)
+    if not path:
+        return None
+    return ResultStore(
+        path,
+        max_bytes=int(float(os.environ.get("PANCHANG_RESULT_STORE_MAX_MB", 512)) * 1024 * 1024),
+        precision=int(os.environ.get("PANCHANG_RESULT_STORE_PRECISION", 6))
+    )
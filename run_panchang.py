@@ -2,6 +2,7 @@ import argparse
 import datetime
 
 from panchang_calculator import PanchangCalculator
+import precision
 from city_utils import load_cities, find_city, get_timezone_offset
 
 def main():
@@ -18,6 +19,9 @@ def main():
     parser.add_argument("--hour", type=int, default=now.hour, help="Hour")
     parser.add_argument("--minute", type=int, default=now.minute, help="Minute")
     parser.add_argument("--second", type=int, default=now.second, help="Second")
+    parser.add_argument("--fields", type=str, help="Comma-separated elements to compute, e.g. Tithi,Sunrise (default: all)")
+    parser.add_argument("--precision", type=str, default=precision.DEFAULT, choices=list(precision.TIERS),
+                        help=f"Precision tier: fast uses the Moshier ephemeris (default: {precision.DEFAULT})")
     
     args = parser.parse_args()
     
@@ -64,7 +68,9 @@ def main():
     
     calc = PanchangCalculator()
     try:
-        results = calc.calculate(args.year, args.month, args.day, args.hour, args.minute, args.second, lat, lon, tz)
+        fields = args.fields.split(",") if args.fields else None
+        with precision.use(args.precision):
+            results = calc.calculate(args.year, args.month, args.day, args.hour, args.minute, args.second, lat, lon, tz, fields=fields)
         
         # Determine strict order
         keys_order = [
@@ -79,6 +85,8 @@ def main():
         
         i = 1
         for key in keys_order:
+            if fields and key not in results:
+                continue
             val = results.get(key, "N/A")
             print(f"{i}. {key}: {val}")
             i += 1
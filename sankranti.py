@@ -2,6 +2,10 @@ from __future__ import division
 from math import ceil, floor
 from collections import namedtuple as struct
 import swisseph as swe
+import ephemeris
+import precision
+from sun_cache import SUN_CACHE
+from day_division import DayDivision, DURMUHURTAM_PARTS, MUHURTAS, divide
 
 Date = struct('Date', ['year', 'month', 'day'])
 Place = struct('Place', ['latitude', 'longitude', 'timezone'])
@@ -47,13 +51,14 @@ norm180 = lambda angle: (angle - 360) if angle >= 180 else angle
 # Make angle lie between [0, 360)
 norm360 = lambda angle: angle % 360
 
-# Set ephemeris path for Swiss Ephemeris
-swe.set_ephe_path('/usr/share/libswe/ephe')
+# Set ephemeris path for Swiss Ephemeris (PANCHANG_EPHE_PATH)
+ephemeris.configure()
 
 def bisection_search(func, start, stop):
   left = start
   right = stop
-  epsilon = 5E-10   # Anything better than this puts the loop below infinite
+  # 5E-10 in the standard tier; anything better than this puts the loop below infinite
+  epsilon = precision.current().epsilon
 
   while True:
     middle = (left + right) / 2
@@ -113,26 +118,41 @@ def sidereal_longitude(jd, planet, tropical = False):
   """Computes nirayana (sidereal) longitude of given planet on jd"""
   set_ayanamsa_mode()
   is_tropical = swe.FLG_TROPICAL if tropical else swe.FLG_SIDEREAL
-  longi = swe.calc_ut(jd, planet, flags = swe.FLG_SWIEPH | is_tropical)
+  longi = swe.calc_ut(jd, planet, flags = precision.current().flags | is_tropical)
   reset_ayanamsa_mode()
   return norm360(longi[0][0]) # degrees
 
 solar_longitude = lambda jd, tropical = False: sidereal_longitude(jd, swe.SUN, tropical)
 lunar_longitude = lambda jd, tropical = False: sidereal_longitude(jd, swe.MOON, tropical)
 
+SunTimes = struct('SunTimes', ['sunrise', 'sunset', 'next_sunrise'])
+
+def _rise_set(jd, place):
+  """(sunrise, sunset) in UT for the civil day starting at jd, cached per (date, location)"""
+  lat, lon, tz = place
+  tier = precision.current()
+  def compute(lat, lon):
+    rise = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_RISE, flags = tier.flags)[1][0]
+    setting = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_SET, flags = tier.flags)[1][0]
+    return (rise, setting)
+  return SUN_CACHE.get(tier.sun_engine, jd, lat, lon, tz, compute)
+
+def sun_times(jd, place):
+  """Sunrise, sunset and next day's sunrise (julian days in UT) for given date and place"""
+  rise, setting = _rise_set(jd, place)
+  return SunTimes(rise, setting, _rise_set(jd + 1, place)[0])
+
 def sunrise(jd, place):
   """Sunrise when centre of disc is at horizon for given date and place"""
-  lat, lon, tz = place
-  result = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_RISE)
-  rise = result[1][0]  # julian-day number
+  tz = place[2]
+  rise = _rise_set(jd, place)[0]  # julian-day number
   # Convert to local time
   return [rise + tz/24., to_dms((rise - jd) * 24 + tz)]
 
 def sunset(jd, place):
   """Sunset when centre of disc is at horizon for given date and place"""
-  lat, lon, tz = place
-  result = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_SET)
-  setting = result[1][0]  # julian-day number
+  tz = place[2]
+  setting = _rise_set(jd, place)[1]  # julian-day number
   # Convert to local time
   return [setting + tz/24., to_dms((setting - jd) * 24 + tz)]
 
@@ -141,7 +161,7 @@ def moonrise(jd, place):
   lat, lon, tz = place
   # Search from sunrise to find the next moonrise (not previous one)
   rise = sunrise(jd, place)[0]
-  result = swe.rise_trans(rise - tz/24, swe.MOON, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_RISE)
+  result = swe.rise_trans(rise - tz/24, swe.MOON, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_RISE, flags = precision.current().flags)
   moonrise_jd = result[1][0]  # julian-day number
   # Convert to local time
   return to_dms((moonrise_jd - jd) * 24 + tz)
@@ -151,7 +171,7 @@ def moonset(jd, place):
   lat, lon, tz = place
   # Search from sunrise to find the next moonset (not previous one)
   rise = sunrise(jd, place)[0]
-  result = swe.rise_trans(rise - tz/24, swe.MOON, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_SET)
+  result = swe.rise_trans(rise - tz/24, swe.MOON, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_SET, flags = precision.current().flags)
   setting = result[1][0]  # julian-day number
   # Convert to local time
   return to_dms((setting - jd) * 24 + tz)
@@ -394,7 +414,8 @@ def new_moon(jd, tithi_, opt = -1):
   if opt == -1:  start = jd - tithi_         # previous new moon
   if opt == +1:  start = jd + (30 - tithi_)  # next new moon
   # Search within a span of (start +- 2) days
-  x = [ -2 + offset/4 for offset in range(17) ]
+  step = precision.current().phase_step
+  x = [ -2 + offset * step for offset in range(int(4 / step) + 1) ]
   y = [lunar_phase(start + i) for i in x]
   y = unwrap_angles(y)
   y0 = inverse_lagrange(x, y, 360)
@@ -413,7 +434,8 @@ def full_moon(jd, tithi_, opt = -1):
   if opt == +1:   # next full moon
     start = jd + (15 - tithi_) if tithi_ < 15 else jd - tithi_ + 45
   # Search within a span of (start +- 2) days
-  x = [ -2 + offset/4 for offset in range(17) ]
+  step = precision.current().phase_step
+  x = [ -2 + offset * step for offset in range(int(4 / step) + 1) ]
   y = [lunar_phase(start + i) for i in x]
   y = unwrap_angles(y)
   y0 = inverse_lagrange(x, y, 180)
@@ -432,25 +454,40 @@ def lunar_phase(jd):
   moon_phase = (lunar_long - solar_long) % 360
   return moon_phase
 
-def trikalam(jd, place, option='rahu'):
-  lat, lon, tz = place
-  # tz already extracted from tuple above
-  srise = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_RISE)[1][0]
-  sset = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_SET)[1][0]
-  day_dur = (sset - srise)
-  weekday = vaara(jd)
+DayPeriods = struct('DayPeriods', ['rahu', 'gulika', 'yamaganda', 'abhijit', 'durmuhurtam',
+                                   'day_muhurtas', 'night_muhurtas'])
 
-  # value in each array is for given weekday (0 = sunday, etc.)
-  offsets = { 'rahu': [0.875, 0.125, 0.75, 0.5, 0.625, 0.375, 0.25],
-              'gulika': [0.75, 0.625, 0.5, 0.375, 0.25, 0.125, 0.0],
-              'yamaganda': [0.5, 0.375, 0.25, 0.125, 0.0, 0.75, 0.625] }
-
-  start_time = srise + day_dur * offsets[option][weekday]
-  end_time = start_time + 0.125 * day_dur
+def day_periods(jd, place, sun = None):
+  """All fixed-fraction periods of the day from one (sunrise, sunset, next sunrise)
+     triple. Pass sun = sun_times(jd, place) to reuse an already computed triple.
+     Every period is a (start, end) pair in local decimal hours, like durmuhurtam."""
+  tz = place[2]
+  srise, sset, next_rise = sun if sun is not None else sun_times(jd, place)
+  weekday = vaara(jd)
+  division = DayDivision(srise, sset, next_rise, weekday = weekday)
+
+  # to local timezone, in hours from jd
+  hours = lambda t: (t - jd) * 24 + tz
+  local = lambda period: (float(hours(period[0])), float(hours(period[1])))
+
+  # The night is divided from sunset and next sunrise in whole seconds, as
+  # sunset() and sunrise() show them; the exact night moves Tuesday's night
+  # dur muhurtam across a minute boundary on about one day in a hundred
+  seconds = lambda h: (lambda d, m, s: d + m / 60 + s / 3600)(*to_dms(h))
+  night = divide(seconds(hours(sset)), 24 + seconds(hours(next_rise) - 24), MUHURTAS)
+  muhurtas = { 'day': [local(p) for p in division.day(MUHURTAS)],
+               'night': [tuple(map(float, p)) for p in night] }
+
+  return DayPeriods(rahu = local(division.kalam('rahu')),
+                    gulika = local(division.kalam('gulika')),
+                    yamaganda = local(division.kalam('yamaganda')),
+                    abhijit = local(division.abhijit()),
+                    durmuhurtam = [muhurtas[half][i] for half, i in DURMUHURTAM_PARTS[weekday]],
+                    day_muhurtas = muhurtas['day'],
+                    night_muhurtas = muhurtas['night'])
 
-  # to local timezone
-  start_time = (start_time - jd) * 24 + tz
-  end_time = (end_time - jd) * 24 + tz
+def trikalam(jd, place, option='rahu'):
+  start_time, end_time = getattr(day_periods(jd, place), option)
   return [to_dms(start_time), to_dms(end_time)] # decimal hours to H:M:S
 
 rahu_kalam = lambda jd, place: trikalam(jd, place, 'rahu')
@@ -458,61 +495,19 @@ yamaganda_kalam = lambda jd, place: trikalam(jd, place, 'yamaganda')
 gulika_kalam = lambda jd, place: trikalam(jd, place, 'gulika')
 
 def durmuhurtam(jd, place):
-  lat, lon, tz = place
-  # tz already extracted from tuple above
-
-  # Night = today's sunset to tomorrow's sunrise
-  sset = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_SET)[1][0]
-  srise = swe.rise_trans((jd + 1) - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_RISE)[1][0]
-  night_dur = (srise - sset)
-
-  # Day = today's sunrise to today's sunset
-  srise = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_RISE)[1][0]
-  day_dur = (sset - srise)
-
-  weekday = vaara(jd)
+  # Night dur muhurtam (Tuesday) uses the night muhurta length
+  periods = day_periods(jd, place).durmuhurtam
 
-  # There is one durmuhurtam on Sun, Wed; the rest have two
-  # Use None to indicate no period at that position
-  offsets = [[10.4, None],  # Sunday
-             [6.4, 8.8],   # Monday
-             [2.4, 4.8],   # Tuesday, [day_duration , night_duration]
-             [5.6, None],   # Wednesday
-             [4.0, 8.8],   # Thursday
-             [2.4, 6.4],   # Friday
-             [0.0, 0.8]]   # Saturday - two consecutive periods in morning
-
-  # second durmuhurtam of tuesday uses night_duration instead of day_duration
-  dur = [day_dur, day_dur]
-  base = [srise, srise]
-  if weekday == 2:  dur[1] = night_dur; base[1] = sset
-
-  # compute start and end timings
+  # Use 0 to indicate no period at that position
   start_times = [0, 0]
   end_times = [0, 0]
-  for i in range(0, 2):
-    offset = offsets[weekday][i]
-    if offset is not None:
-      start_times[i] = base[i] + dur[i] * offsets[weekday][i] / 12
-      end_times[i] = start_times[i] + day_dur * 0.8 / 12
-
-      # convert to local time
-      start_times[i] = (start_times[i] - jd) * 24 + tz
-      end_times[i] = (end_times[i] - jd) * 24 + tz
+  for i, (start, end) in enumerate(periods):
+    start_times[i] = start
+    end_times[i] = end
 
   return [start_times, end_times]  # in decimal hours
 
 def abhijit_muhurta(jd, place):
   """Abhijit muhurta is the 8th muhurta (middle one) of the 15 muhurtas
   during the day_duration (~12 hours)"""
-  lat, lon, tz = place
-  # tz already extracted from tuple above
-  srise = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_RISE)[1][0]
-  sset = swe.rise_trans(jd - tz/24, swe.SUN, geopos = (lon, lat, 0), rsmi = _rise_flags + swe.CALC_SET)[1][0]
-  day_dur = (sset - srise)
-
-  start_time = srise + 7 / 15 * day_dur
-  end_time = srise + 8 / 15 * day_dur
-
-  # to local time
-  return [(start_time - jd) * 24 + tz, (end_time - jd) * 24 + tz]
\ No newline at end of file
+  return list(day_periods(jd, place).abhijit)
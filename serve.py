@@ -0,0 +1,157 @@
+"""
+Pre-fork Server
+
+Run the API with N worker processes that share the parent's warm state:
+
+    python serve.py --workers 4 --port 8000
+
+With uvicorn --workers every process imports the API and loads cities.json,
+builds the Kshaya/Adhika table and opens the ephemeris on its own. Here the
+parent does that once (the startup tasks in startup.py), moves everything
+it allocated into the permanent generation with gc.freeze() so collections
+in the workers never write to those pages, and then forks the workers.
+The workers share the parent's pages copy-on-write and serve one listening
+socket with uvicorn.
+
+The parent only supervises: it restarts workers that exit, forwards
+SIGTERM/SIGINT, and every --memory-interval seconds logs each worker's
+memory from /proc/<pid>/smaps_rollup (RSS, PSS, shared and private). A
+worker whose private memory exceeds --max-worker-mb is restarted.
+
+Only worker 0 runs the cache warm-up scheduler; the others would repeat
+its work. Requires Linux (fork and /proc).
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+
+
+def read_memory(pid):
+    """Memory of a process in MB: rss, pss, shared and private (from smaps_rollup)."""
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return None
+    mb = lambda kb: round(kb / 1024, 1)
+    return {
+        "rss": mb(fields.get("Rss", 0)),
+        "pss": mb(fields.get("Pss", 0)),
+        "shared": mb(fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)),
+        "private": mb(fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0))
+    }
+
+
+def preload():
+    """Import the API and run its start-up tasks in this (parent) process."""
+    # No collections while loading; everything loaded is frozen below
+    gc.disable()
+    import api
+    for name in ("cities", "kshaya_adhika_table", "ephemeris"):
+        api.STARTUP.ensure(name)
+    gc.collect()
+    gc.freeze()
+    return api
+
+
+def run_worker(index, app, sock, log_level):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    gc.enable()
+    if index:
+        os.environ["PANCHANG_WARMUP_CITIES"] = "0"
+
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+    server.run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Panchang API with pre-forked workers")
+    parser.add_argument("--host", type=str, default="0.0.0.0", help="Bind address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    parser.add_argument("--memory-interval", type=float, default=60, help="Seconds between memory reports (default: 60)")
+    parser.add_argument("--max-worker-mb", type=float, default=0,
+                        help="Restart a worker whose private memory exceeds this (default: 0, never)")
+    parser.add_argument("--log-level", type=str, default="info", help="uvicorn log level (default: info)")
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    api = preload()
+    print(f"Preloaded in {time.perf_counter() - started:.2f}s: {api.STARTUP.status()}")
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    workers = {}
+    stopping = False
+
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(index, api.app, sock, args.log_level)
+            finally:
+                os._exit(0)
+        workers[pid] = index
+        print(f"Started worker {index} (pid {pid})")
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for index in range(args.workers):
+        spawn(index)
+
+    next_report = time.monotonic() + args.memory_interval
+    while workers:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid:
+            index = workers.pop(pid)
+            if not stopping:
+                print(f"Worker {index} (pid {pid}) exited with status {status}, restarting")
+                spawn(index)
+            continue
+
+        if not stopping and time.monotonic() >= next_report:
+            next_report = time.monotonic() + args.memory_interval
+            parent = read_memory(os.getpid())
+            print(f"Memory MB parent: {parent}")
+            for pid, index in sorted(workers.items(), key=lambda item: item[1]):
+                usage = read_memory(pid)
+                print(f"Memory MB worker {index} (pid {pid}): {usage}")
+                if usage and args.max_worker_mb and usage["private"] > args.max_worker_mb:
+                    print(f"Worker {index} over {args.max_worker_mb} MB private memory, restarting")
+                    os.kill(pid, signal.SIGTERM)
+
+        time.sleep(0.5)
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Single-Flight
+
+When many clients ask for the same panchang at once (today's panchang
+for Mumbai just after midnight IST), every request would miss the result
+cache and run the same calculation on its own thread-pool thread.
+SingleFlight lets the first request for a key run the calculation while
+identical requests arriving meanwhile wait for it and share its result:
+
+    value, shared = FLIGHTS.do(key, compute)
+
+shared is True for requests that waited on another request's call. An
+exception raised by the call is raised in every waiting request too.
+Nothing is kept once the call finishes; caching is the result cache's job.
+"""
+
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Run fn() for key, or wait for the call already running; returns (value, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def stats(self):
+        """Calls run, requests coalesced into them and calls in progress."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls)
+            }
@@ -0,0 +1,90 @@
+"""
+Startup Tasks
+
+Work a worker needs before it serves requests at full speed - loading
+cities.json, building the Kshaya/Adhika samvatsara table, the first Swiss
+Ephemeris calculation - is registered here instead of being done at import
+time:
+
+    STARTUP.add("cities", load)
+    STARTUP.start()            # run all tasks in a background thread
+    STARTUP.ensure("cities")   # in a request: wait for (or run) one task
+    STARTUP.ready()            # True once every task has finished
+
+Tasks run once, in registration order. ensure() runs a task in the calling
+thread if the background thread has not got to it (or was never started,
+e.g. under a test client without lifespan), so a request never sees a
+half-built table. A failed task is reported by status() and not retried.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Task:
+    __slots__ = ("fn", "state", "seconds", "error", "lock")
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.state = "pending"
+        self.seconds = None
+        self.error = None
+        self.lock = threading.Lock()
+
+
+class Startup:
+    """Named one-time warm-up tasks run in the background or on first need."""
+
+    def __init__(self):
+        self._tasks = OrderedDict()
+        self._thread = None
+
+    def add(self, name, fn):
+        self._tasks[name] = _Task(fn)
+
+    def _run(self, task):
+        # The task lock makes a concurrent ensure() wait for the running task
+        with task.lock:
+            if task.state != "pending":
+                return
+            task.state = "running"
+            start = time.perf_counter()
+            try:
+                task.fn()
+                task.state = "done"
+            except Exception as e:
+                task.state = "failed"
+                task.error = str(e)
+                print(f"Startup task failed: {e}")
+            task.seconds = time.perf_counter() - start
+
+    def start(self):
+        """Run all pending tasks in a background thread."""
+        if self._thread is not None:
+            return
+
+        def run_all():
+            for task in list(self._tasks.values()):
+                self._run(task)
+
+        self._thread = threading.Thread(target=run_all, name="startup", daemon=True)
+        self._thread.start()
+
+    def ensure(self, name):
+        """Return once the named task has finished, running it here if needed."""
+        self._run(self._tasks[name])
+
+    def ready(self):
+        return all(task.state == "done" for task in self._tasks.values())
+
+    def status(self):
+        """State and duration of each task."""
+        return {name: {
+            "state": task.state,
+            "ms": round(task.seconds * 1000, 1) if task.seconds is not None else None,
+            **({"error": task.error} if task.error else {})
+        } for name, task in self._tasks.items()}
+
+
+STARTUP = Startup()
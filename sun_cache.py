@@ -0,0 +1,116 @@
+"""
+Sunrise/Sunset Cache
+
+Sunrise is the base of every panchang element, and the same (city, date)
+sunrise is requested again and again across endpoints. This module keeps a
+bounded, process-wide LRU cache of solar rise/set times keyed on
+
+    (engine, local date, latitude, longitude, timezone offset)
+
+with latitude/longitude rounded to a configurable number of decimal places,
+so coordinates within the same quantum share one entry. The value is always
+computed from the rounded coordinates, which keeps results deterministic no
+matter which request filled the entry first. At the default precision of
+4 decimals (~11 m) sunrise moves by well under a second.
+
+Entries are namespaced by an engine name (sankranti stores its Swiss
+Ephemeris times under 'swe'), so another sunrise algorithm can share the
+same bounded store without mixing results.
+
+Configuration (environment):
+    PANCHANG_SUN_CACHE_SIZE       maximum number of entries (default 4096)
+    PANCHANG_SUN_CACHE_PRECISION  decimals kept for lat/lon (default 4)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+class SunTimesCache:
+    """Thread-safe LRU cache for sunrise/sunset values with hit/eviction counters."""
+
+    def __init__(self, maxsize=4096, precision=4):
+        self.maxsize = maxsize
+        self.precision = precision
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, lat, lon):
+        """Round coordinates to the cache precision."""
+        return round(lat, self.precision), round(lon, self.precision)
+
+    def get(self, engine, date_key, lat, lon, tz, compute):
+        """
+        Return the cached value for (engine, date_key, lat, lon, tz).
+
+        On a miss, compute(lat, lon) is called with the quantized coordinates
+        and the result is stored. date_key identifies the local date; any
+        hashable works (sankranti uses the 00:00 UT Julian day of the date).
+        """
+        q_lat, q_lon = self.quantize(lat, lon)
+        key = (engine, date_key, q_lat, q_lon, tz)
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Compute outside the lock; a concurrent miss at worst computes twice
+        value = compute(q_lat, q_lon)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def configure(self, maxsize=None, precision=None):
+        """Change size and/or precision. Changing precision clears the cache."""
+        with self._lock:
+            if precision is not None and precision != self.precision:
+                self.precision = precision
+                self._entries.clear()
+            if maxsize is not None:
+                self.maxsize = maxsize
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Current size, hit/miss/eviction counts and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "precision": self.precision,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Process-wide instance shared by sankranti and ChoghadiyaCalculator
+SUN_CACHE = SunTimesCache(
+    maxsize=int(os.environ.get("PANCHANG_SUN_CACHE_SIZE", 4096)),
+    precision=int(os.environ.get("PANCHANG_SUN_CACHE_PRECISION", 4))
+)
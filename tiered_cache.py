@@ -0,0 +1,305 @@
+"""
+Tiered Result Cache
+
+Calculator results are looked up in a list of tiers, fastest first:
+
+    L1  MemoryTier   bounded LRU in this worker process
+    L2  ResultStore  SQLite file shared by the workers of the host
+    L3  RemoteTier   optional remote cache behind the RemoteCache interface
+
+Rules:
+    lookup     tiers are tried in order; the first hit wins
+    promotion  a hit in a lower tier is copied into every tier above it,
+               so the next lookup in this worker is an L1 hit
+    fill       a computed result is written to every tier
+    demotion   upper tiers only hold copies of what the lower tiers have
+               (or are about to get), so an entry evicted from L1 is simply
+               dropped and is still found in L2
+
+L1 is always written synchronously. With write_behind the writes to the
+lower tiers are queued and flushed in batches by a background thread
+(every flush_interval seconds, at batch_size entries and at exit), so a
+request never waits for SQLite or the network; otherwise they are written
+before the result is returned.
+
+Values are shared between requests and must be treated as read-only.
+
+A remote cache (memcached, Redis, ...) plugs in by implementing
+RemoteCache.get_many/set_many on bytes. InMemoryRemoteCache is a local
+stand-in with the same interface for tests and development.
+
+Configuration (environment):
+    PANCHANG_RESULT_CACHE_SIZE  L1 entries per worker (default 1024)
+    PANCHANG_CACHE_WRITE_BEHIND 1 to queue lower-tier writes (default), 0 to write through
+    PANCHANG_REMOTE_CACHE       "memory" adds the in-memory stand-in as L3 (default: no L3)
+"""
+
+import atexit
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+from fast_json import dumps, loads
+from http_cache import ALGORITHM_VERSION
+from result_store import date_key
+
+
+class MemoryTier:
+    """Thread-safe in-process LRU tier with hit/eviction counters."""
+
+    name = "memory"
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_many(self, items):
+        for key, value in items:
+            self.put(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class RemoteCache:
+    """Interface of a remote key/value cache holding bytes."""
+
+    def get_many(self, keys):
+        """Dict of the given string keys that are present to their bytes."""
+        raise NotImplementedError
+
+    def set_many(self, items):
+        """Store a dict of string keys to bytes."""
+        raise NotImplementedError
+
+
+class InMemoryRemoteCache(RemoteCache):
+    """RemoteCache stand-in keeping bytes in a dict, for tests and development."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        with self._lock:
+            return {key: self._data[key] for key in keys if key in self._data}
+
+    def set_many(self, items):
+        with self._lock:
+            self._data.update(items)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RemoteTier:
+    """Tier adapting a RemoteCache: string keys with the algorithm version, JSON bytes values."""
+
+    name = "remote"
+
+    def __init__(self, remote, version=ALGORITHM_VERSION, precision=6):
+        self.remote = remote
+        self.version = version
+        self.precision = precision
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def remote_key(self, key):
+        return (f"panchang:{self.version}:{key.variant}:{date_key(key.year, key.month, key.day)}:"
+                f"{float(key.latitude):.{self.precision}f}:{float(key.longitude):.{self.precision}f}:"
+                f"{float(key.tz_offset):.4f}")
+
+    def get(self, key):
+        remote_key = self.remote_key(key)
+        data = self.remote.get_many([remote_key]).get(remote_key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return loads(data)
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+        items = {self.remote_key(key): dumps(value) for key, value in items}
+        self.remote.set_many(items)
+        with self._lock:
+            self.writes += len(items)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.remote).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Caches with a write-behind thread, which does not survive a fork
+_CACHES = weakref.WeakSet()
+
+
+class TieredCache:
+    """Read-through cache over tiers ordered fastest first, with promotion and optional write-behind."""
+
+    def __init__(self, tiers, write_behind=False, batch_size=256, flush_interval=1.0):
+        self.tiers = list(tiers)
+        self.write_behind = write_behind
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._wakeup = threading.Event()
+        self._writer = None
+        self.promotions = 0
+        self.computed = 0
+        _CACHES.add(self)
+
+    def get(self, key):
+        """Value from the first tier holding key (promoted into the tiers above), or None."""
+        for level, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                if level:
+                    self._fill(key, value, self.tiers[:level])
+                    with self._lock:
+                        self.promotions += 1
+                return value
+        return None
+
+    def put(self, key, value):
+        """Write value to every tier."""
+        self._fill(key, value, self.tiers)
+
+    def get_or_compute(self, key, compute, store=True):
+        """Cached value of key, else compute() - written to the tiers unless store is False."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = compute()
+        with self._lock:
+            self.computed += 1
+        if store:
+            self.put(key, value)
+        return value
+
+    def _fill(self, key, value, tiers):
+        if not tiers:
+            return
+        tiers[0].put(key, value)
+        lower = tiers[1:]
+        if not lower:
+            return
+        if not self.write_behind:
+            for tier in lower:
+                tier.put(key, value)
+            return
+
+        with self._lock:
+            for tier in lower:
+                self._pending.setdefault(tier, []).append((key, value))
+            full = sum(len(items) for items in self._pending.values()) >= self.batch_size
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_behind, name="result-cache-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all queued entries to their tiers now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for tier, items in pending.items():
+            tier.put_many(items)
+
+    def _write_behind(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error writing back cached results: {e}")
+
+    def stats(self):
+        """Per-tier stats, promotions, computed results and queued writes."""
+        with self._lock:
+            summary = {
+                "write_behind": self.write_behind,
+                "promotions": self.promotions,
+                "computed": self.computed,
+                "pending": sum(len(items) for items in self._pending.values())
+            }
+        summary["tiers"] = {tier.name: tier.stats() for tier in self.tiers}
+        return summary
+
+
+def _after_fork():
+    for cache in list(_CACHES):
+        cache._writer = None
+        cache._pending = {}
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def tiered_cache(store=None, remote=None):
+    """
+    L1 memory tier in front of the given result store (L2) and remote
+    cache (L3), configured from the environment.
+    """
+    tiers = [MemoryTier(int(os.environ.get("PANCHANG_RESULT_CACHE_SIZE", 1024)))]
+    if store is not None:
+        tiers.append(store)
+    if remote is None and os.environ.get("PANCHANG_REMOTE_CACHE") == "memory":
+        remote = InMemoryRemoteCache()
+    if remote is not None:
+        tiers.append(RemoteTier(remote))
+    return TieredCache(tiers, write_behind=os.environ.get("PANCHANG_CACHE_WRITE_BEHIND", "1") != "0")
@@ -0,0 +1,154 @@
+"""
+Cache Warm-Up
+
+"Today" starts at a different UTC instant in every timezone, and the first
+request after a city's local midnight would pay for the whole calculation
+(sunrises, the masa and varjyam searches). WarmupScheduler runs a
+background thread inside the API process that, shortly before each local
+day boundary, computes the new day's results for the most populous cities
+of that timezone for every calendar variant and puts them into the result
+cache, so those first requests are cache hits.
+
+Cities are grouped by timezone; each group is scheduled at its next local
+midnight minus the lead time and rescheduled after it ran. Results go
+through the same single-flight layer as requests, and results already in
+the cache (e.g. from precompute.py) are not computed again.
+
+Configuration (environment):
+    PANCHANG_WARMUP_CITIES        number of cities by population (default 500, 0 disables)
+    PANCHANG_WARMUP_LEAD_SECONDS  seconds before local midnight to start (default 600)
+"""
+
+import datetime
+import heapq
+import os
+import threading
+import time
+
+from city_utils import get_timezone_offset
+from location_resolver import DEFAULT_TZ_OFFSET
+from precompute import VARIANTS, top_cities
+from result_store import ResultKey
+
+try:
+    import zoneinfo
+except ImportError:
+    from backports import zoneinfo
+
+
+def _zone(tz_name):
+    if tz_name:
+        return zoneinfo.ZoneInfo(tz_name)
+    return datetime.timezone(datetime.timedelta(hours=DEFAULT_TZ_OFFSET))
+
+
+def next_midnight(tz_name, after):
+    """UTC timestamp of the first local midnight in tz_name after the timestamp after."""
+    zone = _zone(tz_name)
+    local = datetime.datetime.fromtimestamp(after, zone)
+    midnight = datetime.datetime.combine(local.date() + datetime.timedelta(days=1), datetime.time(0), tzinfo=zone)
+    return midnight.timestamp()
+
+
+class WarmupScheduler:
+    """Background thread computing each timezone's next day shortly before its midnight."""
+
+    def __init__(self, cities, cache, flights, calculators, lead=600, variants=None):
+        self.cache = cache
+        self.flights = flights
+        self.calculators = calculators
+        self.lead = lead
+        self.variants = list(variants or VARIANTS)
+        self.groups = {}
+        for city in cities:
+            self.groups.setdefault(city.get('timezone') or "", []).append(city)
+        self._heap = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.runs = 0
+        self.computed = 0
+        self.errors = 0
+
+    def start(self):
+        now = time.time()
+        with self._lock:
+            self._heap = [(next_midnight(tz_name, now), tz_name) for tz_name in self.groups]
+            heapq.heapify(self._heap)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                if not self._heap:
+                    return
+                boundary, tz_name = self._heap[0]
+            delay = boundary - self.lead - time.time()
+            if delay > 0:
+                # Wake up at least every minute so stop() is never kept waiting long
+                self._stop.wait(min(delay, 60))
+                continue
+
+            with self._lock:
+                heapq.heappop(self._heap)
+                heapq.heappush(self._heap, (next_midnight(tz_name, boundary + 3600), tz_name))
+            self.warm(tz_name, datetime.datetime.fromtimestamp(boundary + 1, _zone(tz_name)).date())
+
+    def warm(self, tz_name, date):
+        """Compute every variant of date for the cities of tz_name into the cache."""
+        year, month, day = date.year, date.month, date.day
+        tz = get_timezone_offset(tz_name, year, month, day, 12, 0) if tz_name else DEFAULT_TZ_OFFSET
+        for city in self.groups.get(tz_name, []):
+            if self._stop.is_set():
+                return
+            lat, lon = city['latitude'], city['longitude']
+            for variant in self.variants:
+                key = ResultKey(variant, year, month, day, lat, lon, tz)
+                compute = VARIANTS[variant]
+                try:
+                    self.flights.do((key, None), lambda: self.cache.get_or_compute(
+                        key, lambda: self._compute(compute, year, month, day, lat, lon, tz)))
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Error warming {variant} for {city.get('city')} on {date}: {e}")
+        self.runs += 1
+
+    def _compute(self, compute, year, month, day, lat, lon, tz):
+        self.computed += 1
+        return compute(self.calculators, year, month, day, lat, lon, tz)
+
+    def stats(self):
+        """Cities and timezones tracked, the next boundaries and work done."""
+        with self._lock:
+            upcoming = sorted(self._heap)[:5]
+        return {
+            "cities": sum(len(cities) for cities in self.groups.values()),
+            "timezones": len(self.groups),
+            "lead_seconds": self.lead,
+            "next": [{"timezone": tz_name or f"UTC{DEFAULT_TZ_OFFSET:+g}",
+                      "midnight_utc": datetime.datetime.fromtimestamp(boundary, datetime.timezone.utc).isoformat()}
+                     for boundary, tz_name in upcoming],
+            "runs": self.runs,
+            "computed": self.computed,
+            "errors": self.errors
+        }
+
+
+def warmup_scheduler(cities, cache, flights, calculators):
+    """Scheduler for the top cities configured from the environment, or None when disabled."""
+    count = int(os.environ.get("PANCHANG_WARMUP_CITIES", 500))
+    if count <= 0:
+        return None
+    selected = top_cities(cities, count)
+    if not selected:
+        return None
+    return WarmupScheduler(selected, cache, flights, calculators,
+                           lead=float(os.environ.get("PANCHANG_WARMUP_LEAD_SECONDS", 600)))